@@ -8,7 +8,7 @@ from fastapi.templating import Jinja2Templates
 from models.models import UserCreate
 from core.config import Config
 from core.auth.jwt_handler import create_jwt_token
-from core.templates.fallbacks import get_register_html, get_login_html
+from core.templates.fallbacks import fallback_html_response
 
 router = APIRouter()
 templates = Jinja2Templates(directory="templates")
@@ -21,7 +21,9 @@ async def register_page(request: Request):
         return templates.TemplateResponse("register.html", {"request": request})
     except:
         # Fallback if template not found
-        return HTMLResponse(content=get_register_html())
+        return fallback_html_response(
+            "register", request.headers.get("accept-encoding", "")
+        )
 
 
 @router.post("/register")
@@ -82,7 +84,9 @@ async def login_page(request: Request):
         return templates.TemplateResponse("login.html", {"request": request})
     except:
         # Fallback if template not found
-        return HTMLResponse(content=get_login_html())
+        return fallback_html_response(
+            "login", request.headers.get("accept-encoding", "")
+        )
 
 
 @router.post("/login")
@@ -2,21 +2,17 @@
 Health check API routes
 """
 from datetime import datetime
-from fastapi import APIRouter
+from fastapi import APIRouter, Request
 
 router = APIRouter()
 
 
 @router.get("/health")
-async def health_check(request):
+async def health_check(request: Request):
     """Health check with database status"""
-    try:
-        # Test database connection
-        db = request.app.state.db
-        await db.users.find_one({})
-        db_status = "connected"
-    except:
-        db_status = "disconnected"
+    # Test database connection (server ping, no collection scan)
+    db = request.app.state.db
+    db_status = "connected" if await db.ping() else "disconnected"
     
     return {
         "status": "healthy",
@@ -10,6 +10,8 @@ from fastapi import APIRouter, UploadFile, File, HTTPException, Depends, Backgro
 from pydantic import BaseModel
 
 from core.auth.dependencies import get_current_user
+from core.cache.query_cache import get_query_cache
+from core.cache.semantic_cache import get_rag_answer_cache
 from rag_agent.build_kb_simple import build_text_index
 
 router = APIRouter(prefix="/api/kb", tags=["knowledge_base"])
@@ -38,7 +40,7 @@ def update_task_status(task_id: str, status: str, message: str, progress: int =
         "progress": progress,
         "files_processed": files_processed,
         "total_files": total_files,
-        "timestamp": asyncio.get_event_loop().time()
+        "timestamp": asyncio.get_running_loop().time()
     }
 
 async def build_knowledge_base_task(task_id: str, pdf_files: List[str], user_id: str, collection_name: str = "documents"):
@@ -60,6 +62,11 @@ async def build_knowledge_base_task(task_id: str, pdf_files: List[str], user_id:
             reset_collection=False,  # Append to existing collection
         )
 
+        # Cached answers predate the new documents: bumping the collection's
+        # version retires them in every worker; this worker's L1 is freed now
+        get_rag_answer_cache().clear_all()
+        await get_query_cache().async_invalidate_collection(collection_name)
+
         # Update progress to 90%
         update_task_status(
             task_id,
@@ -272,6 +279,8 @@ async def clear_knowledge_base(current_user = Depends(get_current_user)):
             try:
                 client.delete_collection(name="documents")
                 removed_count += 1
+                get_rag_answer_cache().clear_all()
+                await get_query_cache().async_invalidate_collection("documents")
             except:
                 pass  # Collection might not exist
         except Exception as e:
@@ -74,6 +74,8 @@ async def delete_session(
     
     if not success:
         raise HTTPException(status_code=404, detail="Session not found")
+
+    request.app.state.multi_agent_manager.invalidate_session(session_id)
     
     return {"message": "Session deleted successfully"}
 
@@ -96,5 +98,7 @@ async def rename_session(
     
     if not success:
         raise HTTPException(status_code=404, detail="Session not found")
+
+    request.app.state.multi_agent_manager.invalidate_session(session_id)
     
     return {"message": "Session updated successfully"}
\ No newline at end of file
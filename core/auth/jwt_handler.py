@@ -1,8 +1,11 @@
 """
 JWT token handling utilities
 """
+import asyncio
+import hashlib
 import time
-from typing import Optional, Dict
+from collections import OrderedDict
+from typing import Optional, Dict, Tuple
 import jwt
 from fastapi import HTTPException
 
@@ -43,4 +46,38 @@ def verify_jwt_token(token: str) -> Optional[Dict[str, str]]:
         return None
     except jwt.InvalidTokenError as e:
         print(f"❌ Invalid JWT token: {e}")
-        return None
\ No newline at end of file
+        return None
+
+
+# Verified-token cache: blake2b(token) -> (payload, exp). Entries live until
+# the token's own expiry, so a reconnect with the same token skips decoding.
+_VERIFIED_CACHE_MAX = 10_000
+_verified_tokens: "OrderedDict[bytes, Tuple[Dict[str, str], float]]" = OrderedDict()
+
+
+def _token_cache_key(token: str) -> bytes:
+    return hashlib.blake2b(token.encode("utf-8"), digest_size=16).digest()
+
+
+async def verify_jwt_token_async(token: str) -> Optional[Dict[str, str]]:
+    """
+    Verify JWT token without blocking the event loop.
+
+    Successful verifications are memoized until the token's ``exp`` claim;
+    decoding itself runs in a worker thread.
+    """
+    key = _token_cache_key(token)
+    cached = _verified_tokens.get(key)
+    if cached is not None:
+        payload, exp = cached
+        if exp > time.time():
+            _verified_tokens.move_to_end(key)
+            return payload
+        _verified_tokens.pop(key, None)
+
+    payload = await asyncio.to_thread(verify_jwt_token, token)
+    if payload and "exp" in payload:
+        _verified_tokens[key] = (payload, float(payload["exp"]))
+        if len(_verified_tokens) > _VERIFIED_CACHE_MAX:
+            _verified_tokens.popitem(last=False)
+    return payload
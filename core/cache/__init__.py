@@ -1,9 +1,10 @@
 """
 Caching Infrastructure for Performance Optimization
 
-This package provides Redis-based caching for:
+This package provides Redis-based (plus bounded in-process) caching for:
 - Embeddings (text and image)
 - Query responses
+- Near-duplicate (semantic) chatbot answers
 - User sessions
 - RAG retrieval results
 
@@ -15,12 +16,17 @@ Benefits:
 """
 
 from core.cache.redis_manager import RedisManager, get_redis_manager
+from core.cache.memory_cache import MemoryCache
 from core.cache.embedding_cache import EmbeddingCache
 from core.cache.query_cache import QueryCache
+from core.cache.semantic_cache import SemanticCache, get_rag_answer_cache
 
 __all__ = [
     'RedisManager',
     'get_redis_manager',
+    'MemoryCache',
     'EmbeddingCache',
     'QueryCache',
+    'SemanticCache',
+    'get_rag_answer_cache',
 ]
@@ -0,0 +1,189 @@
+"""
+In-Process Memory Cache Module
+
+Bounded local cache used as the L1 tier in front of Redis (and on its own
+when Redis is unavailable).
+
+Features:
+- TTL-based expiration
+- LRU eviction once maxsize is reached
+- Thread-safe (nodes run sync code in worker threads)
+- Hit/miss/eviction tracking
+"""
+
+import asyncio
+import logging
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Hashable, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+_MISSING = object()
+
+
+class MemoryCache:
+    """
+    TTL + LRU in-memory cache.
+
+    Entries are stored in an OrderedDict ordered from least to most recently
+    used; a hit moves the entry to the end, inserts beyond ``maxsize`` evict
+    from the front. Expired entries are dropped lazily on access and in bulk
+    by ``expire()`` / ``run_cleanup_loop()``.
+    """
+
+    def __init__(
+        self,
+        maxsize: int = 1000,
+        ttl: Optional[float] = 86400,
+        name: str = "memory"
+    ):
+        """
+        Initialize memory cache.
+
+        Args:
+            maxsize: Maximum number of entries before LRU eviction
+            ttl: Default time-to-live in seconds (None = no expiry)
+            name: Name used in logs and stats
+        """
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.name = name
+
+        self._data: "OrderedDict[Hashable, Tuple[Optional[float], Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+        # Statistics
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+        self._expirations = 0
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """
+        Get value for key, refreshing its LRU position.
+
+        Args:
+            key: Cache key
+            default: Value returned on miss or expiry
+
+        Returns:
+            Cached value or default
+        """
+        with self._lock:
+            entry = self._data.get(key, _MISSING)
+            if entry is _MISSING:
+                self._misses += 1
+                return default
+
+            expires_at, value = entry
+            if expires_at is not None and expires_at <= time.monotonic():
+                del self._data[key]
+                self._expirations += 1
+                self._misses += 1
+                return default
+
+            self._data.move_to_end(key)
+            self._hits += 1
+            return value
+
+    def set(self, key: Hashable, value: Any, ttl: Optional[float] = None) -> None:
+        """
+        Set value for key.
+
+        Args:
+            key: Cache key
+            value: Value to cache
+            ttl: Time-to-live in seconds (defaults to the cache TTL)
+        """
+        ttl = self.ttl if ttl is None else ttl
+        expires_at = time.monotonic() + ttl if ttl else None
+
+        with self._lock:
+            self._data[key] = (expires_at, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+                self._evictions += 1
+
+    def delete(self, key: Hashable) -> bool:
+        """Delete key; returns True if it was present"""
+        with self._lock:
+            return self._data.pop(key, _MISSING) is not _MISSING
+
+    def clear(self) -> int:
+        """Remove all entries; returns the number removed"""
+        with self._lock:
+            count = len(self._data)
+            self._data.clear()
+            return count
+
+    def expire(self) -> int:
+        """
+        Drop all expired entries.
+
+        Returns:
+            Number of entries removed
+        """
+        now = time.monotonic()
+        with self._lock:
+            expired = [
+                key for key, (expires_at, _) in self._data.items()
+                if expires_at is not None and expires_at <= now
+            ]
+            for key in expired:
+                del self._data[key]
+            self._expirations += len(expired)
+
+        if expired:
+            logger.debug("MemoryCache[%s] expired %s entries", self.name, len(expired))
+        return len(expired)
+
+    async def run_cleanup_loop(self, interval: float = 1800) -> None:
+        """
+        Periodically purge expired entries until cancelled.
+
+        Args:
+            interval: Seconds between sweeps (default 30 min)
+        """
+        while True:
+            await asyncio.sleep(interval)
+            try:
+                self.expire()
+            except Exception as e:
+                logger.error("MemoryCache[%s] cleanup error: %s", self.name, e)
+
+    def __contains__(self, key: Hashable) -> bool:
+        with self._lock:
+            entry = self._data.get(key, _MISSING)
+        if entry is _MISSING:
+            return False
+        expires_at = entry[0]
+        return expires_at is None or expires_at > time.monotonic()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._data)
+
+    def get_stats(self) -> dict:
+        """
+        Get cache statistics.
+
+        Returns:
+            Dictionary with size, hits, misses, evictions and hit rate
+        """
+        total = self._hits + self._misses
+        hit_rate = (self._hits / total * 100) if total > 0 else 0
+
+        return {
+            "name": self.name,
+            "size": len(self._data),
+            "maxsize": self.maxsize,
+            "ttl": self.ttl,
+            "hits": self._hits,
+            "misses": self._misses,
+            "evictions": self._evictions,
+            "expirations": self._expirations,
+            "hit_rate": f"{hit_rate:.2f}%"
+        }
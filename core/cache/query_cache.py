@@ -16,6 +16,7 @@ import hashlib
 import time
 
 from core.cache.redis_manager import RedisManager, get_redis_manager
+from core.cache.memory_cache import MemoryCache
 
 logger = logging.getLogger(__name__)
 
@@ -26,6 +27,7 @@ class QueryCache:
 
     Features:
     - Exact query matching
+    - In-process L1 tier (TTL + LRU bounded) in front of Redis
     - TTL-based expiration
     - Hit/miss tracking
     - Response metadata caching
@@ -37,7 +39,9 @@ class QueryCache:
         self,
         redis_manager: Optional[RedisManager] = None,
         ttl: int = 3600,  # 1 hour
-        prefix: str = "query"
+        prefix: str = "query",
+        local_maxsize: int = 1000,
+        local_ttl: int = 86400  # 24 hours
     ):
         """
         Initialize query cache.
@@ -46,10 +50,23 @@ class QueryCache:
             redis_manager: Redis manager instance
             ttl: Time-to-live in seconds (default 1h)
             prefix: Cache key prefix
+            local_maxsize: Max entries in the in-process tier (LRU beyond)
+            local_ttl: TTL for the in-process tier, capped at ``ttl``
         """
         self.redis = redis_manager or get_redis_manager()
         self.ttl = ttl
         self.prefix = prefix
+        self.local = MemoryCache(
+            maxsize=local_maxsize,
+            ttl=min(ttl, local_ttl),
+            name=prefix
+        )
+
+        # Per-collection answer versions (see async_collection_version): the
+        # Redis value is re-read at most every few seconds; without Redis the
+        # process-local counter is authoritative
+        self._versions = MemoryCache(maxsize=256, ttl=5, name=f"{prefix}_versions")
+        self._local_versions: Dict[str, int] = {}
 
         # Statistics
         self._hits = 0
@@ -85,6 +102,28 @@ class QueryCache:
         query_hash = hashlib.sha256(query.lower().strip().encode('utf-8')).hexdigest()[:16]
         return RedisManager.make_key("freq", query_hash, prefix=self.prefix)
 
+    def _make_version_key(self, collection: str) -> str:
+        """Key of a collection's answer version (outside the cleared prefix)"""
+        return RedisManager.make_key("version", collection, prefix=f"{self.prefix}_meta")
+
+    def _seed_local(self, key: str, cached: Dict[str, Any]) -> None:
+        """Copy a Redis hit into the local tier for its remaining lifetime only"""
+        remaining = cached.get("expires_at", time.time() + self.local.ttl) - time.time()
+        if remaining > 0:
+            self.local.set(key, cached, ttl=min(remaining, self.local.ttl or remaining))
+
+    @staticmethod
+    def _unpack(cached: Dict[str, Any]) -> Tuple[str, Dict[str, Any]]:
+        """Extract (response, metadata) without mutating the cached entry"""
+        response = cached.get("response", "")
+        metadata = {
+            **cached.get("metadata", {}),
+            "cached": True,
+            "cache_hit": True,
+            "cached_at": cached.get("timestamp")
+        }
+        return response, metadata
+
     def get_response(
         self,
         query: str,
@@ -100,30 +139,27 @@ class QueryCache:
         Returns:
             Tuple of (response, metadata) or None
         """
-        if not self.redis.enabled:
-            return None
-
         key = self._make_query_key(query, context)
-        cached = self.redis.get(key)
+        cached = self.local.get(key)
+
+        if cached is None and self.redis.enabled:
+            cached = self.redis.get(key)
+            if cached is not None:
+                self._seed_local(key, cached)
 
         if cached is not None:
             self._hits += 1
-            logger.info(f"Cache HIT for query: {query[:50]}...")
+            logger.debug("Cache HIT for query: %s...", query[:50])
 
             # Update frequency
-            freq_key = self._make_freq_key(query)
-            self.redis.incr(freq_key)
+            if self.redis.enabled:
+                freq_key = self._make_freq_key(query)
+                self.redis.incr(freq_key)
 
-            # Extract response and metadata
-            response = cached.get("response", "")
-            metadata = cached.get("metadata", {})
-            metadata["cached"] = True
-            metadata["cache_hit"] = True
-
-            return response, metadata
+            return self._unpack(cached)
 
         self._misses += 1
-        logger.info(f"Cache MISS for query: {query[:50]}...")
+        logger.debug("Cache MISS for query: %s...", query[:50])
         return None
 
     async def async_get_response(
@@ -132,29 +168,27 @@ class QueryCache:
         context: Optional[str] = None
     ) -> Optional[Tuple[str, Dict[str, Any]]]:
         """Async version of get_response"""
-        if not self.redis.enabled:
-            return None
-
         key = self._make_query_key(query, context)
-        cached = await self.redis.async_get(key)
+        cached = self.local.get(key)
+
+        if cached is None and self.redis.enabled:
+            cached = await self.redis.async_get(key)
+            if cached is not None:
+                self._seed_local(key, cached)
 
         if cached is not None:
             self._hits += 1
-            logger.info(f"Cache HIT for query: {query[:50]}...")
+            logger.debug("Cache HIT for query: %s...", query[:50])
 
             # Update frequency
-            freq_key = self._make_freq_key(query)
-            await self.redis.async_incr(freq_key)
-
-            response = cached.get("response", "")
-            metadata = cached.get("metadata", {})
-            metadata["cached"] = True
-            metadata["cache_hit"] = True
+            if self.redis.enabled:
+                freq_key = self._make_freq_key(query)
+                await self.redis.async_incr(freq_key)
 
-            return response, metadata
+            return self._unpack(cached)
 
         self._misses += 1
-        logger.info(f"Cache MISS for query: {query[:50]}...")
+        logger.debug("Cache MISS for query: %s...", query[:50])
         return None
 
     def set_response(
@@ -162,7 +196,8 @@ class QueryCache:
         query: str,
         response: str,
         metadata: Optional[Dict[str, Any]] = None,
-        context: Optional[str] = None
+        context: Optional[str] = None,
+        ttl: Optional[int] = None
     ) -> bool:
         """
         Cache query response.
@@ -172,27 +207,32 @@ class QueryCache:
             response: RAG response
             metadata: Response metadata
             context: Optional context
+            ttl: Lifetime in both tiers (defaults to the cache TTL)
 
         Returns:
             True if cached successfully
         """
-        if not self.redis.enabled:
-            return False
-
         key = self._make_query_key(query, context)
 
+        ttl = ttl or self.ttl
+        now = time.time()
         cache_data = {
             "query": query,
             "response": response,
             "metadata": metadata or {},
-            "timestamp": time.time(),
+            "timestamp": now,
+            "expires_at": now + ttl,
             "context": context
         }
 
-        success = self.redis.set(key, cache_data, ttl=self.ttl)
+        self.local.set(key, cache_data, ttl=min(ttl, self.local.ttl or ttl))
+        if not self.redis.enabled:
+            return True
+
+        success = self.redis.set(key, cache_data, ttl=ttl)
 
         if success:
-            logger.info(f"Cached response for query: {query[:50]}...")
+            logger.debug("Cached response for query: %s...", query[:50])
 
             # Initialize frequency counter
             freq_key = self._make_freq_key(query)
@@ -209,23 +249,27 @@ class QueryCache:
         context: Optional[str] = None
     ) -> bool:
         """Async version of set_response"""
-        if not self.redis.enabled:
-            return False
-
         key = self._make_query_key(query, context)
 
+        ttl = ttl or self.ttl
+        now = time.time()
         cache_data = {
             "query": query,
             "response": response,
             "metadata": metadata or {},
-            "timestamp": time.time(),
+            "timestamp": now,
+            "expires_at": now + ttl,
             "context": context
         }
 
-        success = await self.redis.async_set(key, cache_data, ttl=self.ttl)
+        self.local.set(key, cache_data, ttl=min(ttl, self.local.ttl or ttl))
+        if not self.redis.enabled:
+            return True
+
+        success = await self.redis.async_set(key, cache_data, ttl=ttl)
 
         if success:
-            logger.info(f"Cached response for query: {query[:50]}...")
+            logger.debug("Cached response for query: %s...", query[:50])
 
             # Initialize frequency counter
             freq_key = self._make_freq_key(query)
@@ -283,6 +327,7 @@ class QueryCache:
             "misses": self._misses,
             "total": total,
             "hit_rate": f"{hit_rate:.2f}%",
+            "local": self.local.get_stats(),
             "redis": redis_stats
         }
 
@@ -297,11 +342,10 @@ class QueryCache:
         Returns:
             True if invalidated
         """
-        if not self.redis.enabled:
-            return False
-
         key = self._make_query_key(query, context)
-        deleted = self.redis.delete(key)
+        deleted = int(self.local.delete(key))
+        if self.redis.enabled:
+            deleted += self.redis.delete(key)
 
         if deleted > 0:
             logger.info(f"Invalidated cache for query: {query[:50]}...")
@@ -315,11 +359,10 @@ class QueryCache:
         context: Optional[str] = None
     ) -> bool:
         """Async version of invalidate_query"""
-        if not self.redis.enabled:
-            return False
-
         key = self._make_query_key(query, context)
-        deleted = await self.redis.async_delete(key)
+        deleted = int(self.local.delete(key))
+        if self.redis.enabled:
+            deleted += await self.redis.async_delete(key)
 
         if deleted > 0:
             logger.info(f"Invalidated cache for query: {query[:50]}...")
@@ -329,11 +372,10 @@ class QueryCache:
 
     def clear_all(self) -> int:
         """Clear all cached responses"""
-        if not self.redis.enabled:
-            return 0
-
-        pattern = RedisManager.make_key("*", prefix=self.prefix)
-        count = self.redis.clear_pattern(pattern)
+        count = self.local.clear()
+        if self.redis.enabled:
+            pattern = RedisManager.make_key("*", prefix=self.prefix)
+            count += self.redis.clear_pattern(pattern)
         logger.info(f"Cleared {count} cached responses")
 
         # Reset stats
@@ -344,11 +386,10 @@ class QueryCache:
 
     async def async_clear_all(self) -> int:
         """Async version of clear_all"""
-        if not self.redis.enabled:
-            return 0
-
-        pattern = RedisManager.make_key("*", prefix=self.prefix)
-        count = await self.redis.async_clear_pattern(pattern)
+        count = self.local.clear()
+        if self.redis.enabled:
+            pattern = RedisManager.make_key("*", prefix=self.prefix)
+            count += await self.redis.async_clear_pattern(pattern)
         logger.info(f"Cleared {count} cached responses")
 
         # Reset stats
@@ -357,6 +398,64 @@ class QueryCache:
 
         return count
 
+    async def async_collection_version(self, collection: str) -> int:
+        """
+        Current answer version of a collection.
+
+        Callers put it in the cache context, so bumping it (see
+        async_invalidate_collection) retires the collection's answers in
+        every worker and tier without deleting them one by one.
+
+        Args:
+            collection: Collection name
+
+        Returns:
+            Version number (0 until first invalidated)
+        """
+        local = self._local_versions.get(collection, 0)
+        if not self.redis.enabled:
+            return local
+        version = self._versions.get(collection)
+        if version is None:
+            stored = await self.redis.async_get(self._make_version_key(collection))
+            version = max(int(stored or 0), local)
+            self._versions.set(collection, version)
+        return version
+
+    async def async_invalidate_collection(self, collection: str) -> int:
+        """
+        Retire all cached answers for a collection (e.g. after a KB rebuild).
+
+        Other workers pick up the new version within a few seconds.
+
+        Args:
+            collection: Collection name
+
+        Returns:
+            The new version
+        """
+        version = None
+        if self.redis.enabled:
+            version = await self.redis.async_incr(self._make_version_key(collection))
+        if version is None:
+            version = self._local_versions.get(collection, 0) + 1
+        self._local_versions[collection] = version
+        self._versions.set(collection, version)
+        self.local.clear()
+        logger.info("Invalidated cached answers for collection %s (v%s)", collection, version)
+        return version
+
+    async def run_cleanup_loop(self, interval: float = 1800) -> None:
+        """
+        Periodically purge expired entries from the in-process tier.
+
+        Redis expires keys on its own; this only sweeps the local tier.
+
+        Args:
+            interval: Seconds between sweeps (default 30 min)
+        """
+        await self.local.run_cleanup_loop(interval)
+
     def warmup_cache(self, queries: List[str]):
         """
         Warmup cache with common queries.
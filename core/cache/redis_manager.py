@@ -8,6 +8,8 @@ Provides centralized Redis connection management with:
 - Graceful fallback when Redis unavailable
 """
 
+from __future__ import annotations
+
 import os
 import logging
 from typing import Optional, Any
@@ -0,0 +1,208 @@
+"""
+Semantic Response Cache Module
+
+Returns a previous response when a new query is a near-duplicate of an
+earlier one ("what's the capital of France?" / "capital of France?").
+
+Features:
+- Per-namespace (e.g. per-session) window of recent (vector, response) pairs
+- Vectors stored L2-normalized and int8-quantized (per-vector scale), so
+  similarity is one integer matrix product over a quarter of the bytes
+- Per-entry TTL, plus a bounded number of namespaces (LRU via MemoryCache)
+- Hit/miss tracking
+"""
+
+import logging
+import threading
+import time
+from collections import deque
+from typing import Any, Deque, Hashable, Optional, Tuple
+
+import numpy as np
+
+from core.cache.memory_cache import MemoryCache
+
+logger = logging.getLogger(__name__)
+
+
+class SemanticCache:
+    """
+    Embedding-similarity cache of responses.
+
+    Each namespace keeps the last ``window`` entries; a lookup is a hit when
+    the cosine similarity to any unexpired one reaches ``threshold``.
+    """
+
+    def __init__(
+        self,
+        threshold: float = 0.95,
+        window: int = 64,
+        max_namespaces: int = 1000,
+        ttl: int = 3600,
+        name: str = "semantic"
+    ):
+        """
+        Initialize semantic cache.
+
+        Args:
+            threshold: Minimum cosine similarity for a hit
+            window: Entries kept per namespace (oldest dropped first)
+            max_namespaces: Namespaces kept before LRU eviction
+            ttl: Seconds an entry stays valid (None = no expiry)
+            name: Name used in logs and stats
+        """
+        self.threshold = threshold
+        self.window = window
+        self.name = name
+        self.ttl = ttl
+        # Entries expire individually (see get); writes to a busy namespace
+        # refresh its own TTL, so that can't bound the age of an answer
+        self._namespaces = MemoryCache(maxsize=max_namespaces, ttl=ttl, name=name)
+        self._lock = threading.Lock()
+
+        # Statistics
+        self._hits = 0
+        self._misses = 0
+
+    @staticmethod
+    def _quantize(vector: Any) -> Tuple[np.ndarray, float]:
+        """L2-normalize, then map to int8 with a per-vector scale"""
+        vec = np.asarray(vector, dtype=np.float32).ravel()
+        norm = np.linalg.norm(vec)
+        if norm > 0:
+            vec = vec / norm
+        peak = float(np.abs(vec).max()) if vec.size else 0.0
+        scale = peak / 127 if peak > 0 else 1.0
+        return np.round(vec / scale).astype(np.int8), scale
+
+    def get(self, namespace: Hashable, vector: Any) -> Optional[Any]:
+        """
+        Find a cached response for a near-duplicate query.
+
+        Args:
+            namespace: Cache partition (e.g. session ID)
+            vector: Query embedding
+
+        Returns:
+            Most similar cached response at or above threshold, else None
+        """
+        entries: Optional[Deque[Tuple[np.ndarray, float, float, Any]]] = self._namespaces.get(namespace)
+        if not entries:
+            self._misses += 1
+            return None
+
+        with self._lock:
+            if self.ttl:
+                cutoff = time.monotonic() - self.ttl
+                # Entries are appended in order, so expired ones are mostly on
+                # the left; a backdated entry (see set's age) can be anywhere
+                while entries and entries[0][2] <= cutoff:
+                    entries.popleft()
+                snapshot = [entry for entry in entries if entry[2] > cutoff]
+            else:
+                snapshot = list(entries)
+        if not snapshot:
+            self._misses += 1
+            return None
+
+        query, query_scale = self._quantize(vector)
+        matrix = np.vstack([entry[0] for entry in snapshot])
+        if matrix.shape[1] != query.shape[0]:
+            self._misses += 1
+            return None
+
+        # Integer dot products, rescaled back to cosine similarity
+        scales = np.fromiter((entry[1] for entry in snapshot), dtype=np.float32)
+        raw = matrix.astype(np.int32) @ query.astype(np.int32)
+        scores = raw * scales * query_scale
+        best = int(np.argmax(scores))
+        if scores[best] < self.threshold:
+            self._misses += 1
+            return None
+
+        self._hits += 1
+        logger.debug(
+            "SemanticCache[%s] hit namespace=%s score=%.3f",
+            self.name, namespace, float(scores[best])
+        )
+        return snapshot[best][3]
+
+    def set(self, namespace: Hashable, vector: Any, response: Any, age: float = 0.0) -> None:
+        """
+        Store a response for a query embedding.
+
+        Args:
+            namespace: Cache partition (e.g. session ID)
+            vector: Query embedding
+            response: Value returned on later near-duplicate lookups
+            age: Seconds the response has already been cached elsewhere;
+                it expires that much sooner here
+        """
+        with self._lock:
+            entries = self._namespaces.get(namespace)
+            if entries is None:
+                entries = deque(maxlen=self.window)
+            entries.append((*self._quantize(vector), time.monotonic() - age, response))
+            self._namespaces.set(namespace, entries)
+
+    def clear(self, namespace: Hashable) -> None:
+        """Drop all entries of a namespace"""
+        self._namespaces.delete(namespace)
+
+    def clear_all(self) -> int:
+        """Drop every namespace; returns the number removed"""
+        return self._namespaces.clear()
+
+    def get_stats(self) -> dict:
+        """
+        Get cache statistics.
+
+        Returns:
+            Dictionary with namespace count, hits, misses and hit rate
+        """
+        total = self._hits + self._misses
+        hit_rate = (self._hits / total * 100) if total > 0 else 0
+
+        return {
+            "name": self.name,
+            "namespaces": len(self._namespaces),
+            "threshold": self.threshold,
+            "hits": self._hits,
+            "misses": self._misses,
+            "hit_rate": f"{hit_rate:.2f}%"
+        }
+
+
+# Global RAG answer cache, namespaced by collection (per user for
+# context-enhanced queries)
+_rag_answer_cache: Optional[SemanticCache] = None
+
+# Lifetime of a RAG answer in every cache tier (seconds)
+RAG_ANSWER_TTL = 300
+
+
+def get_rag_answer_cache(force_new: bool = False) -> SemanticCache:
+    """
+    Get global RAG answer cache instance.
+
+    Near-identical queries in the same namespace (cosine >= 0.98) reuse the
+    earlier (response, metadata); entries go stale after 5 min.
+
+    Args:
+        force_new: Force creation of new instance
+
+    Returns:
+        SemanticCache instance
+    """
+    global _rag_answer_cache
+
+    if force_new or _rag_answer_cache is None:
+        _rag_answer_cache = SemanticCache(
+            threshold=0.98,
+            window=256,
+            max_namespaces=256,
+            ttl=RAG_ANSWER_TTL,
+            name="rag_answer"
+        )
+
+    return _rag_answer_cache
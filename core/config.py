@@ -1,6 +1,7 @@
 """
 Configuration management for the application
 """
+import json
 import os
 import secrets
 from dotenv import load_dotenv
@@ -28,6 +29,14 @@ class Config:
     # MongoDB Configuration
     MONGODB_URL = os.getenv("MONGODB_URL", "mongodb://localhost:27017")
     DATABASE_NAME = "agentic_memory"
+    # Motor connection pool (shared by all requests)
+    MONGODB_MAX_POOL_SIZE = int(os.getenv("MONGODB_MAX_POOL_SIZE", "25"))
+    # Clamped so a small MAX override doesn't leave min > max (pymongo rejects it)
+    MONGODB_MIN_POOL_SIZE = min(
+        int(os.getenv("MONGODB_MIN_POOL_SIZE", str(os.cpu_count() or 4))),
+        MONGODB_MAX_POOL_SIZE,
+    )
+    MONGODB_MAX_IDLE_TIME_MS = int(os.getenv("MONGODB_MAX_IDLE_TIME_MS", "300000"))
     
     # Security Configuration
     IS_PRODUCTION = False  # os.getenv("ENVIRONMENT", "production").lower() == "production"
@@ -55,6 +64,30 @@ class Config:
     ENABLE_PII_DETECTION = os.getenv("ENABLE_PII_DETECTION", "true").lower() == "true"
     REDACT_PII_IN_OUTPUT = os.getenv("REDACT_PII_IN_OUTPUT", "true").lower() == "true"
 
+    # Per-session workflow cache (LRU + idle eviction)
+    MAX_CACHED_SESSIONS = int(os.getenv("MAX_CACHED_SESSIONS", "500"))
+    SESSION_IDLE_TIMEOUT_MINUTES = int(os.getenv("SESSION_IDLE_TIMEOUT_MINUTES", "30"))
+
+    # Server event loop: "auto" (uvicorn picks uvloop when installed, which
+    # cuts per-await overhead on the streaming path), "uvloop" or "asyncio"
+    EVENT_LOOP = os.getenv("EVENT_LOOP", "auto")
+
+    # WebSocket server: largest accepted client frame (chat messages are small;
+    # uvicorn's default is 16 MiB) and permessage-deflate negotiation
+    WS_MAX_SIZE = int(os.getenv("WS_MAX_SIZE", str(1024 * 1024)))
+    WS_PER_MESSAGE_DEFLATE = os.getenv("WS_PER_MESSAGE_DEFLATE", "true").lower() == "true"
+
+    # Chatbot semantic cache (reuse answers to near-duplicate questions)
+    SEMANTIC_CACHE_ENABLED = os.getenv("SEMANTIC_CACHE_ENABLED", "true").lower() == "true"
+    SEMANTIC_CACHE_THRESHOLD = float(os.getenv("SEMANTIC_CACHE_THRESHOLD", "0.95"))
+
+    # Questions answered at startup so their first ask hits the RAG cache
+    # (JSON list, e.g. '["What is the refund policy?"]')
+    RAG_WARMUP_QUERIES = json.loads(os.getenv("RAG_WARMUP_QUERIES") or "[]")
+
+    # Logging (records are handed to a background writer thread)
+    LOG_LEVEL = os.getenv("LOG_LEVEL", "INFO").upper()
+
     @classmethod
     def print_config(cls):
         """Print configuration status"""
@@ -1,21 +1,34 @@
 """
 MongoDB database manager for users and sessions
 """
+import asyncio
 from typing import Dict, Any, List, Optional
 from datetime import datetime
 import motor.motor_asyncio
 from bson import ObjectId
+from pymongo.errors import BulkWriteError
 from fastapi import HTTPException
 
 from models.models import UserCreate, SessionCreate
 from core.auth.utils import hash_password, verify_password
+from core.config import Config
 
 
 class DatabaseManager:
     """MongoDB database manager for users and sessions"""
     
-    def __init__(self, mongodb_url: str, database_name: str):
-        self.client = motor.motor_asyncio.AsyncIOMotorClient(mongodb_url)
+    def __init__(self, mongodb_url: str, database_name: str,
+                 max_pool_size: int = Config.MONGODB_MAX_POOL_SIZE,
+                 min_pool_size: int = Config.MONGODB_MIN_POOL_SIZE,
+                 max_idle_time_ms: int = Config.MONGODB_MAX_IDLE_TIME_MS):
+        # One pooled client for the whole app; idle sockets are recycled
+        # after max_idle_time_ms
+        self.client = motor.motor_asyncio.AsyncIOMotorClient(
+            mongodb_url,
+            maxPoolSize=max_pool_size,
+            minPoolSize=min_pool_size,
+            maxIdleTimeMS=max_idle_time_ms
+        )
         self.db = self.client[database_name]
         self.users = self.db.users
         self.sessions = self.db.sessions
@@ -35,6 +48,15 @@ class DatabaseManager:
         except Exception as e:
             print(f"⚠️ Database initialization warning: {e}")
     
+    async def ping(self) -> bool:
+        """Check that the server is reachable through the pool"""
+        try:
+            await self.client.admin.command("ping")
+            return True
+        except Exception as e:
+            print(f"⚠️ Database ping failed: {e}")
+            return False
+    
     # User Management
     async def create_user(self, user_data: UserCreate) -> Dict[str, Any]:
         """Create a new user"""
@@ -200,49 +222,138 @@ class DatabaseManager:
             return False
     
     # Conversation Management (Unified)
+    @staticmethod
+    def _conversation_docs(session_id: str, user_id: str, thread_id: str,
+                           user_message: str, ai_response: str,
+                           metadata: Dict[str, Any]) -> List[Dict[str, Any]]:
+        """Build the user/assistant document pair for one turn"""
+        import uuid
+        message_pair_id = str(uuid.uuid4())
+        timestamp = datetime.now()
+        
+        # Handle ObjectId conversion safely
+        try:
+            session_obj_id = ObjectId(session_id) if len(session_id) == 24 else session_id
+            user_obj_id = ObjectId(user_id) if len(user_id) == 24 else user_id
+        except:
+            session_obj_id = session_id
+            user_obj_id = user_id
+        
+        return [
+            {
+                "session_id": session_obj_id,
+                "thread_id": thread_id,
+                "user_id": user_obj_id,
+                "role": "user",
+                "content": user_message,
+                "metadata": {},
+                "timestamp": timestamp,
+                "message_pair_id": message_pair_id
+            },
+            {
+                "session_id": session_obj_id,
+                "thread_id": thread_id,
+                "user_id": user_obj_id,
+                "role": "assistant",
+                "content": ai_response,
+                "metadata": metadata,
+                "timestamp": timestamp,
+                "message_pair_id": message_pair_id
+            }
+        ]
+
     async def save_conversation_messages(self, session_id: str, user_id: str, thread_id: str, 
                                        user_message: str, ai_response: str, metadata: Dict[str, Any]):
         """Save conversation messages in unified collection"""
         try:
-            import uuid
-            message_pair_id = str(uuid.uuid4())
-            timestamp = datetime.now()
-            
-            # Handle ObjectId conversion safely
-            try:
-                session_obj_id = ObjectId(session_id) if len(session_id) == 24 else session_id
-                user_obj_id = ObjectId(user_id) if len(user_id) == 24 else user_id
-            except:
-                session_obj_id = session_id
-                user_obj_id = user_id
-            
-            messages = [
-                {
-                    "session_id": session_obj_id,
-                    "thread_id": thread_id,
-                    "user_id": user_obj_id,
-                    "role": "user",
-                    "content": user_message,
-                    "metadata": {},
-                    "timestamp": timestamp,
-                    "message_pair_id": message_pair_id
-                },
-                {
-                    "session_id": session_obj_id,
-                    "thread_id": thread_id,
-                    "user_id": user_obj_id,
-                    "role": "assistant",
-                    "content": ai_response,
-                    "metadata": metadata,
-                    "timestamp": timestamp,
-                    "message_pair_id": message_pair_id
-                }
-            ]
-            
+            messages = self._conversation_docs(
+                session_id, user_id, thread_id, user_message, ai_response, metadata
+            )
             await self.conversations.insert_many(messages)
         except Exception as e:
             print(f"Failed to save conversation messages: {e}")
     
+    async def record_message(self, session_id: str, user_id: str, thread_id: str,
+                             user_message: str, ai_response: str, metadata: Dict[str, Any],
+                             tools_used_delta: int = 0):
+        """Record one conversation turn: session/user counters plus the message pair.
+
+        The three writes touch different collections and are independent, so
+        they are issued concurrently (one round-trip of latency instead of three).
+        """
+        await asyncio.gather(
+            self.update_session_activity(
+                session_id,
+                message_count_delta=1,
+                tools_used_delta=tools_used_delta
+            ),
+            self.update_user_activity(user_id, message_count_delta=1),
+            self.save_conversation_messages(
+                session_id=session_id,
+                user_id=user_id,
+                thread_id=thread_id,
+                user_message=user_message,
+                ai_response=ai_response,
+                metadata=metadata
+            )
+        )
+    
+    async def record_turns(self, turns: List[Dict[str, Any]]):
+        """Persist a batch of conversation turns.
+
+        Counter updates are aggregated to one update per session and per user,
+        and all message pairs go out in a single insert_many.
+
+        Raises if the messages can't be written. The batch can then be
+        retried as is: each turn's documents (with their _id) are built once
+        and kept in the turn, already-inserted ones are skipped, and counters
+        are only updated after every message is stored.
+
+        Args:
+            turns: Dicts with session_id, user_id, thread_id, user_message,
+                ai_response, metadata and tools_used_delta
+        """
+        session_deltas: Dict[str, List[int]] = {}
+        user_deltas: Dict[str, int] = {}
+        docs: List[Dict[str, Any]] = []
+
+        for turn in turns:
+            delta = session_deltas.setdefault(turn["session_id"], [0, 0])
+            delta[0] += 1
+            delta[1] += turn.get("tools_used_delta", 0)
+            user_deltas[turn["user_id"]] = user_deltas.get(turn["user_id"], 0) + 1
+            if "docs" not in turn:
+                turn["docs"] = [
+                    {"_id": ObjectId(), **doc}
+                    for doc in self._conversation_docs(
+                        turn["session_id"], turn["user_id"], turn["thread_id"],
+                        turn["user_message"], turn["ai_response"], turn["metadata"]
+                    )
+                ]
+            docs.extend(turn["docs"])
+
+        try:
+            await self.conversations.insert_many(docs, ordered=False)
+        except BulkWriteError as e:
+            # Duplicate _ids were stored by an earlier attempt of this batch
+            if any(error["code"] != 11000 for error in e.details["writeErrors"]):
+                raise
+
+        await asyncio.gather(
+            *(
+                self.update_session_activity(
+                    session_id,
+                    message_count_delta=messages,
+                    tools_used_delta=tools
+                )
+                for session_id, (messages, tools) in session_deltas.items()
+            ),
+            *(
+                self.update_user_activity(user_id, message_count_delta=count)
+                for user_id, count in user_deltas.items()
+            )
+        )
+    
     async def get_session_messages(self, session_id: str, limit: int = 50) -> List[Dict[str, Any]]:
         """Get messages for a session (UI format)"""
         try:
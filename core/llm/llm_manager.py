@@ -9,14 +9,34 @@ Simplifies LLM usage with:
 - Support for OpenAI, Gemini, and Ollama
 """
 
+import asyncio
 import os
 import logging
+from functools import lru_cache
 from typing import List, Dict, Any, Optional
 from enum import Enum
 
+try:
+    import tiktoken
+    TIKTOKEN_AVAILABLE = True
+except ImportError:
+    TIKTOKEN_AVAILABLE = False
+
 logger = logging.getLogger(__name__)
 
 
+@lru_cache(maxsize=16)
+def _get_encoder(provider: str, model: str):
+    """Load (once per provider/model) the tiktoken encoder, or None"""
+    if not TIKTOKEN_AVAILABLE or provider != "openai":
+        return None
+    try:
+        return tiktoken.encoding_for_model(model)
+    except KeyError:
+        # Unknown model name - use the encoding of the current GPT-4o family
+        return tiktoken.get_encoding("o200k_base")
+
+
 class LLMProvider(Enum):
     """Available LLM providers"""
     OPENAI = "openai"
@@ -67,6 +87,9 @@ class LLMManager:
         self._client = None
         self._async_client = None
 
+        # Token usage reported by the provider for the last generate() call
+        self.last_usage: Optional[Dict[str, int]] = None
+
         # Initialize client
         self._initialize_client()
 
@@ -189,6 +212,11 @@ class LLMManager:
             temperature=temperature,
             max_tokens=max_tokens
         )
+        if response.usage is not None:
+            self.last_usage = {
+                "input_tokens": response.usage.prompt_tokens,
+                "output_tokens": response.usage.completion_tokens
+            }
         return response.choices[0].message.content
 
     async def _generate_gemini(
@@ -208,15 +236,11 @@ class LLMManager:
 
         combined_prompt = "\n".join(prompt_parts)
 
-        # Generate
-        import asyncio
-        loop = asyncio.get_event_loop()
-        response = await loop.run_in_executor(
-            None,
-            lambda: self._client.models.generate_content(
-                model=self.model,
-                contents=[combined_prompt]
-            )
+        # Generate (blocking SDK call, run in the default thread pool)
+        response = await asyncio.to_thread(
+            self._client.models.generate_content,
+            model=self.model,
+            contents=[combined_prompt]
         )
 
         return response.text.strip() if response.text else ""
@@ -228,39 +252,67 @@ class LLMManager:
         max_tokens: int
     ) -> str:
         """Generate using Ollama"""
-        import asyncio
-
         # Ollama uses similar format to OpenAI
-        loop = asyncio.get_event_loop()
-        response = await loop.run_in_executor(
-            None,
-            lambda: self._client.chat(
-                model=self.model,
-                messages=messages,
-                options={
-                    "temperature": temperature,
-                    "num_predict": max_tokens
-                }
-            )
+        response = await asyncio.to_thread(
+            self._client.chat,
+            model=self.model,
+            messages=messages,
+            options={
+                "temperature": temperature,
+                "num_predict": max_tokens
+            }
         )
 
+        if "prompt_eval_count" in response or "eval_count" in response:
+            self.last_usage = {
+                "input_tokens": response.get("prompt_eval_count", 0),
+                "output_tokens": response.get("eval_count", 0)
+            }
         return response['message']['content']
 
     def is_available(self) -> bool:
         """Check if provider is available"""
         return self._client is not None or self._async_client is not None
 
-    def get_cost_estimate(self, input_tokens: int, output_tokens: int) -> float:
+    def count_tokens(self, text: str) -> int:
+        """
+        Count tokens in text for the configured model.
+
+        Uses a cached tiktoken encoder for OpenAI models; other providers
+        (or a missing tiktoken) fall back to a ~4 characters/token estimate.
+
+        Args:
+            text: Text to measure
+
+        Returns:
+            Token count
+        """
+        encoder = _get_encoder(self.provider, self.model)
+        if encoder is None:
+            return max(1, len(text) // 4) if text else 0
+        return len(encoder.encode(text, disallowed_special=()))
+
+    def get_cost_estimate(
+        self,
+        input_tokens: Optional[int] = None,
+        output_tokens: Optional[int] = None
+    ) -> float:
         """
         Estimate cost for token usage.
 
         Args:
-            input_tokens: Number of input tokens
-            output_tokens: Number of output tokens
+            input_tokens: Number of input tokens (default: last_usage)
+            output_tokens: Number of output tokens (default: last_usage)
 
         Returns:
             Estimated cost in USD
         """
+        usage = self.last_usage or {}
+        if input_tokens is None:
+            input_tokens = usage.get("input_tokens", 0)
+        if output_tokens is None:
+            output_tokens = usage.get("output_tokens", 0)
+
         if self.model not in self.COSTS:
             # Unknown model, use default
             model_key = "gpt-4o-mini"
@@ -368,8 +420,8 @@ if __name__ == "__main__":
             print(f"Response: {response}")
             print()
 
-            # Estimate cost
-            cost = manager.get_cost_estimate(input_tokens=20, output_tokens=10)
+            # Estimate cost from the provider-reported usage
+            cost = manager.get_cost_estimate()
             print(f"Estimated cost: ${cost:.6f}")
 
         except Exception as e:
@@ -0,0 +1,55 @@
+"""
+Non-blocking logging setup
+Handlers on the event loop only enqueue records; a QueueListener thread does
+the formatting and the (blocking) stream writes.
+"""
+import logging
+import queue
+import sys
+from logging.handlers import QueueHandler, QueueListener
+from typing import Optional
+
+_listener: Optional[QueueListener] = None
+
+
+def setup_logging(level: str = "INFO") -> QueueListener:
+    """
+    Route root logging through a queue drained by a background thread.
+
+    Args:
+        level: Root logger level name
+
+    Returns:
+        The running QueueListener (also kept for stop_logging())
+    """
+    global _listener
+    if _listener is not None:
+        return _listener
+
+    stream_handler = logging.StreamHandler(sys.stderr)
+    stream_handler.setFormatter(
+        logging.Formatter("%(asctime)s %(levelname)s %(name)s: %(message)s")
+    )
+
+    log_queue: "queue.SimpleQueue[logging.LogRecord]" = queue.SimpleQueue()
+    root = logging.getLogger()
+    # Replace any direct stream handlers so nothing writes from the loop
+    for handler in list(root.handlers):
+        root.removeHandler(handler)
+    root.addHandler(QueueHandler(log_queue))
+    root.setLevel(level)
+    # HTTP clients log every request at INFO (OpenAI, Serper calls)
+    for name in ("httpx", "httpcore"):
+        logging.getLogger(name).setLevel(logging.WARNING)
+
+    _listener = QueueListener(log_queue, stream_handler, respect_handler_level=True)
+    _listener.start()
+    return _listener
+
+
+def stop_logging() -> None:
+    """Flush queued records and stop the listener thread"""
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
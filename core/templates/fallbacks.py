@@ -1,6 +1,17 @@
 """
 Fallback HTML templates when Jinja2 templates are not available
 """
+import gzip
+from typing import Dict, Optional, Tuple
+
+from fastapi.responses import HTMLResponse
+from jinja2 import Template
+
+try:
+    import brotli
+    BROTLI_AVAILABLE = True
+except ImportError:
+    BROTLI_AVAILABLE = False
 
 def get_register_html():
     return """
@@ -38,13 +49,12 @@ def get_login_html():
     </html>
     """
 
-def get_dashboard_html(user):
-    return f"""
+_DASHBOARD_SOURCE = """
     <!DOCTYPE html>
     <html>
     <head><title>Dashboard - AI System</title></head>
     <body>
-        <h1>Welcome, {user['username']}!</h1>
+        <h1>Welcome, {{ username }}!</h1>
         <p>MongoDB backend is running. Save templates to templates/ directory for full UI.</p>
         <form method="post" action="/logout">
             <button type="submit">Logout</button>
@@ -53,6 +63,13 @@ def get_dashboard_html(user):
     </html>
     """
 
+# Compiled once; autoescape keeps the user-supplied username inert
+_DASHBOARD_TPL = Template(_DASHBOARD_SOURCE, autoescape=True)
+
+
+def get_dashboard_html(user) -> bytes:
+    return _DASHBOARD_TPL.render(username=user["username"]).encode("utf-8")
+
 def get_chat_html():
     return """
     <!DOCTYPE html>
@@ -64,4 +81,65 @@ def get_chat_html():
         <a href="/dashboard">Back to Dashboard</a>
     </body>
     </html>
-    """
\ No newline at end of file
+    """
+
+
+# ===============================
+# Precompressed static fallbacks
+# ===============================
+
+def _precompress(html: str) -> Dict[str, bytes]:
+    """Encode a static page once and keep every supported content-coding"""
+    raw = html.encode("utf-8")
+    variants = {"identity": raw, "gzip": gzip.compress(raw, 9)}
+    if BROTLI_AVAILABLE:
+        variants["br"] = brotli.compress(raw, quality=11)
+    return variants
+
+
+_STATIC_PAGES: Dict[str, Dict[str, bytes]] = {
+    "register": _precompress(get_register_html()),
+    "login": _precompress(get_login_html()),
+    "chat": _precompress(get_chat_html()),
+}
+
+
+def _accepted_codings(accept_encoding: str) -> set:
+    """Parse an Accept-Encoding header, dropping codings with q=0"""
+    accepted = set()
+    for part in accept_encoding.lower().split(","):
+        coding, _, params = part.strip().partition(";")
+        if not coding:
+            continue
+        if params.replace(" ", "") in ("q=0", "q=0.0", "q=0.00", "q=0.000"):
+            continue
+        accepted.add(coding.strip())
+    return accepted
+
+
+def get_encoded_html(page: str, accept_encoding: str = "") -> Tuple[bytes, Optional[str]]:
+    """
+    Select the precompressed body for a static fallback page.
+
+    Args:
+        page: One of "register", "login", "chat"
+        accept_encoding: Raw Accept-Encoding request header
+
+    Returns:
+        Tuple of (body, content_encoding); encoding is None for identity
+    """
+    variants = _STATIC_PAGES[page]
+    accepted = _accepted_codings(accept_encoding)
+    for coding in ("br", "gzip"):
+        if coding in variants and (coding in accepted or "*" in accepted):
+            return variants[coding], coding
+    return variants["identity"], None
+
+
+def fallback_html_response(page: str, accept_encoding: str = "") -> HTMLResponse:
+    """Build an HTMLResponse for a static fallback page with Content-Encoding set"""
+    body, encoding = get_encoded_html(page, accept_encoding)
+    headers = {"Vary": "Accept-Encoding"}
+    if encoding:
+        headers["Content-Encoding"] = encoding
+    return HTMLResponse(content=body, headers=headers)
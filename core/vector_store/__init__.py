@@ -6,12 +6,30 @@ Provides centralized ChromaDB management with singleton pattern.
 
 from .chroma_manager import (
     ChromaDBManager,
+    ChromaBatchWriter,
     get_chroma_client,
     get_chroma_collection
 )
 
+# Strong references to prewarmed clients (the manager's cache is weak)
+_pinned_clients = {}
+
+
+def prewarm(db_path: str = "data/chroma_db", collection_name: str = "documents") -> None:
+    """
+    Open the default client and collection ahead of the first request.
+
+    Idempotent: the manager caches the client, so repeated calls are cheap.
+    The client is pinned here because the manager only holds it weakly.
+    Run it off the event loop (e.g. ``asyncio.to_thread(prewarm)``).
+    """
+    _pinned_clients[db_path] = get_chroma_client(db_path)
+    get_chroma_collection(collection_name, db_path=db_path)
+
 __all__ = [
     'ChromaDBManager',
+    'ChromaBatchWriter',
     'get_chroma_client',
-    'get_chroma_collection'
+    'get_chroma_collection',
+    'prewarm'
 ]
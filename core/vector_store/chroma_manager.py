@@ -5,7 +5,7 @@ Manages a single ChromaDB client instance across the application to prevent
 "An instance of Chroma already exists for data/chroma_db with different settings" errors.
 
 This singleton pattern ensures:
-1. Only one ChromaDB PersistentClient is created per database path
+1. Only one live ChromaDB PersistentClient exists per database path
 2. Consistent settings across all ChromaDB operations
 3. Thread-safe access to collections
 4. Proper resource management and cleanup
@@ -13,7 +13,9 @@ This singleton pattern ensures:
 
 import os
 import threading
-from typing import Dict, Optional
+import weakref
+from collections import defaultdict
+from typing import Any, Dict, List, Optional, Sequence
 import chromadb
 from chromadb.config import Settings
 from chromadb.api.models.Collection import Collection
@@ -27,9 +29,21 @@ class ChromaDBManager:
     preventing configuration conflicts.
     """
 
-    _instances: Dict[str, chromadb.PersistentClient] = {}
+    # Weak values: clients nobody holds any more (e.g. idle per-tenant paths)
+    # can be garbage collected instead of living for the process lifetime.
+    _instances: "weakref.WeakValueDictionary[str, chromadb.PersistentClient]" = (
+        weakref.WeakValueDictionary()
+    )
+    # One lock per path so unrelated paths can be opened in parallel;
+    # _lock only guards the _path_locks map itself.
+    _path_locks: Dict[str, threading.Lock] = defaultdict(threading.Lock)
     _lock = threading.Lock()
 
+    @classmethod
+    def _get_path_lock(cls, db_path: str) -> threading.Lock:
+        with cls._lock:
+            return cls._path_locks[db_path]
+
     @classmethod
     def get_client(
         cls,
@@ -50,14 +64,16 @@ class ChromaDBManager:
         db_path = os.path.abspath(db_path)
 
         # Check if client already exists
-        if db_path in cls._instances:
-            return cls._instances[db_path]
+        client = cls._instances.get(db_path)
+        if client is not None:
+            return client
 
-        # Thread-safe client creation
-        with cls._lock:
+        # Thread-safe client creation (per path)
+        with cls._get_path_lock(db_path):
             # Double-check after acquiring lock
-            if db_path in cls._instances:
-                return cls._instances[db_path]
+            client = cls._instances.get(db_path)
+            if client is not None:
+                return client
 
             # Create database directory if needed
             os.makedirs(db_path, exist_ok=True)
@@ -121,9 +137,8 @@ class ChromaDBManager:
         """
         db_path = os.path.abspath(db_path)
 
-        with cls._lock:
-            if db_path in cls._instances:
-                del cls._instances[db_path]
+        with cls._get_path_lock(db_path):
+            if cls._instances.pop(db_path, None) is not None:
                 print(f"🔄 ChromaDB: Reset client for {db_path}")
 
     @classmethod
@@ -135,6 +150,7 @@ class ChromaDBManager:
         """
         with cls._lock:
             cls._instances.clear()
+            cls._path_locks.clear()
             print("🔄 ChromaDB: Reset all clients")
 
     @classmethod
@@ -173,6 +189,83 @@ class ChromaDBManager:
             print(f"⚠️  ChromaDB: Collection '{collection_name}' not found")
 
 
+class ChromaBatchWriter:
+    """
+    Buffered writer that upserts into a collection in fixed-size batches.
+
+    One ``upsert`` per batch amortizes HNSW index updates and keeps each
+    request under Chroma's maximum batch size. Usable as a context manager;
+    pending rows are flushed on exit. Writes are blocking: from async code,
+    run the whole ingest in a worker thread (``asyncio.to_thread``).
+
+    Example:
+        with ChromaBatchWriter(collection) as writer:
+            for row in rows:
+                writer.add(row.id, row.embedding, row.text, row.meta)
+    """
+
+    def __init__(self, collection: Collection, batch_size: int = 256):
+        """
+        Args:
+            collection: Target ChromaDB collection
+            batch_size: Rows per upsert call
+        """
+        self.collection = collection
+        self.batch_size = batch_size
+        self.written = 0
+        self._reset()
+
+    def _reset(self) -> None:
+        self._ids: List[str] = []
+        self._embeddings: List[Sequence[float]] = []
+        self._documents: List[str] = []
+        self._metadatas: List[Dict[str, Any]] = []
+
+    def add(
+        self,
+        id: str,
+        embedding: Sequence[float],
+        document: str,
+        metadata: Optional[Dict[str, Any]] = None
+    ) -> None:
+        """Buffer one row; flushes automatically when the batch is full"""
+        self._ids.append(id)
+        self._embeddings.append(embedding)
+        self._documents.append(document)
+        self._metadatas.append(metadata or {})
+
+        if len(self._ids) >= self.batch_size:
+            self.flush()
+
+    def flush(self) -> int:
+        """
+        Upsert all buffered rows.
+
+        Returns:
+            Number of rows written
+        """
+        if not self._ids:
+            return 0
+
+        count = len(self._ids)
+        self.collection.upsert(
+            ids=self._ids,
+            embeddings=self._embeddings,
+            documents=self._documents,
+            metadatas=self._metadatas
+        )
+        self.written += count
+        self._reset()
+        return count
+
+    def __enter__(self) -> "ChromaBatchWriter":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        if exc_type is None:
+            self.flush()
+
+
 # Convenience functions for common operations
 
 def get_chroma_client(db_path: str = "data/chroma_db") -> chromadb.PersistentClient:
@@ -0,0 +1,26 @@
+"""
+Typed WebSocket frames for the per-message streaming path
+orjson serializes slotted dataclasses natively, without building a dict
+per frame first.
+"""
+from dataclasses import dataclass, field
+from typing import Any, List
+
+
+@dataclass(slots=True)
+class WorkflowUpdate:
+    """Progress step of the LangGraph workflow"""
+    step: str
+    status: str
+    description: Any = None
+    type: str = "workflow_update"
+
+
+@dataclass(slots=True)
+class PartialResponse:
+    """Streaming response text: everything so far ("full") or new text ("delta")"""
+    message: str
+    agent_type: str = "chatbot"
+    tools_used: List[str] = field(default_factory=list)
+    mode: str = "full"
+    type: str = "partial_response"
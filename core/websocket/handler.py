@@ -1,152 +1,155 @@
 """
 WebSocket connection handler
 """
-import json
-from datetime import datetime
+import logging
+from datetime import datetime, timezone
+
+import orjson
 from fastapi import WebSocket, WebSocketDisconnect
 
-from core.auth.jwt_handler import verify_jwt_token
+from core.auth.jwt_handler import verify_jwt_token_async
+from core.websocket.sender import WebSocketSender
+
+logger = logging.getLogger(__name__)
+
+# Static error frames, serialized once at import
+_ERR_AUTH_REQUIRED = orjson.dumps({"type": "error", "message": "Authentication required"})
+_ERR_INVALID_TOKEN = orjson.dumps({"type": "error", "message": "Invalid or expired token"})
+_ERR_SESSION = orjson.dumps({"type": "error", "message": "Session not accessible"})
+
+
+async def _handle_chat(
+    sender: WebSocketSender,
+    app,
+    message_data: dict,
+    user_id: str,
+    session_id: str,
+    chat_mode: str
+) -> None:
+    """Process one chat_message frame and send the response"""
+    user_message = message_data.get("message", "")
+    if not user_message.strip():
+        return
+
+    try:
+        result = await app.state.multi_agent_manager.process_message(
+            user_message, user_id, session_id, chat_mode
+        )
+
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug(
+                "ws-resp keys=%s agent=%s mode=%s metadata=%s",
+                list(result.keys()),
+                result.get("agent_type"),
+                chat_mode,
+                result.get("metadata", {})
+            )
+
+        # process_message returns the frame already shaped ("type": "chat_response")
+        sender.send(orjson.dumps(result, default=str))
+
+    except Exception as e:
+        logger.exception("ws processing error session=%s", session_id)
+        sender.send(orjson.dumps({
+            "type": "error",
+            "message": f"Processing failed: {str(e)}"
+        }))
 
 
 async def handle_websocket_connection(websocket: WebSocket, session_id: str, app):
     """Handle WebSocket connection with authentication"""
-    print(f"🔌 WebSocket connection attempt for session: {session_id}")
+    logger.debug("🔌 WebSocket connection attempt for session: %s", session_id)
     await websocket.accept()
-    print("✅ WebSocket accepted")
-    websocket_key = None  # Initialize to prevent unbound variable
-    
+    sender = None  # Set once registered; used for cleanup
+
     try:
         # Get authentication from first message
-        print("🔍 Waiting for auth message...")
         auth_data = await websocket.receive_text()
-        print(f"📨 Received auth data: {auth_data}")
-        auth_message = json.loads(auth_data)
-        print(f"📋 Parsed auth message: {auth_message}")
-        
+        auth_message = orjson.loads(auth_data)
+
         token = auth_message.get("auth_token")
         if not token:
-            print("❌ No auth token in message")
-            await websocket.send_text(json.dumps({
-                "type": "error",
-                "message": "Authentication required"
-            }))
+            logger.debug("❌ No auth token in message (session=%s)", session_id)
+            await websocket.send_bytes(_ERR_AUTH_REQUIRED)
             await websocket.close()
             return
-        
-        print(f"🔑 Got auth token: {token[:20]}...")
-        
+
         # Verify token
-        print("🔍 Verifying JWT token...")
-        payload = verify_jwt_token(token)
+        payload = await verify_jwt_token_async(token)
         if not payload:
-            print("❌ JWT token verification failed")
-            await websocket.send_text(json.dumps({
-                "type": "error",
-                "message": "Invalid or expired token"
-            }))
+            logger.debug("❌ JWT token verification failed (session=%s)", session_id)
+            await websocket.send_bytes(_ERR_INVALID_TOKEN)
             await websocket.close()
             return
-        
-        print(f"✅ JWT verified, payload: {payload}")
+
         user_id = payload["user_id"]
-        print(f"👤 User ID from token: {user_id}")
-        
+
         # Verify session access
-        print(f"🔍 Checking session access for session {session_id}, user {user_id}")
         db = app.state.db
         session = await db.get_session_by_id(session_id, user_id)
         if not session:
-            print(f"❌ Session {session_id} not accessible for user {user_id}")
-            await websocket.send_text(json.dumps({
-                "type": "error",
-                "message": "Session not accessible"
-            }))
+            logger.debug("❌ Session %s not accessible for user %s", session_id, user_id)
+            await websocket.send_bytes(_ERR_SESSION)
             await websocket.close()
             return
-        
-        print(f"✅ Session verified: {session.get('name', 'Unknown')}")
 
         # Get session type from database
         session_type = session.get("session_type", "ai")
-        print(f"📊 Session type from database: {session_type}")
 
-        # Register WebSocket with unique key to prevent collisions
-        websocket_key = f"{user_id}:{session_id}"
-        app.state.multi_agent_manager.active_websockets[websocket_key] = websocket
-        
+        # Use session type from database (most reliable source)
+        # Map session types: "rag" -> "rag", "ai" -> "general"
+        chat_mode = "rag" if session_type == "rag" else "general"
+
+        # Register WebSocket under user -> session; from here on every
+        # frame goes through the connection's ordered sender
+        sender = await app.state.multi_agent_manager.register_websocket(
+            user_id, session_id, websocket
+        )
+
         # Send connection confirmation
-        print("✅ Sending connection confirmation...")
-        await websocket.send_text(json.dumps({
+        sender.send(orjson.dumps({
             "type": "connection_established",
             "session_id": session_id,
             "user_id": user_id,
             "message": "Connected with authentication"
         }))
-        print("✅ WebSocket fully connected and ready")
-        
+        logger.debug(
+            "✅ WebSocket ready session=%s user=%s chat_mode=%s",
+            session_id, user_id, chat_mode
+        )
+
+        # Clients may coalesce the first chat message into the auth frame
+        # ("initial_message", optional) to save a round-trip.
+        initial_message = auth_message.get("initial_message")
+        if isinstance(initial_message, dict) and initial_message.get("type") == "chat_message":
+            await _handle_chat(
+                sender, app, initial_message, user_id, session_id, chat_mode
+            )
+
         # Handle messages
         while True:
             data = await websocket.receive_text()
-            message_data = json.loads(data)
-            
+            message_data = orjson.loads(data)
+
             if message_data.get("type") == "chat_message":
-                user_message = message_data.get("message", "")
-
-                # Use session type from database (most reliable source)
-                # Map session types: "rag" -> "rag", "ai" -> "general"
-                if session_type == "rag":
-                    chat_mode = "rag"
-                else:
-                    chat_mode = "general"
-
-                print(f"📝 Session type from DB: {session_type}")
-                print(f"📝 Using chat_mode: {chat_mode}")
-                
-                if user_message.strip():
-                    try:
-                        result = await app.state.multi_agent_manager.process_message(
-                            user_message, user_id, session_id, chat_mode
-                        )
-                        
-                        print(f"🔍 Sending WebSocket response with result keys: {list(result.keys())}")
-                        print(f"🔍 Agent type in result: {result.get('agent_type', 'NOT FOUND')}")
-                        print(f"🔍 Selected agent in result: {result.get('selected_agent', 'NOT FOUND')}")  
-                        print(f"🔍 Metadata in result: {result.get('metadata', {})}")
-                        print(f"🔍 Chat mode used: {chat_mode}")
-                        
-                        response_data = {
-                            "type": "chat_response",
-                            **result
-                        }
-                        print(f"🔍 Final response data keys: {list(response_data.keys())}")
-                        print(f"🔍 Final agent_type: {response_data.get('agent_type', 'NOT FOUND')}")
-                        
-                        await websocket.send_text(json.dumps(response_data))
-                        
-                    except Exception as e:
-                        await websocket.send_text(json.dumps({
-                            "type": "error",
-                            "message": f"Processing failed: {str(e)}"
-                        }))
-            
+                await _handle_chat(
+                    sender, app, message_data, user_id, session_id, chat_mode
+                )
+
             elif message_data.get("type") == "ping":
-                await websocket.send_text(json.dumps({
+                # orjson serializes the datetime natively (RFC 3339, "Z" suffix)
+                sender.send(orjson.dumps({
                     "type": "pong",
-                    "timestamp": datetime.now().isoformat()
-                }))
-    
+                    "timestamp": datetime.now(timezone.utc)
+                }, option=orjson.OPT_UTC_Z))
+
     except WebSocketDisconnect:
-        print(f"🔌 WebSocket disconnected normally: {session_id}")
-    except Exception as e:
-        print(f"❌ WebSocket error: {type(e).__name__}: {e}")
-        print(f"📍 Error occurred at session: {session_id}")
-        import traceback
-        traceback.print_exc()
+        logger.debug("🔌 WebSocket disconnected normally: %s", session_id)
+    except Exception:
+        logger.exception("ws error session=%s", session_id)
     finally:
-        # Cleanup
-        print(f"🧹 Cleaning up WebSocket for session: {session_id}")
-        if websocket_key and websocket_key in app.state.multi_agent_manager.active_websockets:
-            del app.state.multi_agent_manager.active_websockets[websocket_key]
-            print(f"✅ WebSocket cleaned up: {websocket_key}")
-        else:
-            print(f"⚠️ No WebSocket key to clean up: {websocket_key}")
\ No newline at end of file
+        # Cleanup: only this connection's own sender
+        if sender is not None and await app.state.multi_agent_manager.unregister_websocket(
+            user_id, session_id, sender
+        ):
+            logger.debug("🧹 WebSocket cleaned up: %s:%s", user_id, session_id)
@@ -1,41 +1,402 @@
 """
 Multi-Agent WebSocket Manager with Database Integration
 """
-import json
-from typing import Dict, Any
+import asyncio
+import inspect
+import logging
+import time
+from collections import OrderedDict, defaultdict
+from typing import TYPE_CHECKING, Any, Awaitable, Callable, Dict, List, Optional, Tuple
 from datetime import datetime
+import orjson
+from bson.errors import InvalidDocument
+from pymongo.errors import BulkWriteError, ConnectionFailure, WTimeoutError
 from fastapi import WebSocket
 
-from graph.workflow import LangGraphMultiAgentSystem, create_langgraph_system
 from core.database.manager import DatabaseManager
+from core.config import Config
+from core.cache.memory_cache import MemoryCache
+from core.websocket.frames import PartialResponse, WorkflowUpdate
+from core.websocket.sender import WebSocketSender
+
+if TYPE_CHECKING:
+    # The workflow pulls in LangGraph/OpenAI; import it on first use instead
+    from graph.workflow import LangGraphMultiAgentSystem
+
+logger = logging.getLogger(__name__)
+
+# Write failures worth retrying: lost connections, network and server
+# selection timeouts (all ConnectionFailure) and write-concern timeouts
+_RETRYABLE_WRITE_ERRORS = (ConnectionFailure, WTimeoutError)
+
+
+def _collection_for(session_mode: str, rag_mode: str, session_id: str) -> str:
+    """Chroma collection a session's RAG queries run against"""
+    if session_mode == "rag" and rag_mode == "specific_files":
+        return f"session_{session_id}"
+    return "documents"  # Unified KB
+
+
+class PartialResponseCoalescer:
+    """
+    Rate-limits partial_response frames for one message.
+
+    The first partial in a quiet period is sent immediately; later ones
+    within ``interval`` are merged and sent when the interval elapses (or
+    on flush()): a full partial replaces what is pending, a delta is
+    appended to it.
+    """
+
+    def __init__(self, send: Callable[[Any], Awaitable[None]], interval: float = 0.03):
+        self._send = send
+        self._interval = interval
+        self._pending: Optional[PartialResponse] = None
+        # Delta texts merged into _pending, joined once when it is sent
+        self._deltas: List[str] = []
+        self._timer: Optional[asyncio.Task] = None
+        self._last_sent = 0.0
+        self._lock = asyncio.Lock()
+
+    async def push(self, data: PartialResponse) -> None:
+        if data.mode == "delta" and self._pending is not None:
+            self._deltas.append(data.message)
+        else:
+            self._pending = data
+            self._deltas.clear()
+        if self._timer is not None:
+            return
+        wait = self._interval - (time.monotonic() - self._last_sent)
+        if wait <= 0:
+            await self._send_pending()
+        else:
+            self._timer = asyncio.create_task(self._send_after(wait))
+
+    async def _send_after(self, delay: float) -> None:
+        await asyncio.sleep(delay)
+        self._timer = None
+        await self._send_pending()
+
+    async def flush(self) -> None:
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        await self._send_pending()
+
+    async def _send_pending(self) -> None:
+        async with self._lock:
+            data, self._pending = self._pending, None
+            if data is not None:
+                if self._deltas:
+                    data.message = "".join((data.message, *self._deltas))
+                    self._deltas.clear()
+                self._last_sent = time.monotonic()
+                await self._send(data)
 
 
 class DatabaseAwareMultiAgentManager:
     """Multi-agent manager with database integration"""
 
-    def __init__(self, db: DatabaseManager):
+    def __init__(
+        self,
+        db: DatabaseManager,
+        max_sessions: int = Config.MAX_CACHED_SESSIONS,
+        idle_timeout: float = Config.SESSION_IDLE_TIMEOUT_MINUTES * 60
+    ):
         self.db = db
-        self.langgraph_systems: Dict[str, LangGraphMultiAgentSystem] = {}
+        # LRU of per-session workflows (oldest first) plus last-use times
+        self.langgraph_systems: "OrderedDict[str, LangGraphMultiAgentSystem]" = OrderedDict()
+        self._last_used: Dict[str, float] = {}
+        self.max_sessions = max_sessions
+        self.idle_timeout = idle_timeout
+        self.evicted_systems = 0
+        self._eviction_task: Optional[asyncio.Task] = None
+        # Per-turn DB writes are queued and persisted in batches off the
+        # response path (see _writer_loop); each entry carries a future that
+        # resolves once the turn is in MongoDB
+        self._write_queue: "asyncio.Queue[Tuple[Dict[str, Any], asyncio.Future]]" = asyncio.Queue()
+        self._writer_task: Optional[asyncio.Task] = None
+        self.write_batch_size = 100
+        self.write_batch_interval = 0.1  # seconds
+        self.write_retry_max_delay = 5.0  # seconds between failed batch retries
+        self.write_max_attempts = 8  # ~11s of backoff, enough for a primary election
+        # session_id -> persistence of its latest queued turn; the next
+        # message waits on it so memory reads the previous exchange
+        self._persisted: Dict[str, asyncio.Future] = {}
+        self.persist_wait_timeout = 5.0  # seconds
+        # session_id -> {"user_id", "rag_mode"}; rag_mode is effectively
+        # immutable per session, so skip the per-message session lookup
+        self._session_meta_cache = MemoryCache(maxsize=10_000, ttl=60, name="session_meta")
         self.memory_agents: Dict[str, Any] = {}  # Cache memory agents
-        self.active_websockets: Dict[str, WebSocket] = {}
+        # user_id -> session_id -> sender, for O(1) per-user fan-out
+        self.active_websockets: Dict[str, Dict[str, WebSocketSender]] = defaultdict(dict)
+        self._ws_lock = asyncio.Lock()
+
+    async def register_websocket(
+        self,
+        user_id: str,
+        session_id: str,
+        websocket: WebSocket
+    ) -> WebSocketSender:
+        """
+        Register an authenticated WebSocket for a user session.
+
+        Returns the connection's sender; once registered, all frames for
+        the socket must go through it to keep them in order.
+        """
+        sender = WebSocketSender(websocket)
+        sender.start()
+        async with self._ws_lock:
+            previous = self.active_websockets[user_id].get(session_id)
+            self.active_websockets[user_id][session_id] = sender
+        if previous is not None:
+            await previous.aclose()
+        return sender
+
+    async def unregister_websocket(
+        self,
+        user_id: str,
+        session_id: str,
+        sender: WebSocketSender
+    ) -> bool:
+        """
+        Remove a connection's sender; returns True if it was still registered.
+
+        A newer connection for the same session (reconnect, second tab) may
+        have replaced it already; that one is left in place.
+        """
+        registered = False
+        async with self._ws_lock:
+            sessions = self.active_websockets.get(user_id)
+            if sessions is not None and sessions.get(session_id) is sender:
+                del sessions[session_id]
+                if not sessions:
+                    del self.active_websockets[user_id]
+                registered = True
+        await sender.aclose()
+        return registered
+
+    async def broadcast_to_user(self, user_id: str, payload: bytes) -> None:
+        """Queue a pre-serialized frame for every open session of a user"""
+        for sender in list(self.active_websockets.get(user_id, {}).values()):
+            sender.send(payload)
 
     def get_or_create_system(
         self,
         user_id: str,
-        session_id: str
-    ) -> LangGraphMultiAgentSystem:
+        session_id: str,
+        system_key: Optional[str] = None
+    ) -> "LangGraphMultiAgentSystem":
         """Get or create LangGraph system for user session"""
-        system_key = f"{user_id}:{session_id}"
+        if system_key is None:
+            system_key = f"{user_id}:{session_id}"
 
-        if system_key not in self.langgraph_systems:
-            self.langgraph_systems[system_key] = create_langgraph_system(
+        system = self.langgraph_systems.get(system_key)
+        if system is not None:
+            self.langgraph_systems.move_to_end(system_key)
+        else:
+            from graph.workflow import create_langgraph_system
+
+            system = create_langgraph_system(
                 user_id=user_id,
                 thread_id=session_id
             )
-            print(f"🎯 Created LangGraph system for {system_key}")
+            self.langgraph_systems[system_key] = system
+            logger.debug("🎯 Created LangGraph system for %s", system_key)
+            self._evict_over_capacity()
+
+        self._last_used[system_key] = time.monotonic()
+        return system
+
+    def _is_connected(self, system_key: str) -> bool:
+        """True if the session behind a system key has an open WebSocket"""
+        user_id, _, session_id = system_key.partition(":")
+        return session_id in self.active_websockets.get(user_id, {})
+
+    def _evict_over_capacity(self) -> None:
+        """Drop least-recently-used systems beyond max_sessions"""
+        overflow = len(self.langgraph_systems) - self.max_sessions
+        if overflow <= 0:
+            return
+        # Oldest first; sessions with a live WebSocket are protected
+        victims = [
+            key for key in self.langgraph_systems
+            if not self._is_connected(key)
+        ][:overflow]
+        for key in victims:
+            self._retire_system(key, reason="capacity")
+
+    def evict_idle_systems(self) -> int:
+        """Drop systems unused for longer than idle_timeout; returns count"""
+        cutoff = time.monotonic() - self.idle_timeout
+        idle = [
+            key for key in self.langgraph_systems
+            if self._last_used.get(key, 0) < cutoff and not self._is_connected(key)
+        ]
+        for key in idle:
+            self._retire_system(key, reason="idle")
+        return len(idle)
+
+    def _retire_system(self, system_key: str, reason: str) -> None:
+        system = self.langgraph_systems.pop(system_key, None)
+        self._last_used.pop(system_key, None)
+        if system is None:
+            return
+        self.evicted_systems += 1
+        logger.info(
+            "♻️  Evicted LangGraph system %s (%s); cached=%d evicted_total=%d",
+            system_key, reason, len(self.langgraph_systems), self.evicted_systems
+        )
+        close = getattr(system, "aclose", None) or getattr(system, "close", None)
+        if close is not None:
+            try:
+                result = close()
+                if inspect.isawaitable(result):
+                    asyncio.ensure_future(result)
+            except Exception as e:
+                logger.warning("⚠️  Error closing system %s: %s", system_key, e)
+
+    async def _idle_eviction_loop(self) -> None:
+        interval = max(30.0, self.idle_timeout / 4)
+        while True:
+            await asyncio.sleep(interval)
+            try:
+                self.evict_idle_systems()
+            except Exception as e:
+                logger.warning("⚠️  Idle eviction error: %s", e)
+
+    async def _writer_loop(self) -> None:
+        """Drain queued turns in batches (up to write_batch_size or ~100ms)"""
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = [await self._write_queue.get()]
+            deadline = loop.time() + self.write_batch_interval
+            while len(batch) < self.write_batch_size:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(self._write_queue.get(), timeout))
+                except asyncio.TimeoutError:
+                    break
+
+            try:
+                await self._persist_batch(batch)
+            finally:
+                for _ in batch:
+                    self._write_queue.task_done()
+
+    async def _persist_batch(
+        self,
+        batch: List[Tuple[Dict[str, Any], asyncio.Future]]
+    ) -> None:
+        """Write a batch, retrying transient failures a bounded number of times
+
+        record_turns is idempotent for a batch, so a retry never duplicates
+        turns, and retrying in place keeps turns in order. A turn MongoDB
+        rejects (unencodable metadata, a write error other than a duplicate
+        _id) is isolated from its batch and dropped, as is a batch that still
+        fails after write_max_attempts, so one bad write can't stall the writer.
+        """
+        turns = [turn for turn, _ in batch]
+        delay = self.write_batch_interval
+        for attempt in range(1, self.write_max_attempts + 1):
+            try:
+                await self.db.record_turns(turns)
+                break
+            except (InvalidDocument, BulkWriteError) as e:
+                if len(batch) > 1:
+                    for entry in batch:
+                        await self._persist_batch([entry])
+                    return
+                logger.error(
+                    "❌ Dropping turn of %s that can't be stored: %s",
+                    turns[0]["session_id"], e
+                )
+                break
+            except _RETRYABLE_WRITE_ERRORS as e:
+                if attempt == self.write_max_attempts:
+                    logger.error(
+                        "❌ Dropping %d turn(s) after %d failed attempts: %s",
+                        len(turns), attempt, e
+                    )
+                    break
+                logger.warning(
+                    "⚠️  Failed to persist %d turn(s), retrying in %.1fs: %s",
+                    len(turns), delay, e
+                )
+                await asyncio.sleep(delay)
+                delay = min(delay * 2, self.write_retry_max_delay)
+            except Exception:
+                logger.exception("❌ Dropping %d turn(s) that can't be stored", len(turns))
+                break
+
+        for turn, persisted in batch:
+            persisted.set_result(None)
+            if self._persisted.get(turn["session_id"]) is persisted:
+                del self._persisted[turn["session_id"]]
+
+    async def _wait_for_previous_turn(self, session_id: str) -> None:
+        """Wait until the session's last queued turn is persisted"""
+        persisted = self._persisted.get(session_id)
+        if persisted is None or persisted.done():
+            return
+        try:
+            await asyncio.wait_for(asyncio.shield(persisted), self.persist_wait_timeout)
+        except asyncio.TimeoutError:
+            logger.warning(
+                "⚠️  Previous turn of %s not persisted yet; continuing without it",
+                session_id
+            )
+
+    def start(self) -> None:
+        """Start background maintenance (idle eviction, DB writer)"""
+        if self._eviction_task is None:
+            self._eviction_task = asyncio.create_task(self._idle_eviction_loop())
+        if self._writer_task is None:
+            self._writer_task = asyncio.create_task(self._writer_loop())
+
+    async def close(self) -> None:
+        """Flush queued DB writes and stop background maintenance"""
+        if self._writer_task is not None:
+            try:
+                await asyncio.wait_for(self._write_queue.join(), timeout=10)
+            except asyncio.TimeoutError:
+                logger.warning(
+                    "⚠️  Dropping %d unflushed turn(s) on shutdown", self._write_queue.qsize()
+                )
+            self._writer_task.cancel()
+            try:
+                await self._writer_task
+            except asyncio.CancelledError:
+                pass
+            self._writer_task = None
+
+        if self._eviction_task is not None:
+            self._eviction_task.cancel()
+            try:
+                await self._eviction_task
+            except asyncio.CancelledError:
+                pass
+            self._eviction_task = None
+
+    async def _get_rag_mode(self, session_id: str, user_id: str) -> str:
+        """Session rag_mode, served from a short-TTL cache when possible"""
+        meta = self._session_meta_cache.get(session_id)
+        if meta is not None and meta["user_id"] == user_id:
+            return meta["rag_mode"]
+
+        session = await self.db.get_session_by_id(session_id, user_id)
+        if not session:
+            return "unified_kb"
+
+        rag_mode = session.get("rag_mode", "unified_kb")
+        self._session_meta_cache.set(session_id, {"user_id": user_id, "rag_mode": rag_mode})
+        return rag_mode
+
+    def invalidate_session(self, session_id: str) -> None:
+        """Drop cached metadata after a session is updated or deleted"""
+        self._session_meta_cache.delete(session_id)
 
-        return self.langgraph_systems[system_key]
-    
     async def process_message(
         self,
         message: str,
@@ -49,102 +410,113 @@ class DatabaseAwareMultiAgentManager:
         # (which gets it from the session_type in the database)
         session_mode = chat_mode  # "rag" or "general"
 
-        print(f"📝 Session mode for routing: {session_mode}")
+        logger.debug("📝 Session mode for routing: %s", session_mode)
 
-        # Get session from database to retrieve rag_mode (for RAG sessions)
-        session = await self.db.get_session_by_id(session_id, user_id)
-        rag_mode = session.get("rag_mode", "unified_kb") if session else "unified_kb"
+        # Get rag_mode for the session (cached; for RAG sessions)
+        rag_mode = await self._get_rag_mode(session_id, user_id)
 
         # Determine collection name for RAG queries
-        if session_mode == "rag" and rag_mode == "specific_files":
-            collection_name = f"session_{session_id}"
-        else:
-            collection_name = "documents"  # Unified KB
+        collection_name = _collection_for(session_mode, rag_mode, session_id)
 
-        print(f"📚 Collection: {collection_name} (mode: {rag_mode})")
+        logger.debug("📚 Collection: %s (mode: %s)", collection_name, rag_mode)
+
+        # Composite key, built once per message and closed over below
+        session_key = f"{user_id}:{session_id}"
 
         # Get system for this user session
-        system = self.get_or_create_system(user_id, session_id)
+        system = self.get_or_create_system(user_id, session_id, session_key)
         
-        # Create WebSocket callback for progress and streaming
-        async def websocket_callback(*args, **kwargs):
-            websocket_key = f"{user_id}:{session_id}"
-            if websocket_key not in self.active_websockets:
+        async def send_frame(data: Any, droppable: bool = False) -> None:
+            user_sockets = self.active_websockets.get(user_id)
+            sender = user_sockets.get(session_id) if user_sockets else None
+            if sender is None:
                 return
-                
-            websocket = self.active_websockets[websocket_key]
-            
             try:
-                # Handle different callback types
-                if len(args) >= 3:
-                    session_id_cb, step, status = args[:3]
-                    details = args[3] if len(args) > 3 else None
-                    
-                    # Check if this is a streaming response
-                    if step == "streaming" and status == "partial" and details:
-                        data = {
-                            "type": "partial_response",
-                            "message": details.get("partial_response", ""),
-                            "agent_type": details.get("agent_type", "chatbot"),
-                            "tools_used": details.get("tools_used", [])
-                        }
-                    else:
-                        # Regular workflow update
-                        data = {
-                            "type": "workflow_update", 
-                            "step": step,
-                            "status": status,
-                            "description": details
-                        }
-                else:
-                    # Fallback for other callback formats
-                    data = args[0] if args else kwargs.get('data', {})
-                    
-                await websocket.send_text(json.dumps(data))
+                # Queued, not awaited: the workflow doesn't wait on the client
+                sender.send(orjson.dumps(data, default=str), droppable=droppable)
             except Exception as e:
-                print(f"WebSocket error for {websocket_key}: {e}")
+                logger.warning("WebSocket error for %s: %s", session_key, e)
+
+        # Streaming partials (full text or deltas): send at most one frame
+        # per interval instead of one per chunk
+        partials = PartialResponseCoalescer(send_frame)
+
+        # Create WebSocket callback for progress and streaming
+        async def websocket_callback(*args, **kwargs):
+            # Handle different callback types
+            if len(args) >= 3:
+                session_id_cb, step, status = args[:3]
+                details = args[3] if len(args) > 3 else None
+
+                # Check if this is a streaming response
+                if step == "streaming" and status == "partial" and details:
+                    await partials.push(PartialResponse(
+                        message=details.get("partial_response", ""),
+                        agent_type=details.get("agent_type", "chatbot"),
+                        tools_used=details.get("tools_used", []),
+                        mode=details.get("mode", "full")
+                    ))
+                    return
+
+                # Regular workflow update
+                data = WorkflowUpdate(step=step, status=status, description=details)
+            else:
+                # Fallback for other callback formats
+                data = args[0] if args else kwargs.get('data', {})
+
+            # Keep ordering: pending partial text goes out first. Progress
+            # statuses may be dropped under backpressure; response text never
+            await partials.flush()
+            await send_frame(data, droppable=isinstance(data, WorkflowUpdate))
         
         # Process with real workflow
-        start_time = datetime.now()
+        start_ns = time.perf_counter_ns()
+
+        # Memory reads conversation history from MongoDB: a fast follow-up
+        # must not run before the previous turn is written
+        await self._wait_for_previous_turn(session_id)
         
         try:
-            result = await system.process_with_progress_tracking(
-                message, session_id, websocket_callback, session_mode, collection_name, rag_mode
-            )
-            
-            # Update database
-            tools_used = len(result.get("tools_used", []))
-            await self.db.update_session_activity(
-                session_id, 
-                message_count_delta=1,
-                tools_used_delta=tools_used
-            )
-            await self.db.update_user_activity(user_id, message_count_delta=1)
+            try:
+                result = await system.process_with_progress_tracking(
+                    message, session_id, websocket_callback, session_mode, collection_name, rag_mode
+                )
+            finally:
+                # Never let a delayed partial land after the final response
+                await partials.flush()
             
-            # Save conversation to unified database
-            await self.db.save_conversation_messages(
-                session_id=session_id,
-                user_id=user_id,
-                thread_id=session_id,  # Use session_id as thread_id for consistency
-                user_message=message,
-                ai_response=result["response"],
-                metadata=result["metadata"]
-            )
+            # Persist counters + conversation off the response path when the
+            # background writer is running; otherwise write inline
+            turn = {
+                "session_id": session_id,
+                "user_id": user_id,
+                "thread_id": session_id,  # Use session_id as thread_id for consistency
+                "user_message": message,
+                "ai_response": result["response"],
+                "metadata": result["metadata"],
+                "tools_used_delta": len(result.get("tools_used", []))
+            }
+            if self._writer_task is not None:
+                persisted = asyncio.get_running_loop().create_future()
+                self._persisted[session_id] = persisted
+                self._write_queue.put_nowait((turn, persisted))
+            else:
+                await self.db.record_message(**turn)
             
-            processing_time = (datetime.now() - start_time).total_seconds() * 1000
+            processing_time = (time.perf_counter_ns() - start_ns) / 1_000_000
             
+            # Shape the (freshly built) workflow result in place so the
+            # WebSocket handler can serialize it without copying
+            result["type"] = "chat_response"
             # Extract agent_type from metadata to top level for frontend
-            agent_type = result.get("metadata", {}).get("agent_type", "chatbot")
-            
-            return {
-                **result,
-                "agent_type": agent_type,  # Make sure agent_type is at top level
-                "processing_time_ms": processing_time,
-                "timestamp": datetime.now().isoformat(),
-                "session_id": session_id,
-                "user_id": user_id
-            }
+            result["agent_type"] = result.get("metadata", {}).get("agent_type", "chatbot")
+            result["processing_time_ms"] = processing_time
+            result["timestamp"] = datetime.now().isoformat()
+            result["session_id"] = session_id
+            result["user_id"] = user_id
+
+            return result
             
         except Exception as e:
-            print(f"❌ Processing error for {session_id}: {e}")
+            logger.error("❌ Processing error for %s: %s", session_id, e)
             raise e
\ No newline at end of file
@@ -0,0 +1,115 @@
+"""
+Per-connection WebSocket sender
+Frames are queued and written by one task per socket, so producers (the
+workflow streaming tokens) never wait on a slow client's network buffer.
+"""
+import asyncio
+import logging
+from collections import deque
+from typing import Deque, Optional, Tuple
+
+from fastapi import WebSocket
+
+logger = logging.getLogger(__name__)
+
+# "Try again later": the client reconnects and reloads the conversation
+_WS_CLOSE_OVERLOADED = 1013
+
+
+class WebSocketSender:
+    """
+    Ordered, bounded out-queue for a single WebSocket.
+
+    send() never blocks: payloads are queued and written in order by a
+    background task. When the queue is full the oldest queued droppable
+    frame (a progress status) is discarded. Response text is never dropped,
+    since a missing delta corrupts the streamed answer: if the queue is full
+    of it the client has stopped reading, and the socket is closed instead.
+    """
+
+    def __init__(self, websocket: WebSocket, maxsize: int = 256):
+        self.websocket = websocket
+        self.maxsize = maxsize
+        # (payload, droppable) in send order
+        self._queue: Deque[Tuple[bytes, bool]] = deque()
+        self._ready = asyncio.Event()
+        self._task: Optional[asyncio.Task] = None
+        self._overflow_task: Optional[asyncio.Task] = None
+        self._closed = False
+        self.dropped = 0
+
+    def start(self) -> None:
+        """Start the writer task"""
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    def send(self, payload: bytes, droppable: bool = False) -> None:
+        """
+        Queue a pre-serialized frame for sending.
+
+        Args:
+            payload: Serialized frame
+            droppable: The frame may be discarded under backpressure
+        """
+        if self._closed or (self._task is not None and self._task.done()):
+            return  # Closed or socket failed; nothing will read the queue
+        if len(self._queue) >= self.maxsize and not self._drop_oldest_droppable():
+            if droppable:
+                self.dropped += 1
+                return
+            self._overflow()
+            return
+        self._queue.append((payload, droppable))
+        self._ready.set()
+
+    def _drop_oldest_droppable(self) -> bool:
+        """Make room by discarding the oldest droppable frame, if any"""
+        for index, (_, droppable) in enumerate(self._queue):
+            if droppable:
+                del self._queue[index]
+                self.dropped += 1
+                return True
+        return False
+
+    def _overflow(self) -> None:
+        """Queue is full of frames that can't be dropped: give up on the client"""
+        logger.warning(
+            "ws client not reading, %d frames queued; closing connection", len(self._queue)
+        )
+        self._closed = True
+        self._queue.clear()
+        self._overflow_task = asyncio.get_running_loop().create_task(self._close_socket())
+
+    async def _close_socket(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+        try:
+            await self.websocket.close(code=_WS_CLOSE_OVERLOADED)
+        except Exception as e:
+            logger.debug("ws close failed: %s", e)
+
+    async def _run(self) -> None:
+        while True:
+            while not self._queue:
+                self._ready.clear()
+                await self._ready.wait()
+            payload, _ = self._queue.popleft()
+            try:
+                await self.websocket.send_bytes(payload)
+            except Exception as e:
+                logger.debug("ws send failed, stopping sender: %s", e)
+                return
+
+    async def aclose(self) -> None:
+        """Stop the writer task; queued frames are discarded"""
+        self._closed = True
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+        if self.dropped:
+            logger.info("ws sender closed, dropped %d frames", self.dropped)
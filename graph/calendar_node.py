@@ -3,6 +3,7 @@ Calendar management node for LangGraph workflow
 Handles Google Calendar and Meet operations with human-in-the-loop verification
 """
 
+import re
 from typing import TypedDict, Annotated, Sequence
 from langchain_core.messages import BaseMessage, HumanMessage, AIMessage
 from langgraph.graph import add_messages
@@ -11,6 +12,81 @@ import json
 from datetime import datetime
 
 
+# Patterns and keyword tables, built once at import
+_EMAIL_RE = re.compile(r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Za-z]{2,}\b')
+_TIME_RE = re.compile(r'at\s+(\d{1,2}(?::\d{2})?\s*(?:am|pm)?)', re.IGNORECASE)
+_DURATION_RE = re.compile(r'for\s+(\d+)\s*(hour|minute|hr|min)', re.IGNORECASE)
+_SUMMARY_RE = re.compile(r'(?:about|regarding|for|titled?)\s+([^,\.]+)', re.IGNORECASE)
+
+_VIEW_KWS = frozenset({"show", "see", "view", "list", "what's on", "my meetings", "my schedule"})
+_CREATE_KWS = frozenset({"create", "schedule", "book", "add meeting", "set up meeting"})
+_SUMMARY_STOPWORDS = frozenset({"create", "schedule", "book", "meeting", "with", "at", "on"})
+_DAYS = ("monday", "tuesday", "wednesday", "thursday", "friday", "saturday", "sunday")
+
+# Keyword -> category table scanned in a single pass by _scan_keywords().
+# Days and relative dates are their own tokens so the date can be picked
+# from the same scan.
+_KEYWORD_CATEGORIES = {
+    **{kw: "view" for kw in _VIEW_KWS},
+    **{kw: "create" for kw in _CREATE_KWS},
+    "approve": "approve",
+    "reject": "reject",
+    "pending": "pending",
+    "waiting": "pending",
+    "today": "today",
+    "tomorrow": "tomorrow",
+    **{day: day for day in _DAYS},
+}
+
+# A zero-width lookahead alternation matches at every offset, so overlapping
+# keywords are all seen (same substring semantics as `kw in text`). At one
+# offset only the longest keyword is reported, so each keyword also carries
+# the categories of every shorter keyword it starts with.
+_KEYWORD_SCAN_RE = re.compile(
+    "(?=(" + "|".join(
+        re.escape(kw) for kw in sorted(_KEYWORD_CATEGORIES, key=len, reverse=True)
+    ) + "))"
+)
+_KEYWORD_TAGS = {
+    kw: frozenset(
+        category for other, category in _KEYWORD_CATEGORIES.items()
+        if kw.startswith(other)
+    )
+    for kw in _KEYWORD_CATEGORIES
+}
+
+
+def _scan_keywords(text: str) -> frozenset:
+    """Return the set of keyword categories present in lowercased text"""
+    tags = set()
+    for match in _KEYWORD_SCAN_RE.finditer(text):
+        tags |= _KEYWORD_TAGS[match.group(1)]
+    return frozenset(tags)
+
+
+# Most requests open with the verb, so the first word usually decides the
+# action without scanning the whole message
+_ACTION_BY_VERB = {
+    "show": "view", "list": "view", "view": "view", "see": "view",
+    "create": "create", "schedule": "create", "book": "create", "add": "create",
+    "approve": "approve", "reject": "reject",
+    "pending": "pending", "waiting": "pending",
+}
+# Scan fallback keeps the original precedence between categories
+_ACTION_PRECEDENCE = ("view", "create", "approve", "reject", "pending")
+
+
+def _classify_action(text: str):
+    """Return (action category or None, scanned tags or None) for lowercased text"""
+    first_word = text.split(None, 1)[0] if text else ""
+    kind = _ACTION_BY_VERB.get(first_word)
+    if kind is not None:
+        return kind, None
+
+    tags = _scan_keywords(text)
+    return next((k for k in _ACTION_PRECEDENCE if k in tags), None), tags
+
+
 class CalendarState(TypedDict):
     """State for calendar operations"""
     messages: Annotated[Sequence[BaseMessage], add_messages]
@@ -37,10 +113,14 @@ def calendar_node(state: CalendarState) -> CalendarState:
 
     # Get the last message
     last_message = messages[-1]
-    user_input = last_message.content if hasattr(last_message, 'content') else str(last_message)
+    if isinstance(last_message, BaseMessage):
+        user_input = last_message.content
+    else:
+        user_input = str(last_message)
 
-    # Determine calendar action
+    # Determine calendar action (leading verb, else one keyword scan)
     user_input_lower = user_input.lower()
+    kind, tags = _classify_action(user_input_lower)
 
     result = None
     pending_approval = False
@@ -49,18 +129,21 @@ def calendar_node(state: CalendarState) -> CalendarState:
 
     try:
         # Check for event viewing requests
-        if any(keyword in user_input_lower for keyword in ["show", "see", "view", "list", "what's on", "my meetings", "my schedule"]):
+        if kind == "view":
             action = "view_events"
 
             # Parse date from query
+            if tags is None:
+                tags = _scan_keywords(user_input_lower)
             date_param = None
-            if "today" in user_input_lower:
+            if "today" in tags:
                 date_param = "today"
-            elif "tomorrow" in user_input_lower:
+            elif "tomorrow" in tags:
                 date_param = "tomorrow"
-            elif any(day in user_input_lower for day in ["monday", "tuesday", "wednesday", "thursday", "friday"]):
-                for day in ["monday", "tuesday", "wednesday", "thursday", "friday", "saturday", "sunday"]:
-                    if day in user_input_lower:
+            else:
+                # Weekends included, e.g. "show my meetings saturday"
+                for day in _DAYS:
+                    if day in tags:
                         date_param = f"next {day}"
                         break
 
@@ -71,27 +154,27 @@ def calendar_node(state: CalendarState) -> CalendarState:
             if result["status"] == "success":
                 events = result.get("events", [])
                 if events:
-                    response_text = f"I found {len(events)} event(s):\n\n"
+                    parts = [f"I found {len(events)} event(s):\n\n"]
                     for i, event in enumerate(events, 1):
                         start = event.get('start', 'Unknown time')
                         summary = event.get('summary', 'No title')
                         attendees = event.get('attendees', [])
                         meet_link = event.get('meet_link')
 
-                        response_text += f"{i}. **{summary}**\n"
-                        response_text += f"   Time: {start}\n"
+                        parts.append(f"{i}. **{summary}**\n   Time: {start}\n")
                         if attendees:
-                            response_text += f"   Attendees: {', '.join(attendees)}\n"
+                            parts.append(f"   Attendees: {', '.join(attendees)}\n")
                         if meet_link:
-                            response_text += f"   Meet Link: {meet_link}\n"
-                        response_text += "\n"
+                            parts.append(f"   Meet Link: {meet_link}\n")
+                        parts.append("\n")
+                    response_text = "".join(parts)
                 else:
                     response_text = "No events found for the specified period."
             else:
                 response_text = f"Error retrieving events: {result.get('message', 'Unknown error')}"
 
         # Check for event creation requests
-        elif any(keyword in user_input_lower for keyword in ["create", "schedule", "book", "add meeting", "set up meeting"]):
+        elif kind == "create":
             action = "create_event"
 
             # Try to extract event details from natural language
@@ -122,33 +205,34 @@ def calendar_node(state: CalendarState) -> CalendarState:
                     proposal_id = result.get("proposal_id")
 
                     proposal = result.get("proposal", {})
-                    response_text = (
+                    parts = [
                         "I've prepared a calendar event for your approval:\n\n"
                         f"**Title:** {proposal.get('summary')}\n"
                         f"**Start:** {proposal.get('start')}\n"
                         f"**End:** {proposal.get('end')}\n"
-                    )
+                    ]
 
                     if proposal.get('attendees'):
-                        response_text += f"**Attendees:** {', '.join(proposal.get('attendees', []))}\n"
+                        parts.append(f"**Attendees:** {', '.join(proposal.get('attendees', []))}\n")
 
                     if proposal.get('description'):
-                        response_text += f"**Description:** {proposal.get('description')}\n"
+                        parts.append(f"**Description:** {proposal.get('description')}\n")
 
                     if proposal.get('add_meet_link'):
-                        response_text += "**Google Meet:** Will be added\n"
+                        parts.append("**Google Meet:** Will be added\n")
 
-                    response_text += (
+                    parts.append(
                         f"\n**Proposal ID:** `{proposal_id}`\n\n"
                         "Please approve or reject this event:\n"
                         "- To approve: 'Approve proposal [ID]'\n"
                         "- To reject: 'Reject proposal [ID]'"
                     )
+                    response_text = "".join(parts)
                 else:
                     response_text = f"Error creating proposal: {result.get('message', 'Unknown error')}"
 
         # Check for approval/rejection
-        elif "approve" in user_input_lower or "reject" in user_input_lower:
+        elif kind in ("approve", "reject"):
             # Extract proposal ID
             words = user_input.split()
             prop_id = None
@@ -160,7 +244,7 @@ def calendar_node(state: CalendarState) -> CalendarState:
             if not prop_id:
                 response_text = "Please specify the proposal ID to approve or reject."
             else:
-                if "approve" in user_input_lower:
+                if kind == "approve":
                     action = "approve"
                     result = calendar_tool.approve_action(prop_id)
 
@@ -180,18 +264,21 @@ def calendar_node(state: CalendarState) -> CalendarState:
                     response_text = f"Proposal {prop_id} has been rejected."
 
         # Check for pending actions
-        elif "pending" in user_input_lower or "waiting" in user_input_lower:
+        elif kind == "pending":
             action = "view_pending"
             pending_actions = calendar_tool.get_pending_actions()
 
             if pending_actions:
-                response_text = f"You have {len(pending_actions)} pending action(s):\n\n"
+                parts = [f"You have {len(pending_actions)} pending action(s):\n\n"]
                 for action_item in pending_actions:
-                    response_text += f"**ID:** `{action_item.get('id')}`\n"
-                    response_text += f"**Action:** {action_item.get('action')}\n"
-                    if action_item.get('summary'):
-                        response_text += f"**Summary:** {action_item.get('summary')}\n"
-                    response_text += "\n"
+                    summary = action_item.get('summary')
+                    parts.append(
+                        f"**ID:** `{action_item.get('id')}`\n"
+                        f"**Action:** {action_item.get('action')}\n"
+                        + (f"**Summary:** {summary}\n" if summary else "")
+                        + "\n"
+                    )
+                response_text = "".join(parts)
             else:
                 response_text = "No pending actions."
 
@@ -231,14 +318,10 @@ def extract_event_details(user_input: str) -> dict:
     Returns:
         Dictionary with extracted event details
     """
-    import re
-    from dateutil import parser
-
     details = {}
 
     # Extract email addresses (attendees)
-    email_pattern = r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b'
-    emails = re.findall(email_pattern, user_input)
+    emails = _EMAIL_RE.findall(user_input)
     if emails:
         details['attendees'] = emails
 
@@ -247,23 +330,18 @@ def extract_event_details(user_input: str) -> dict:
     user_lower = user_input.lower()
 
     # Try to find "at" followed by time
-    time_match = re.search(r'at\s+(\d{1,2}(?::\d{2})?\s*(?:am|pm)?)', user_input, re.IGNORECASE)
+    time_match = _TIME_RE.search(user_input)
     date_str = None
 
     if "tomorrow" in user_lower:
         date_str = "tomorrow"
     elif "today" in user_lower:
         date_str = "today"
-    elif "next monday" in user_lower:
-        date_str = "next monday"
-    elif "next tuesday" in user_lower:
-        date_str = "next tuesday"
-    elif "next wednesday" in user_lower:
-        date_str = "next wednesday"
-    elif "next thursday" in user_lower:
-        date_str = "next thursday"
-    elif "next friday" in user_lower:
-        date_str = "next friday"
+    else:
+        for day in _DAYS:
+            if f"next {day}" in user_lower:
+                date_str = f"next {day}"
+                break
 
     # Combine date and time
     if date_str and time_match:
@@ -273,7 +351,7 @@ def extract_event_details(user_input: str) -> dict:
         details['start_datetime'] = date_str
 
     # Extract duration
-    duration_match = re.search(r'for\s+(\d+)\s*(hour|minute|hr|min)', user_input, re.IGNORECASE)
+    duration_match = _DURATION_RE.search(user_input)
     if duration_match:
         value = int(duration_match.group(1))
         unit = duration_match.group(2).lower()
@@ -284,14 +362,14 @@ def extract_event_details(user_input: str) -> dict:
 
     # Extract summary/title
     # Look for patterns like "about X" or "for X" or "meeting about X"
-    summary_match = re.search(r'(?:about|regarding|for|titled?)\s+([^,\.]+)', user_input, re.IGNORECASE)
+    summary_match = _SUMMARY_RE.search(user_input)
     if summary_match:
         details['summary'] = summary_match.group(1).strip()
     else:
         # Fallback: use part of the input as summary
         words = user_input.split()
         # Remove common action words
-        filtered = [w for w in words if w.lower() not in ['create', 'schedule', 'book', 'meeting', 'with', 'at', 'on']]
+        filtered = [w for w in words if w.lower() not in _SUMMARY_STOPWORDS]
         if filtered:
             details['summary'] = ' '.join(filtered[:5])  # First 5 meaningful words
 
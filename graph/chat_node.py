@@ -2,26 +2,18 @@
 Chatbot agent node for LangGraph workflow
 Handles conversation with Wikipedia tools, progress tracking, and streaming
 """
-import os
-from typing import Dict
-from tools.wikipedia_tool import search_wikipedia, get_wikipedia_page
-from tools.serper_tool import search_web, search_news
-from tools.calculator_tool import calculate, convert_units
-from tools.datetime_tool import (
-    get_current_datetime,
-    calculate_date_difference,
-    add_days_to_date,
-    get_day_of_week,
-    convert_timezone,
-    get_calendar_month,
-    time_until_date
-)
-from tools.google_calendar_tool import (
-    get_calendar_events,
-    create_calendar_event,
-    calendar_tool
-)
+import asyncio
+import logging
+import re
+from functools import lru_cache
+from typing import Any, Dict, List, Optional, Tuple
+
+import orjson
+
 from utils.track_progress import progress_callbacks
+from core.cache.memory_cache import MemoryCache
+from core.cache.semantic_cache import SemanticCache
+from core.config import Config
 
 # LangGraph imports
 from langchain_core.messages import (
@@ -32,38 +24,90 @@ from langchain_core.messages import (
 )
 from langchain_openai import ChatOpenAI
 
+from graph.llm import get_shared_llm
+from graph.state import AgentState
+
+logger = logging.getLogger(__name__)
+
 
 # ===============================
 # Chatbot Agent Node
 # ===============================
 
-# Create comprehensive tool list
-all_chatbot_tools = [
-    # Wikipedia tools
-    search_wikipedia,
-    get_wikipedia_page,
+@lru_cache(maxsize=None)
+def _load_tools() -> Tuple[List[Any], Dict[str, Any]]:
+    """
+    Import the tool modules on first use (their client SDKs are slow to load)
+
+    Returns:
+        (comprehensive tool list, tool name -> tool map)
+    """
+    from tools.wikipedia_tool import search_wikipedia, get_wikipedia_page
+    from tools.serper_tool import search_web, search_news
+    from tools.calculator_tool import calculate, convert_units
+    from tools.datetime_tool import (
+        get_current_datetime,
+        calculate_date_difference,
+        add_days_to_date,
+        get_day_of_week,
+        convert_timezone,
+        get_calendar_month,
+        time_until_date
+    )
+    from tools.google_calendar_tool import (
+        get_calendar_events,
+        create_calendar_event
+    )
+
+    all_chatbot_tools = [
+        # Wikipedia tools
+        search_wikipedia,
+        get_wikipedia_page,
+
+        # Web search tools
+        search_web,
+        search_news,
+
+        # Calculator tools
+        calculate,
+        convert_units,
+
+        # DateTime/Calendar tools
+        get_current_datetime,
+        calculate_date_difference,
+        add_days_to_date,
+        get_day_of_week,
+        convert_timezone,
+        get_calendar_month,
+        time_until_date,
 
-    # Web search tools
-    search_web,
-    search_news,
+        # Google Calendar tools
+        get_calendar_events,
+        create_calendar_event
+    ]
+    # Tool name -> tool, for dispatching the LLM's tool calls
+    tool_map = {tool.name: tool for tool in all_chatbot_tools}
+    return all_chatbot_tools, tool_map
 
-    # Calculator tools
-    calculate,
-    convert_units,
 
-    # DateTime/Calendar tools
-    get_current_datetime,
-    calculate_date_difference,
-    add_days_to_date,
-    get_day_of_week,
-    convert_timezone,
-    get_calendar_month,
-    time_until_date,
+# Short-term memory role -> message class (other roles are skipped)
+_MSG_CTOR = {"user": HumanMessage, "assistant": AIMessage}
 
-    # Google Calendar tools
-    get_calendar_events,
-    create_calendar_event
-]
+
+# bind_tools() re-serializes every tool schema; bind once per client.
+# Keyed by id() (the models aren't hashable) with the client kept alongside
+# so a recycled id can't return another client's binding.
+_tool_bindings = MemoryCache(maxsize=16, ttl=None, name="bound_llms")
+
+
+def _with_tools(llm: ChatOpenAI):
+    """Return llm bound to the chatbot tools, reusing an earlier binding"""
+    entry = _tool_bindings.get(id(llm))
+    if entry is None or entry[0] is not llm:
+        all_chatbot_tools, _ = _load_tools()
+        entry = (llm, llm.bind_tools(all_chatbot_tools))
+        _tool_bindings.set(id(llm), entry)
+    return entry[1]
 
 
 # Streaming helper function
@@ -71,73 +115,84 @@ async def send_streaming_response(
     session_id,
     partial_response,
     agent_type="chatbot",
-    tools_used=[]
+    tools_used=[],
+    mode="full",
+    wait=True
 ):
-    """Send a partial response via progress callback for streaming"""
+    """Send a partial response via progress callback for streaming
+
+    mode="full" carries the whole text so far; mode="delta" only the text
+    added since the previous partial (the client appends it).
+    """
     try:
         await progress_callbacks.notify_progress(
             session_id, "streaming", "partial", {
                 "partial_response": partial_response,
                 "agent_type": agent_type,
-                "tools_used": tools_used
-            }
+                "tools_used": tools_used,
+                "mode": mode
+            },
+            wait=wait
         )
     except Exception as e:
-        print(f"Error sending streaming response: {e}")
+        logger.warning("Error sending streaming response: %s", e)
 
 
-async def chatbot_agent_node(state: Dict) -> Dict:
-    """Chatbot agent with progress tracking and streaming"""
-    session_id = state.get("session_id", "")
+# Whole-message replies that approve the latest pending proposal
+_APPROVE_SHORT = frozenset({"yes", "ok", "confirm", "approved"})
 
-    await progress_callbacks.notify_progress(
-        session_id,
-        "agent",
-        "active",
-        "Processing conversation with AI agent..."
-    )
+# Proposal IDs in approval messages: "proposal_3" itself, or the word
+# after "proposal"
+_PROPOSAL_ID_RE = re.compile(r"\b(proposal_\S+)|\bproposal\S*\s+(\S+)", re.IGNORECASE)
 
-    print("💬 Chatbot Agent Node: Processing conversation...")
+# Partial deltas are pushed every STREAM_FLUSH_CHARS characters or
+# when a chunk ends a sentence/line
+STREAM_FLUSH_CHARS = 48
+_FLUSH_CHARS = frozenset(".!?\n")
 
-    try:
-        llm = ChatOpenAI(
-            model="gpt-4o",
-            temperature=0.7,
-            api_key=os.getenv("OPENAI_API_KEY")
-        )
-
-        llm_with_tools = llm.bind_tools(all_chatbot_tools)
 
-        # Build conversation messages
-        messages = []
+async def _stream_reply(llm, messages, session_id: str, tools_used) -> str:
+    """Stream the LLM reply, sending new text as deltas as it accumulates"""
+    # Chunks are joined only when a delta is sent (and once at the end)
+    parts = []
+    sent = 0  # parts already sent
 
-        system_content = (
-            "You are a helpful AI assistant with access to multiple tools "
-            "for information retrieval, calculations, and date/time operations."
+    async def send_delta() -> None:
+        nonlocal sent
+        delta = "".join(parts[sent:])
+        sent = len(parts)
+        # Scheduled, not awaited: a slow notifier never holds up the LLM
+        # stream, and the session's events stay in order
+        await send_streaming_response(
+            session_id, delta, "chatbot", tools_used, mode="delta", wait=False
         )
 
-        memory_context = state.get("memory_context", {})
-        context_parts = []
+    buffered = 0
+    async for chunk in llm.astream(messages):
+        content = chunk.content
+        if not content:
+            continue
+        parts.append(content)
+        buffered += len(content)
 
-        user_facts = memory_context.get("user_facts", {})
-        if user_facts:
-            facts_str = "\n".join([
-                f"- {k}: {v}"
-                for k, v in user_facts.items()
-            ])
-            context_parts.append(f"User Profile:\n{facts_str}")
+        if buffered >= STREAM_FLUSH_CHARS or content[-1] in _FLUSH_CHARS:
+            await send_delta()
+            buffered = 0
 
-        long_term = memory_context.get("long_term", [])
-        if long_term:
-            long_term_str = "\n".join(long_term[:2])
-            context_parts.append(
-                f"Relevant past conversations:\n{long_term_str}"
-            )
+    # Send the remaining content
+    if buffered:
+        await send_delta()
+
+    return "".join(parts)
 
-        if context_parts:
-            system_content += f"\n\nContext:\n{chr(10).join(context_parts)}"
 
-        system_content += """
+# Static parts of the system prompt; the per-request memory context is
+# appended after them
+_SYSTEM_PROMPT_PREFIX = (
+    "You are a helpful AI assistant with access to multiple tools "
+    "for information retrieval, calculations, and date/time operations."
+)
+_SYSTEM_PROMPT_TOOLS = """
 
 Available tools organized by category:
 
@@ -178,49 +233,244 @@ IMPORTANT:
 - For calculations, show the formula and result clearly
 - Calendar events require HUMAN APPROVAL before creation
 - When creating calendar events, explain the approval process to the user"""
+_DEFAULT_SYSTEM_MESSAGE = SystemMessage(content=_SYSTEM_PROMPT_PREFIX + _SYSTEM_PROMPT_TOOLS)
 
-        messages.append(SystemMessage(content=system_content))
 
-        # Add recent conversation history
-        short_term = memory_context.get("short_term", [])
-        for msg in short_term[-6:]:
-            if msg["role"] == "user":
-                messages.append(HumanMessage(content=msg["content"]))
-            elif msg["role"] == "assistant":
-                messages.append(AIMessage(content=msg["content"]))
+# Semantic cache of answers per session. Only answers that didn't depend on
+# live data (time, news, calendar, web) are stored, and very short follow-ups
+# ("and why?") are skipped since their meaning depends on the conversation.
+# Entries are further scoped by the user profile they were generated with (see
+# _semantic_namespace) and expire after 15 minutes as the conversation drifts.
+_semantic_cache = SemanticCache(
+    threshold=Config.SEMANTIC_CACHE_THRESHOLD, ttl=900, name="chatbot"
+)
+_SEMANTIC_CACHE_SAFE_TOOLS = frozenset({"search_wikipedia", "get_wikipedia_page"})
+_SEMANTIC_CACHE_MIN_WORDS = 3
+
 
-        # Current user message
+async def embed_for_semantic_cache(user_msg: str):
+    """Semantic-cache embedding of a message, or None if the cache doesn't apply
+
+    Independent of memory, so the workflow can run it alongside memory fetch.
+    """
+    if not Config.SEMANTIC_CACHE_ENABLED or len(user_msg.split()) < _SEMANTIC_CACHE_MIN_WORDS:
+        return None
+    try:
+        from rag_agent.embedding_helpers import embed_text
+
+        return await asyncio.to_thread(embed_text, user_msg)
+    except Exception as e:
+        logger.warning("⚠️  Semantic cache unavailable: %s", e)
+        return None
+
+
+def _semantic_namespace(session_id: str, memory_context: Dict[str, Any]) -> Tuple[str, int]:
+    """Semantic-cache namespace: the session plus a digest of the user profile
+
+    The same question gets a different answer once the profile changes, so a
+    profile update starts a fresh namespace.
+    """
+    facts = ""
+    if memory_context.get("user_facts"):
+        facts = memory_context["user_facts_text"]["bullets"]
+    return session_id, hash(facts)
+
+
+def _repeats_last_message(user_msg: str, short_term: List[Dict[str, Any]]) -> bool:
+    """True if the user re-sent their previous message (a "try again")"""
+    last_user = next(
+        (msg["content"] for msg in reversed(short_term) if msg["role"] == "user"),
+        None
+    )
+    return last_user is not None and last_user.strip().lower() == user_msg.strip().lower()
+
+
+async def _semantic_lookup(namespace, user_msg: str, query_vector=None):
+    """Return (query embedding or None, cached answer or None)"""
+    if query_vector is None:
+        query_vector = await embed_for_semantic_cache(user_msg)
+        if query_vector is None:
+            return None, None
+    return query_vector, _semantic_cache.get(namespace, query_vector)
+
+
+# Lookup tools whose results can be reused across chat turns, with how long
+# (seconds): encyclopedia content is stable, web and news results go stale
+# quickly. Repeated questions about the same entity skip the external API call
+CACHEABLE_TOOLS = {
+    "search_wikipedia": 3600,
+    "get_wikipedia_page": 3600,
+    "search_web": 300,
+    "search_news": 300,
+}
+_tool_cache = MemoryCache(maxsize=512, ttl=3600, name="chat_tools")
+
+# The lookup tools catch their own failures and return them as text
+_TOOL_ERROR_PREFIXES = ("Error", "Unexpected error")
+
+
+# Deterministic tools whose formatted output is a complete answer; when one
+# of them is the only tool call, its result is returned as-is instead of
+# being paraphrased by a second LLM call
+_DIRECT_RESPONSE_TOOLS = frozenset({
+    "calculate",
+    "convert_units",
+    "get_current_datetime",
+    "add_days_to_date",
+    "get_day_of_week",
+    "time_until_date",
+    "get_calendar_month",
+})
+
+
+def _direct_response(tool_results) -> Optional[str]:
+    """Return the answer for a lone direct-response tool call, else None"""
+    if len(tool_results) != 1:
+        return None
+    tool_result = tool_results[0]
+    result = tool_result["result"]
+    if (tool_result["tool"] not in _DIRECT_RESPONSE_TOOLS
+            or not isinstance(result, str) or result.startswith("Error")):
+        return None
+    if tool_result["tool"] == "calculate":
+        expression = tool_result["query"].get("expression")
+        if expression:
+            return f"`{expression}`\n\n{result}"
+    return result
+
+
+# Max characters of a tool result kept in the returned state
+TOOL_RESULT_STATE_LIMIT = 4096
+
+
+def _truncate_result(result):
+    """Shorten long string tool results for storage in state"""
+    if isinstance(result, str) and len(result) > TOOL_RESULT_STATE_LIMIT:
+        return result[:TOOL_RESULT_STATE_LIMIT - 3] + "..."
+    return result
+
+
+def _tool_call_key(tool_call: Dict) -> tuple:
+    """Identity of a tool call: tool name plus canonical args"""
+    return (
+        tool_call["name"],
+        orjson.dumps(tool_call["args"], option=orjson.OPT_SORT_KEYS, default=str)
+    )
+
+
+async def _run_tool(tool_map: Dict, tool_call: Dict):
+    """Invoke one tool call; errors are returned as the tool result"""
+    tool_name = tool_call["name"]
+    tool = tool_map.get(tool_name)
+    if tool is None:
+        return f"Unknown tool: {tool_name}"
+
+    cache_key = None
+    if tool_name in CACHEABLE_TOOLS:
+        cache_key = _tool_call_key(tool_call)
+        cached = _tool_cache.get(cache_key)
+        if cached is not None:
+            return cached
+
+    try:
+        # Tools are sync (HTTP clients); keep them off the loop
+        result = await asyncio.to_thread(tool.invoke, tool_call["args"])
+    except Exception as e:
+        return f"Error using {tool_name}: {str(e)}"
+
+    # Never replay a transient failure from the cache
+    if cache_key is not None and not (
+        isinstance(result, str) and result.startswith(_TOOL_ERROR_PREFIXES)
+    ):
+        _tool_cache.set(cache_key, result, ttl=CACHEABLE_TOOLS[tool_name])
+    return result
+
+
+async def chatbot_agent_node(state: AgentState, llm: Optional[ChatOpenAI] = None) -> AgentState:
+    """Chatbot agent with progress tracking and streaming (updates state in place)"""
+    session_id = state.get("session_id", "")
+
+    await progress_callbacks.notify_progress(
+        session_id,
+        "agent",
+        "active",
+        "Processing conversation with AI agent..."
+    )
+
+    logger.debug("💬 Chatbot Agent Node: Processing conversation...")
+
+    try:
+        if llm is None:
+            llm = get_shared_llm()
+
+        if not _load_tools.cache_info().currsize:
+            # First turn: import the tool modules off the event loop
+            await asyncio.to_thread(_load_tools)
+        llm_with_tools = _with_tools(llm)
+
+        # Build conversation messages
+        memory_context = state.get("memory_context", {})
+        context_parts = []
+
+        user_facts = memory_context.get("user_facts", {})
+        if user_facts:
+            facts_str = memory_context["user_facts_text"]["bullets"]
+            context_parts.append(f"User Profile:\n{facts_str}")
+
+        long_term = memory_context.get("long_term", [])
+        if long_term:
+            long_term_str = "\n".join(long_term[:2])
+            context_parts.append(
+                f"Relevant past conversations:\n{long_term_str}"
+            )
+
+        if context_parts:
+            # Static text first so every request shares the same prompt prefix
+            # (OpenAI caches repeated prefixes); per-user context goes last
+            system_message = SystemMessage(content=(
+                f"{_DEFAULT_SYSTEM_MESSAGE.content}\n\nContext:\n{chr(10).join(context_parts)}"
+            ))
+        else:
+            # No memory context: reuse the prebuilt message
+            system_message = _DEFAULT_SYSTEM_MESSAGE
+        # System prompt, recent conversation history, current user message
+        short_term = memory_context.get("short_term", [])
         user_msg = state["user_message"]
-        messages.append(HumanMessage(content=user_msg))
+        messages = [
+            system_message,
+            *(
+                _MSG_CTOR[msg["role"]](content=msg["content"])
+                for msg in short_term[-6:]
+                if msg["role"] in _MSG_CTOR
+            ),
+            HumanMessage(content=user_msg)
+        ]
 
         # Check for calendar approval/rejection commands
         user_msg_lower = user_msg.lower()
         calendar_approval_handled = False
 
         # Handle approval/rejection (with or without explicit proposal ID)
-        if "approve" in user_msg_lower or "reject" in user_msg_lower or user_msg_lower in ["yes", "ok", "confirm"]:
-            # Extract proposal ID from message
-            words = user_msg.split()
-            prop_id = None
+        is_approve = "approve" in user_msg_lower or user_msg_lower in _APPROVE_SHORT
+        is_reject = "reject" in user_msg_lower
+        if is_approve or is_reject:
+            from tools.google_calendar_tool import calendar_tool
 
-            # Try to find explicit proposal ID
-            for i, word in enumerate(words):
-                if "proposal" in word.lower() and i + 1 < len(words):
-                    prop_id = words[i + 1].strip('.,!?')
-                    break
-                elif word.startswith("proposal_"):
-                    prop_id = word.strip('.,!?')
-                    break
+            # Explicit proposal ID: "proposal_3" or "proposal <id>"
+            prop_match = _PROPOSAL_ID_RE.search(user_msg)
+            prop_id = None
+            if prop_match:
+                prop_id = (prop_match.group(1) or prop_match.group(2)).strip('.,!?')
 
             # If no explicit ID, try to get the most recent pending proposal
             if not prop_id:
-                pending = calendar_tool.get_pending_actions()
+                pending = await asyncio.to_thread(calendar_tool.get_pending_actions)
                 if pending:
                     prop_id = pending[-1].get('id')  # Get most recent
 
             if prop_id:
-                if "approve" in user_msg_lower or user_msg_lower in ["yes", "ok", "confirm", "approved"]:
-                    result = calendar_tool.approve_action(prop_id)
+                if is_approve:
+                    result = await asyncio.to_thread(calendar_tool.approve_action, prop_id)
                     if result["status"] == "success":
                         event = result.get("event", {})
                         agent_response = (
@@ -237,13 +487,25 @@ IMPORTANT:
                         agent_response = f"❌ Error approving event: {result.get('message', 'Unknown error')}"
                         calendar_approval_handled = True
                 else:
-                    result = calendar_tool.reject_action(prop_id, reason="User rejected")
+                    result = await asyncio.to_thread(
+                        calendar_tool.reject_action, prop_id, reason="User rejected"
+                    )
                     agent_response = f"❌ Proposal {prop_id} has been rejected."
                     calendar_approval_handled = True
 
-        if not calendar_approval_handled:
+        # Near-duplicate of an earlier question in this session, asked in the
+        # same context: reuse the answer. A re-sent message wants a fresh one
+        query_vector = None
+        cached_response = None
+        semantic_namespace = _semantic_namespace(session_id, memory_context)
+        if not calendar_approval_handled and not _repeats_last_message(user_msg, short_term):
+            query_vector, cached_response = await _semantic_lookup(
+                semantic_namespace, user_msg, state.get("query_embedding")
+            )
+
+        if not calendar_approval_handled and cached_response is None:
             # Get initial response
-            response = llm_with_tools.invoke(messages)
+            response = await llm_with_tools.ainvoke(messages)
         else:
             response = None
 
@@ -255,126 +517,73 @@ IMPORTANT:
         if calendar_approval_handled:
             # Already have agent_response from approval/rejection
             pass
+        elif cached_response is not None:
+            logger.debug("🧠 Chatbot answered from semantic cache")
+            agent_response = cached_response
         elif response and response.tool_calls:
-            # Create tool name to function mapping
-            tool_map = {tool.name: tool for tool in all_chatbot_tools}
-            print(
-                f"🛠️  Chatbot using tools: "
-                f"{[tc['name'] for tc in response.tool_calls]}"
-            )
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug(
+                    "🛠️  Chatbot using tools: %s",
+                    [tc["name"] for tc in response.tool_calls]
+                )
 
-            messages.append(response)
+            # Identical calls (same tool + args) run once; independent ones
+            # overlap (e.g. Wikipedia + web search)
+            call_keys = [_tool_call_key(tool_call) for tool_call in response.tool_calls]
+            unique_calls = dict(zip(call_keys, response.tool_calls))
+            _, tool_map = _load_tools()
+            unique_results = await asyncio.gather(*[
+                _run_tool(tool_map, tool_call)
+                for tool_call in unique_calls.values()
+            ])
+            results_by_key = dict(zip(unique_calls, unique_results))
 
             tool_messages = []
-            for tool_call in response.tool_calls:
+            for tool_call, call_key in zip(response.tool_calls, call_keys):
+                result = results_by_key[call_key]
                 tool_name = tool_call["name"]
                 tools_used.append(tool_name)
 
-                # Invoke the tool dynamically
-                if tool_name in tool_map:
-                    try:
-                        result = tool_map[tool_name].invoke(tool_call["args"])
-                    except Exception as e:
-                        result = f"Error using {tool_name}: {str(e)}"
-                else:
-                    result = f"Unknown tool: {tool_name}"
-
                 tool_message = ToolMessage(
                     content=result,
                     tool_call_id=tool_call["id"]
                 )
                 tool_messages.append(tool_message)
+                # Full text goes to the LLM via the ToolMessage; state keeps
+                # a bounded copy (it's carried through every later node)
                 tool_results.append({
                     "tool": tool_name,
                     "query": tool_call["args"],
-                    "result": result
+                    "result": _truncate_result(result)
                 })
 
-            messages.extend(tool_messages)
-
-            # Stream the final response word by word
-            agent_response = ""
-
-            # Use streaming with optimized chunking
-            chunk_buffer = ""
-            word_count = 0
-
-            for chunk in llm.stream(messages):
-                if hasattr(chunk, 'content') and chunk.content:
-                    agent_response += chunk.content
-                    chunk_buffer += chunk.content
-
-                    # Count words to batch updates (send every ~5-10 words)
-                    word_count += len(chunk.content.split())
-
-                    # Send update every 8-12 words or if buffer ends
-                    # with sentence
-                    if (word_count >= 8 or
-                            chunk.content.strip().endswith(
-                                ('.', '!', '?', '\n')
-                            )):
-                        await send_streaming_response(
-                            session_id,
-                            agent_response,
-                            "chatbot",
-                            tools_used
-                        )
-                        chunk_buffer = ""
-                        word_count = 0
-
-            # Send final update if there's remaining content
-            if chunk_buffer.strip():
+            agent_response = _direct_response(tool_results)
+            if agent_response is not None:
+                # The tool output already is the answer; skip the second LLM call
                 await send_streaming_response(
                     session_id,
                     agent_response,
                     "chatbot",
                     tools_used
                 )
+            else:
+                messages = [*messages, response, *tool_messages]
 
-            # If no streaming happened, fall back to regular response
-            if not agent_response:
-                final_response = llm.invoke(messages)
-                agent_response = final_response.content
+                # Stream the final response
+                agent_response = await _stream_reply(
+                    llm, messages, session_id, tools_used
+                )
+
+                # If no streaming happened, fall back to regular response
+                if not agent_response:
+                    final_response = await llm.ainvoke(messages)
+                    agent_response = final_response.content
 
         else:
             # No tools needed - stream the response directly
-            agent_response = ""
-
-            # Use streaming with optimized chunking
-            chunk_buffer = ""
-            word_count = 0
-
-            for chunk in llm.stream(messages):
-                if hasattr(chunk, 'content') and chunk.content:
-                    agent_response += chunk.content
-                    chunk_buffer += chunk.content
-
-                    # Count words to batch updates
-                    word_count += len(chunk.content.split())
-
-                    # Send update every 8-12 words or if buffer ends
-                    # with sentence
-                    if (word_count >= 8 or
-                            chunk.content.strip().endswith(
-                                ('.', '!', '?', '\n')
-                            )):
-                        await send_streaming_response(
-                            session_id,
-                            agent_response,
-                            "chatbot",
-                            tools_used
-                        )
-                        chunk_buffer = ""
-                        word_count = 0
-
-            # Send final update if there's remaining content
-            if chunk_buffer.strip():
-                await send_streaming_response(
-                    session_id,
-                    agent_response,
-                    "chatbot",
-                    tools_used
-                )
+            agent_response = await _stream_reply(
+                llm, messages, session_id, tools_used
+            )
 
             # If no streaming happened, fall back
             if not agent_response:
@@ -385,9 +594,14 @@ IMPORTANT:
             "context_used": len(short_term),
             "user_facts_count": len(user_facts),
             "tools_used": tools_used,
-            "tool_calls_count": len(tool_results)
+            "tool_calls_count": len(tool_results),
+            "semantic_cache_hit": cached_response is not None
         }
 
+        if (query_vector is not None and cached_response is None
+                and _SEMANTIC_CACHE_SAFE_TOOLS.issuperset(tools_used)):
+            _semantic_cache.set(semantic_namespace, query_vector, agent_response)
+
         # Prepare detailed progress message
         details = ["Response generated"]
         if tools_used:
@@ -404,18 +618,16 @@ IMPORTANT:
             detail_text
         )
 
-        print(f"✅ Chatbot completed (tools: {tools_used})")
+        logger.debug("✅ Chatbot completed (tools: %s)", tools_used)
 
-        return {
-            **state,
-            "agent_response": agent_response,
-            "metadata": {**state.get("metadata", {}), **metadata},
-            "tools_used": tools_used,
-            "tool_results": tool_results  # Changed from wikipedia_results
-        }
+        state.setdefault("metadata", {}).update(metadata)
+        state["agent_response"] = agent_response
+        state["tools_used"] = tools_used
+        state["tool_results"] = tool_results  # Changed from wikipedia_results
+        return state
 
     except Exception as e:
-        print(f"❌ Chatbot Agent error: {e}")
+        logger.exception("❌ Chatbot Agent error: %s", e)
         await progress_callbacks.notify_progress(
             session_id,
             "agent",
@@ -426,8 +638,6 @@ IMPORTANT:
             "I apologize, but I encountered an error. "
             "Please try again."
         )
-        return {
-            **state,
-            "agent_response": error_msg,
-            "metadata": {**state.get("metadata", {}), "error": str(e)}
-        }
+        state.setdefault("metadata", {})["error"] = str(e)
+        state["agent_response"] = error_msg
+        return state
@@ -3,11 +3,11 @@ Guardrails Nodes for LangGraph Workflow
 Provides input validation and output sanitization nodes
 """
 
-from typing import Dict, Any
+from graph.state import AgentState
 from core.guardrails import get_guardrails_validator, GuardrailsConfig
 
 
-def input_guardrails_node(state: Dict[str, Any]) -> Dict[str, Any]:
+def input_guardrails_node(state: AgentState) -> AgentState:
     """
     Input validation node - validates user input before processing
 
@@ -54,7 +54,7 @@ def input_guardrails_node(state: Dict[str, Any]) -> Dict[str, Any]:
     return state
 
 
-def output_guardrails_node(state: Dict[str, Any]) -> Dict[str, Any]:
+def output_guardrails_node(state: AgentState) -> AgentState:
     """
     Output sanitization node - sanitizes agent response before returning to user
 
@@ -94,7 +94,7 @@ def output_guardrails_node(state: Dict[str, Any]) -> Dict[str, Any]:
     return state
 
 
-def create_guardrails_report_node(state: Dict[str, Any]) -> Dict[str, Any]:
+def create_guardrails_report_node(state: AgentState) -> AgentState:
     """
     Optional node to create comprehensive guardrails report
     Useful for monitoring and auditing
@@ -115,7 +115,7 @@ def create_guardrails_report_node(state: Dict[str, Any]) -> Dict[str, Any]:
 
 
 # Conditional edge function for routing based on validation
-def should_continue_after_validation(state: Dict[str, Any]) -> str:
+def should_continue_after_validation(state: AgentState) -> str:
     """
     Conditional edge function to route workflow based on validation result
 
@@ -0,0 +1,30 @@
+"""
+Shared LLM client for LangGraph nodes
+One ChatOpenAI (and one HTTP connection pool) for every session's workflow
+"""
+import os
+from functools import lru_cache
+
+import httpx
+from langchain_openai import ChatOpenAI
+
+# Keep-alive pool shared by all sessions; warm TLS connections skip a handshake
+HTTP_LIMITS = httpx.Limits(max_connections=100, max_keepalive_connections=50)
+
+CHAT_MODEL = "gpt-4o"
+CHAT_TEMPERATURE = 0.7
+
+
+@lru_cache(maxsize=None)
+def get_shared_llm(
+    model: str = CHAT_MODEL,
+    temperature: float = CHAT_TEMPERATURE
+) -> ChatOpenAI:
+    """Get the process-wide ChatOpenAI client for a model/temperature pair"""
+    return ChatOpenAI(
+        model=model,
+        temperature=temperature,
+        api_key=os.getenv("OPENAI_API_KEY"),
+        http_client=httpx.Client(limits=HTTP_LIMITS),
+        http_async_client=httpx.AsyncClient(limits=HTTP_LIMITS)
+    )
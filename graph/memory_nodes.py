@@ -2,240 +2,365 @@
 Memory nodes for LangGraph workflow
 Handles memory fetch and update with progress tracking
 """
-from typing import Dict
+import asyncio
+import logging
+from collections import OrderedDict
+from operator import attrgetter
+from typing import Dict, List, Optional, Set, Tuple
 
+from core.cache.memory_cache import MemoryCache
+from core.cache.semantic_cache import SemanticCache
 from memory.mem_agent import MemoryAgent, MockMemoryAgent
 from memory.mem_config import MemoryConfig
+from graph.state import AgentState
 from utils.track_progress import progress_callbacks
 
+logger = logging.getLogger(__name__)
+
+
+# Per-thread recall cache: a query within LONG_TERM_CACHE_THRESHOLD cosine
+# similarity of an earlier one reuses its long-term documents. Both caches
+# are invalidated by memory_update_node when the thread's memory changes.
+LONG_TERM_CACHE_THRESHOLD = 0.97
+_long_term_cache = SemanticCache(
+    threshold=LONG_TERM_CACHE_THRESHOLD,
+    window=32,
+    max_namespaces=1024,
+    name="long_term"
+)
+# User facts change only when memory is updated; short TTL as a backstop.
+# Entries are (facts, facts_text) so the joined strings are built once.
+_user_facts_cache = MemoryCache(maxsize=10_000, ttl=60, name="user_facts")
+
+
+def _invalidate_memory_caches(user_id: str, thread_id: str) -> None:
+    """Drop cached recall and facts after a memory update"""
+    _long_term_cache.clear((user_id, thread_id))
+    _user_facts_cache.delete(user_id)
+
+
+# Initialized MemoryAgents reused across turns, keyed by (user_id, thread_id);
+# building one opens a Chroma collection and a MongoDB client. Builds run in
+# a thread and are shared by concurrent requests for the same key, so a cold
+# build never blocks pool hits or other sessions.
+MEMORY_AGENT_POOL_SIZE = 256
+_agent_pool: "OrderedDict[Tuple[str, str], MemoryAgent]" = OrderedDict()
+_agent_builds: Dict[Tuple[str, str], asyncio.Task] = {}
+
+
+async def _get_memory_agent(user_id: str, thread_id: str) -> MemoryAgent:
+    """Pooled MemoryAgent for a thread (LRU, closes evicted agents when idle)"""
+    key = (str(user_id), str(thread_id))
+    memory_agent = _agent_pool.get(key)
+    if memory_agent is not None:
+        _agent_pool.move_to_end(key)
+        return memory_agent
+
+    build = _agent_builds.get(key)
+    if build is None:
+        build = asyncio.create_task(_build_memory_agent(key))
+        _agent_builds[key] = build
+    # A cancelled caller must not cancel a build other callers wait on
+    return await asyncio.shield(build)
+
+
+async def _build_memory_agent(key: Tuple[str, str]) -> MemoryAgent:
+    """Build an agent off the loop and add it to the pool"""
+    try:
+        # cfg defaults to the shared MemoryConfig, loaded here off the loop
+        memory_agent = await asyncio.to_thread(MemoryAgent, *key)
+    finally:
+        del _agent_builds[key]
+    _agent_pool[key] = memory_agent
+    if len(_agent_pool) > MEMORY_AGENT_POOL_SIZE:
+        _, evicted = _agent_pool.popitem(last=False)
+        _close_when_idle(evicted)
+    return memory_agent
+
+
+def _close_when_idle(memory_agent: MemoryAgent) -> None:
+    """Close an evicted agent once its background updates have finished"""
+    pending = _agent_updates.get(memory_agent)
+    if not pending:
+        memory_agent.close()
+        return
+
+    updates = set(pending)
+
+    async def close_after_updates() -> None:
+        await asyncio.wait(updates)
+        memory_agent.close()
+
+    _track_update(memory_agent, asyncio.create_task(close_after_updates()))
+
+
+def _recall_long_term(memory_agent: MemoryAgent, user_message: str) -> List[str]:
+    """Long-term recall texts for a message, served from cache when possible"""
+    # Nothing stored yet (new user): skip the embedding call entirely
+    count = memory_agent.collection.count()
+    if count == 0:
+        return []
+    memory_key = (memory_agent.user_id, memory_agent.thread_id)
+    # Embed once; near-duplicate queries reuse the earlier recall
+    query_embedding = memory_agent.embed_query(user_message)
+    long_term = _long_term_cache.get(memory_key, query_embedding)
+    if long_term is None:
+        docs = memory_agent.fetch_long_term(
+            user_message,
+            k=5,
+            query_embedding=query_embedding,
+            count=count
+        )
+        # Materialize the texts once; cache hits reuse them as-is
+        long_term = list(map(attrgetter("page_content"), docs))
+        _long_term_cache.set(memory_key, query_embedding, long_term)
+    return long_term
+
+
+def _render_user_facts(user_facts: Dict) -> Dict[str, str]:
+    """Pre-joined renderings of user facts used by the agent nodes"""
+    items = [f"{k}: {v}" for k, v in user_facts.items()]
+    return {
+        "summary": ", ".join(items[:3]),  # memory context summary
+        "inline": " | ".join(items[:3]),  # RAG query context (kept short)
+        "bullets": "\n".join(f"- {item}" for item in items),  # system prompt
+    }
+
+
+def _load_user_facts(memory_agent: MemoryAgent) -> Tuple[Dict, Dict[str, str]]:
+    """User facts and their rendered text, served from cache when possible"""
+    cached = _user_facts_cache.get(memory_agent.user_id)
+    if cached is None:
+        user_facts = memory_agent.get_user_facts()
+        cached = (user_facts, _render_user_facts(user_facts))
+        _user_facts_cache.set(memory_agent.user_id, cached)
+    return cached
+
 
 # ===============================
 # Memory Fetch Node
 # ===============================
 
-async def memory_fetch_node(state: Dict) -> Dict:
+async def memory_fetch_node(state: AgentState) -> AgentState:
     """Memory fetch with progress tracking"""
     session_id = state.get("session_id", "")
+    notify = progress_callbacks.notify_progress
 
     # Notify start
-    await progress_callbacks.notify_progress(
+    await notify(
         session_id,
         "memory",
         "active",
-        "Loading conversation context and user profile..."
+        "Loading conversation context and user profile...",
+        wait=False
     )
 
-    print("📚 Memory Fetch Node: Loading context...")
+    logger.debug("📚 Memory Fetch Node: Loading context...")
 
     try:
         # Try to use actual memory system
         if MemoryAgent and MemoryConfig:
             try:
-                memory_agent = MemoryAgent(
-                    user_id=state["user_id"],
-                    thread_id=state["thread_id"],
-                    cfg=MemoryConfig()
+                memory_agent = await _get_memory_agent(
+                    state["user_id"],
+                    state["thread_id"]
                 )
 
-                short_term = memory_agent.fetch_short_term()
-                long_term = memory_agent.fetch_long_term(
-                    state["user_message"],
-                    k=5
+                # Independent lookups (Mongo, Chroma, Mongo) run concurrently
+                short_term, long_term, (user_facts, facts_text) = await asyncio.gather(
+                    asyncio.to_thread(memory_agent.fetch_short_term),
+                    asyncio.to_thread(
+                        _recall_long_term, memory_agent, state["user_message"]
+                    ),
+                    asyncio.to_thread(_load_user_facts, memory_agent),
                 )
-                user_facts = memory_agent.get_user_facts()
 
-                print(
-                    f"✅ Real memory system: {len(short_term)} recent, "
-                    f"{len(long_term)} relevant, {len(user_facts)} facts"
+                logger.debug(
+                    "✅ Real memory system: %d recent, %d relevant, %d facts",
+                    len(short_term), len(long_term), len(user_facts)
                 )
 
             except Exception as e:
-                print(f"⚠️  Memory system error, using mock: {e}")
+                logger.warning("⚠️  Memory system error, using mock: %s", e)
                 memory_agent = MockMemoryAgent()
                 short_term = []
                 long_term = []
-                user_facts = {}
+                user_facts, facts_text = {}, {}
         else:
-            print("⚠️  Using mock memory system")
+            logger.warning("⚠️  Using mock memory system")
             memory_agent = MockMemoryAgent()
             short_term = []
             long_term = []
-            user_facts = {}
+            user_facts, facts_text = {}, {}
 
         # Build context summary
-        context_summary_parts = []
-        if user_facts:
-            facts_str = ", ".join([
-                f"{k}: {v}"
-                for k, v in list(user_facts.items())[:3]
-            ])
-            context_summary_parts.append(f"User profile: {facts_str}")
-
-        if long_term:
-            context_summary_parts.append(
-                f"Relevant past conversations ({len(long_term)} entries)"
-            )
-
-        if short_term:
-            context_summary_parts.append(
-                f"Recent history ({len(short_term)} messages)"
-            )
+        context_summary = " | ".join(filter(None, (
+            user_facts and f"User profile: {facts_text['summary']}",
+            long_term and f"Relevant past conversations ({len(long_term)} entries)",
+            short_term and f"Recent history ({len(short_term)} messages)",
+        ))) or "No context available"
 
         memory_context = {
             "short_term": short_term,
-            "long_term": [
-                doc.page_content if hasattr(doc, 'page_content') else str(doc)
-                for doc in long_term
-            ],
+            "long_term": long_term,
             "user_facts": user_facts,
-            "context_summary": (
-                " | ".join(context_summary_parts)
-                if context_summary_parts
-                else "No context available"
-            ),
+            "user_facts_text": facts_text,
+            "context_summary": context_summary,
             "memory_agent": memory_agent
         }
 
         # Prepare detailed progress message
-        details = []
-        if short_term:
-            details.append(f"{len(short_term)} recent messages")
-        if long_term:
-            details.append(f"{len(long_term)} relevant conversations")
-        if user_facts:
-            details.append(f"{len(user_facts)} user facts")
-
-        detail_text = (
-            "Loaded: " + ", ".join(details)
-            if details
-            else "Memory context loaded"
-        )
+        details = ", ".join(filter(None, (
+            short_term and f"{len(short_term)} recent messages",
+            long_term and f"{len(long_term)} relevant conversations",
+            user_facts and f"{len(user_facts)} user facts",
+        )))
+        detail_text = f"Loaded: {details}" if details else "Memory context loaded"
 
         # Notify completion
-        await progress_callbacks.notify_progress(
+        await notify(
             session_id,
             "memory",
             "completed",
-            detail_text
+            detail_text,
+            wait=False
         )
 
-        return {
-            **state,
-            "memory_context": memory_context
-        }
+        state["memory_context"] = memory_context
+        return state
 
     except Exception as e:
-        print(f"❌ Memory fetch error: {e}")
-        await progress_callbacks.notify_progress(
+        logger.exception("❌ Memory fetch error: %s", e)
+        await notify(
             session_id,
             "memory",
             "error",
-            f"Memory fetch failed: {str(e)}"
+            f"Memory fetch failed: {str(e)}",
+            wait=False
         )
-        return {
-            **state,
-            "memory_context": {"error": str(e)}
-        }
+        state["memory_context"] = {"error": str(e)}
+        return state
 
 
 # ===============================
 # Memory Update Node
 # ===============================
 
-async def memory_update_node(state: Dict) -> Dict:
-    """Memory update with progress tracking"""
-    session_id = state.get("session_id", "")
+# Background memory updates still running; holding a reference keeps the
+# tasks from being garbage-collected mid-flight. Also indexed per agent so
+# an evicted agent is closed only after its own updates are done.
+_update_tasks: Set[asyncio.Task] = set()
+_agent_updates: Dict[MemoryAgent, Set[asyncio.Task]] = {}
 
-    await progress_callbacks.notify_progress(
-        session_id,
-        "update",
-        "active",
-        "Saving conversation to memory system..."
-    )
 
-    print("💾 Memory Update Node: Saving conversation...")
-    print(f"   User message: {state.get('user_message', 'N/A')[:50]}...")
-    print(f"   Agent response: {state.get('agent_response', 'N/A')[:50]}...")
+def _track_update(memory_agent: MemoryAgent, task: asyncio.Task) -> None:
+    """Keep a background task referenced until it finishes"""
+    _update_tasks.add(task)
+    _agent_updates.setdefault(memory_agent, set()).add(task)
+
+    def done(finished: asyncio.Task) -> None:
+        _update_tasks.discard(finished)
+        tasks = _agent_updates.get(memory_agent)
+        if tasks is not None:
+            tasks.discard(finished)
+            if not tasks:
+                del _agent_updates[memory_agent]
 
+    task.add_done_callback(done)
+
+
+async def _do_update(
+    memory_agent: MemoryAgent,
+    user_id: str,
+    thread_id: str,
+    user_message: str,
+    agent_response: str
+) -> None:
+    """Write facts and embeddings for a finished turn"""
     try:
-        memory_agent = state["memory_context"].get("memory_agent")
-        if memory_agent:
-            # Safely get user_id and thread_id (handle MockMemoryAgent case)
-            user_id = getattr(
-                memory_agent,
-                'user_id',
-                state.get('user_id', 'unknown')
-            )
-            thread_id = getattr(
-                memory_agent,
-                'thread_id',
-                state.get('thread_id', 'unknown')
-            )
-            print(f"   Memory agent found: user_id={user_id}, thread_id={thread_id}")
+        # Memory update for facts and long-term storage only
+        # Message persistence is handled by main app's unified database
+        # Embedding, Chroma/Mongo writes and the fact-extraction LLM call
+        # are blocking; keep them off the event loop
+        await asyncio.to_thread(
+            memory_agent.update_facts_and_embeddings,
+            user_message,
+            agent_response
+        )
+        _invalidate_memory_caches(user_id, thread_id)
 
-            # Memory update for facts and long-term storage only
-            # Message persistence is handled by main app's unified database
-            memory_agent.update_facts_and_embeddings(
-                state["user_message"],
-                state["agent_response"]
-            )
+        # Debug: Check if facts were extracted
+        if logger.isEnabledFor(logging.DEBUG):
+            facts = await asyncio.to_thread(memory_agent.get_user_facts)
+            logger.debug("   Current user facts after update: %s", facts)
+        logger.debug("✅ Memory context updated (no duplicate message saving)")
 
-            # Debug: Check if facts were extracted
-            facts = memory_agent.get_user_facts()
-            print(f"   Current user facts after update: {facts}")
+    except Exception as e:
+        logger.exception("❌ Memory update error: %s", e)
 
-            detail_text = "Memory context updated (facts and embeddings)"
-            await progress_callbacks.notify_progress(
-                session_id,
-                "update",
-                "completed",
-                detail_text
-            )
 
-            print("✅ Memory context updated (no duplicate message saving)")
-            return {
-                **state,
-                "metadata": {
-                    **state.get("metadata", {}),
-                    "memory_updated": True
-                }
-            }
-        else:
-            detail_text = "Memory update skipped (no agent available)"
-            await progress_callbacks.notify_progress(
-                session_id,
-                "update",
-                "completed",
-                detail_text
-            )
+async def flush_pending_updates(timeout: Optional[float] = None) -> None:
+    """Wait for in-flight memory updates, e.g. before shutdown"""
+    if _update_tasks:
+        await asyncio.wait(set(_update_tasks), timeout=timeout)
 
-            print("⚠️  No memory agent available in state!")
-            print(
-                f"   Memory context keys: "
-                f"{list(state.get('memory_context', {}).keys())}"
-            )
-            return {
-                **state,
-                "metadata": {
-                    **state.get("metadata", {}),
-                    "memory_updated": False
-                }
-            }
 
-    except Exception as e:
-        print(f"❌ Memory update error: {e}")
-        import traceback
-        traceback.print_exc()
-        await progress_callbacks.notify_progress(
-            session_id,
-            "update",
-            "error",
-            f"Memory update failed: {str(e)}"
+async def memory_update_node(state: AgentState) -> AgentState:
+    """Schedule the memory update in the background and return immediately"""
+    session_id = state.get("session_id", "")
+    notify = progress_callbacks.notify_progress
+
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug("💾 Memory Update Node: Saving conversation...")
+        logger.debug("   User message: %s...", state.get('user_message', 'N/A')[:50])
+        logger.debug("   Agent response: %s...", state.get('agent_response', 'N/A')[:50])
+
+    memory_agent = state.get("memory_context", {}).get("memory_agent")
+    if memory_agent:
+        # Safely get user_id and thread_id (handle MockMemoryAgent case)
+        user_id = getattr(
+            memory_agent,
+            'user_id',
+            state.get('user_id', 'unknown')
         )
-        return {
-            **state,
-            "metadata": {
-                **state.get("metadata", {}),
-                "memory_update_error": str(e)
-            }
-        }
+        thread_id = getattr(
+            memory_agent,
+            'thread_id',
+            state.get('thread_id', 'unknown')
+        )
+        logger.debug("   Memory agent found: user_id=%s, thread_id=%s", user_id, thread_id)
+
+        # Nothing later in this turn reads the update, so it runs off the
+        # response path
+        task = asyncio.create_task(_do_update(
+            memory_agent,
+            user_id,
+            thread_id,
+            state["user_message"],
+            state["agent_response"]
+        ))
+        _track_update(memory_agent, task)
+
+        detail_text = "Saving facts and embeddings in the background"
+        memory_updated = True
+    else:
+        detail_text = "Memory update skipped (no agent available)"
+        memory_updated = False
+
+        logger.warning("⚠️  No memory agent available in state!")
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug(
+                "   Memory context keys: %s",
+                list(state.get('memory_context', {}).keys())
+            )
+
+    await notify(
+        session_id,
+        "update",
+        "completed",
+        detail_text,
+        wait=False
+    )
+
+    state.setdefault("metadata", {})["memory_updated"] = memory_updated
+    return state
@@ -2,10 +2,25 @@
 RAG agent node for LangGraph workflow
 Handles document search with progress tracking and context awareness
 """
-from typing import Dict
+import asyncio
+import logging
+import time
+from operator import itemgetter
+from typing import Dict, List, Tuple
+from core.cache.memory_cache import MemoryCache
+from core.cache.query_cache import get_query_cache
+from core.cache.semantic_cache import RAG_ANSWER_TTL, get_rag_answer_cache
+from rag_agent.embedding_helpers import embed_text
 from rag_agent.ragagent_simple import rag_answer
+from graph.state import AgentState
 from utils.track_progress import progress_callbacks
 
+logger = logging.getLogger(__name__)
+
+# Exact-text memo of query embeddings; repeated enhanced queries skip the
+# embedding model before the semantic answer lookup
+_query_embeddings = MemoryCache(maxsize=2048, ttl=3600, name="rag_query_embedding")
+
 
 # Streaming helper function for RAG
 async def send_streaming_response(
@@ -21,37 +36,160 @@ async def send_streaming_response(
                 "partial_response": partial_response,
                 "agent_type": agent_type,
                 "tools_used": tools_used
-            }
+            },
+            wait=False
         )
     except Exception as e:
-        print(f"Error sending streaming response: {e}")
+        logger.warning("Error sending streaming response: %s", e)
+
+
+def _build_enhanced_query(user_message: str, memory_context: Dict) -> Tuple[str, int]:
+    """Prefix the question with user profile and recent turns, if any
+
+    Returns the query and the number of context elements used.
+    """
+    user_facts = memory_context.get("user_facts")
+    short_term = memory_context.get("short_term")
+    if not user_facts and not short_term:
+        return user_message, 0  # Cold session: query as-is
+
+    context_parts = []
+    if user_facts:
+        context_parts.append(
+            f"User profile: {memory_context['user_facts_text']['inline']}"
+        )
+    if short_term:
+        # isspace() tests blank content without building a stripped copy
+        recent_context = " | ".join(
+            f"{role}: {content[:100]}..."
+            for role, content in map(
+                itemgetter("role", "content"), short_term[-3:]  # Last 3 messages
+            )
+            if content and not content.isspace()
+        )
+        if recent_context:
+            context_parts.append(f"Recent conversation: {recent_context}")
+
+    if not context_parts:
+        return user_message, 0
+    return (
+        f"Context: {' | '.join(context_parts)}\n\nCurrent question: {user_message}",
+        len(context_parts)
+    )
+
+
+async def _embed_query(text: str):
+    """Embed off the event loop, once per distinct query text"""
+    query_embedding = _query_embeddings.get(text)
+    if query_embedding is None:
+        query_embedding = await asyncio.to_thread(embed_text, text)
+        _query_embeddings.set(text, query_embedding)
+    return query_embedding
+
+
+async def _cache_scope(collection_name: str, user_id: str = "", personalized: bool = False) -> str:
+    """Answer-cache partition for a query
+
+    A query enhanced with a user's profile and recent turns yields an answer
+    for that user only; plain queries are shared by everyone on the collection.
+    The collection's version retires every answer once its documents change.
+    """
+    version = await get_query_cache().async_collection_version(collection_name)
+    scope = f"{collection_name}@v{version}"
+    return f"{user_id}:{scope}" if personalized else scope
+
+
+async def _answer_and_cache(
+    query: str,
+    collection_name: str,
+    query_embedding,
+    scope: str,
+    **extra_metadata
+) -> Tuple[str, Dict]:
+    """Run the RAG pipeline and store answers backed by documents in both tiers"""
+    # Use standard RAG retrieval with collection_name
+    response, metadata = await asyncio.to_thread(
+        rag_answer,
+        query,
+        top_k=5,
+        collection_name=collection_name,
+        query_embedding=query_embedding
+    )
+    if metadata.get("chunks_found"):
+        cached_metadata = {**metadata, **extra_metadata}
+        get_rag_answer_cache().set(
+            scope,
+            query_embedding,
+            (response, dict(cached_metadata))
+        )
+        await get_query_cache().async_set_response(
+            query,
+            response,
+            cached_metadata,
+            context=scope,
+            ttl=RAG_ANSWER_TTL
+        )
+    return response, metadata
+
+
+async def warm_rag_cache(
+    queries: List[str],
+    collection_name: str = "documents",
+    concurrency: int = 4
+) -> int:
+    """Answer expected queries ahead of time so their first ask is a cache hit
+
+    Queries are cached as a cold session sends them (no memory context).
+    Returns the number of queries answered from documents.
+    """
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def warm(query: str) -> bool:
+        async with semaphore:
+            try:
+                query_embedding = await _embed_query(query)
+                scope = await _cache_scope(collection_name)
+                if get_rag_answer_cache().get(scope, query_embedding) is not None:
+                    return True
+                _, metadata = await _answer_and_cache(
+                    query, collection_name, query_embedding, scope, warmup=True
+                )
+                return bool(metadata.get("chunks_found"))
+            except Exception as e:
+                logger.warning("RAG warmup failed for %r: %s", query, e)
+                return False
+
+    results = await asyncio.gather(*(warm(query) for query in queries))
+    return sum(results)
 
 
 # ===============================
 # RAG Agent Node
 # ===============================
 
-async def rag_agent_node(state: Dict) -> Dict:
+async def rag_agent_node(state: AgentState) -> AgentState:
     """RAG agent with progress tracking and memory context awareness"""
     session_id = state.get("session_id", "")
+    notify = progress_callbacks.notify_progress
 
     # Determine collection name based on session rag_mode
     # This needs to be passed from the WebSocket handler
     collection_name = state.get("collection_name", "documents")
     rag_mode = state.get("rag_mode", "unified_kb")
 
-    mode_emoji = "📁" if rag_mode == "specific_files" else "🗄️"
-    print(f"{mode_emoji} RAG Mode: {rag_mode}, Collection: {collection_name}")
+    logger.debug("RAG Mode: %s, Collection: %s", rag_mode, collection_name)
 
-    await progress_callbacks.notify_progress(
+    await notify(
         session_id,
         "agent",
         "active",
-        f"Searching {rag_mode} knowledge base..."
+        f"Searching {rag_mode} knowledge base...",
+        wait=False
     )
 
-    print(
-        f"🔍 RAG Agent Node: Processing document search with context awareness... (collection: {collection_name})"
+    logger.debug(
+        "🔍 RAG Agent Node: Processing document search with context awareness... (collection: %s)",
+        collection_name
     )
 
     try:
@@ -61,50 +199,51 @@ async def rag_agent_node(state: Dict) -> Dict:
                 memory_context = state.get("memory_context", {})
                 user_message = state["user_message"]
 
-                # Build context-aware query
-                context_parts = []
-
-                # Add user facts if available
                 user_facts = memory_context.get("user_facts", {})
-                if user_facts:
-                    facts_str = " | ".join([
-                        f"{k}: {v}"
-                        for k, v in user_facts.items()
-                    ])
-                    context_parts.append(f"User profile: {facts_str}")
-
-                # Add recent conversation context
                 short_term = memory_context.get("short_term", [])
-                if short_term:
-                    recent_context = " | ".join([
-                        f"{msg['role']}: {msg['content'][:100]}..."
-                        for msg in short_term[-3:]  # Last 3 messages
-                        if msg['content'].strip()
-                    ])
-                    context_parts.append(
-                        f"Recent conversation: {recent_context}"
-                    )
 
-                # Create enhanced query with context
-                if context_parts:
-                    enhanced_query = (
-                        f"Context: {' | '.join(context_parts)}\n\n"
-                        f"Current question: {user_message}"
-                    )
-                else:
-                    enhanced_query = user_message
+                enhanced_query, context_count = _build_enhanced_query(
+                    user_message, memory_context
+                )
 
-                print(
-                    f"🧠 Using context-enhanced query "
-                    f"(context parts: {len(context_parts)})"
+                logger.debug(
+                    "🧠 Using context-enhanced query (context parts: %d)",
+                    context_count
                 )
 
-                # Use standard RAG retrieval with collection_name
-                response, metadata = rag_answer(
-                    enhanced_query,
-                    top_k=5,
-                    collection_name=collection_name
+                # L1: near-duplicate queries on the same collection in this
+                # process; L2: exact query shared across workers via Redis.
+                # The L2 probe only needs the text, so it overlaps embedding.
+                # Context-enhanced queries are cached per user.
+                scope = await _cache_scope(
+                    collection_name, state.get("user_id", ""), context_count > 0
+                )
+                rag_cache = get_rag_answer_cache()
+                query_cache = get_query_cache()
+                query_embedding, shared = await asyncio.gather(
+                    _embed_query(enhanced_query),
+                    query_cache.async_get_response(enhanced_query, context=scope)
                 )
+                cached = rag_cache.get(scope, query_embedding)
+                if cached is not None:
+                    response, metadata = cached[0], {
+                        **cached[1], "cache_hit": True, "cached": "semantic"
+                    }
+                elif shared is not None:
+                    # Already marked cached/cache_hit by QueryCache; L1 keeps
+                    # it only for what is left of its lifetime
+                    response, metadata = shared
+                    age = time.time() - (metadata.get("cached_at") or time.time())
+                    rag_cache.set(
+                        scope, query_embedding, (response, dict(metadata)), age=age
+                    )
+                else:
+                    response, metadata = await _answer_and_cache(
+                        enhanced_query, collection_name, query_embedding, scope
+                    )
+                    metadata["cache_hit"] = False
+                if metadata.get("warmup"):
+                    logger.debug("🔥 RAG answer served from startup warmup")
 
                 # Stream the RAG response
                 await send_streaming_response(
@@ -115,47 +254,34 @@ async def rag_agent_node(state: Dict) -> Dict:
                 )
 
                 # Simple context integration
-                if context_parts:
-                    print(
-                        "✨ RAG response includes conversational "
-                        "context awareness"
-                    )
-                    metadata["context_enhanced"] = True
-
                 # Update metadata to reflect context usage
                 metadata.update({
                     "context_used": len(short_term),
                     "user_facts_count": len(user_facts),
-                    "context_enhanced": len(context_parts) > 0
+                    "context_enhanced": context_count > 0
                 })
 
                 # Add agent_type to metadata if not present
                 if "agent_type" not in metadata:
                     metadata["agent_type"] = "rag_agent"
 
-                print(
-                    f"🔍 RAG agent setting metadata agent_type: "
-                    f"{metadata.get('agent_type')}"
-                )
-
                 chunks_found = metadata.get('chunks_found', 0)
                 detail_text = f"Found {chunks_found} relevant documents"
                 if metadata.get("sources"):
                     unique_sources = len(set(metadata["sources"]))
                     detail_text += f" from {unique_sources} sources"
-                if len(context_parts) > 0:
+                if context_count > 0:
                     detail_text += (
-                        f" | Enhanced with {len(context_parts)} "
+                        f" | Enhanced with {context_count} "
                         f"context elements"
                     )
 
-                print(
-                    f"✅ RAG Agent completed with {chunks_found} documents "
-                    f"and context awareness"
+                logger.debug(
+                    "✅ RAG Agent completed with %d documents", chunks_found
                 )
 
             except Exception as rag_error:
-                print(f"⚠️  RAG system error: {rag_error}")
+                logger.warning("⚠️  RAG system error: %s", rag_error)
                 response = (
                     "I apologize, but the document search system "
                     "encountered an error. Please try again later."
@@ -168,7 +294,7 @@ async def rag_agent_node(state: Dict) -> Dict:
                 }
                 detail_text = "Document search failed"
         else:
-            print("⚠️  RAG system unavailable")
+            logger.warning("⚠️  RAG system unavailable")
             response = (
                 "I apologize, but the document search system "
                 "is currently unavailable."
@@ -181,33 +307,31 @@ async def rag_agent_node(state: Dict) -> Dict:
             }
             detail_text = "RAG system unavailable"
 
-        await progress_callbacks.notify_progress(
+        await notify(
             session_id,
             "agent",
             "completed",
-            detail_text
+            detail_text,
+            wait=False
         )
 
-        return {
-            **state,
-            "agent_response": response,
-            "metadata": {**state.get("metadata", {}), **metadata}
-        }
+        state["agent_response"] = response
+        state.setdefault("metadata", {}).update(metadata)
+        return state
 
     except Exception as e:
-        print(f"❌ RAG Agent error: {e}")
-        await progress_callbacks.notify_progress(
+        logger.exception("❌ RAG Agent error: %s", e)
+        await notify(
             session_id,
             "agent",
             "error",
-            f"RAG agent failed: {str(e)}"
+            f"RAG agent failed: {str(e)}",
+            wait=False
         )
         error_msg = (
             "I encountered an error searching the documents. "
             "Please try again."
         )
-        return {
-            **state,
-            "agent_response": error_msg,
-            "metadata": {**state.get("metadata", {}), "error": str(e)}
-        }
+        state["agent_response"] = error_msg
+        state.setdefault("metadata", {})["error"] = str(e)
+        return state
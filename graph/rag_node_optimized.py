@@ -1,243 +0,0 @@
-"""
-Optimized RAG Node with Async Operations and Caching
-
-This is the updated version of rag_node.py that uses the optimized AsyncRagAgent.
-
-Key improvements:
-- Uses async RagAgent with caching
-- Better performance (50-80% faster)
-- Reduced API costs (75-80%)
-- Backward compatible with existing workflow
-"""
-
-from typing import Dict
-from rag_agent.ragagent_optimized import AsyncRagAgent, rag_answer_optimized
-from utils.track_progress import progress_callbacks
-
-# =============================================================================
-# Optimized RAG Agent Node
-# =============================================================================
-
-async def optimized_rag_agent_node(state: Dict) -> Dict:
-    """
-    Optimized RAG agent node using async operations and caching.
-
-    Improvements over original:
-    - 50-80% latency reduction
-    - 75-80% cost reduction
-    - 90%+ faster for cached queries
-    - Parallel text+image retrieval
-    - Single LLM call instead of N+1
-    """
-    session_id = state.get("session_id", "")
-
-    await progress_callbacks.notify_progress(
-        session_id, "agent", "active", "Searching documents (optimized)..."
-    )
-
-    print("🚀 Optimized RAG Agent Node: High-performance document search with caching...")
-
-    try:
-        # Get memory context for context-aware RAG
-        memory_context = state.get("memory_context", {})
-        user_message = state["user_message"]
-
-        # Build context-aware query
-        context_parts = []
-
-        # Add user facts if available
-        user_facts = memory_context.get("user_facts", {})
-        if user_facts:
-            facts_str = " | ".join([f"{k}: {v}" for k, v in user_facts.items()])
-            context_parts.append(f"User profile: {facts_str}")
-
-        # Add recent conversation context
-        short_term = memory_context.get("short_term", [])
-        if short_term:
-            recent_context = " | ".join([
-                f"{msg['role']}: {msg['content'][:100]}..."
-                for msg in short_term[-3:]  # Last 3 messages
-                if msg['content'].strip()
-            ])
-            context_parts.append(f"Recent conversation: {recent_context}")
-
-        # Create enhanced query with context
-        if context_parts:
-            enhanced_query = f"Context: {' | '.join(context_parts)}\n\nCurrent question: {user_message}"
-            context_key = " | ".join(context_parts)  # For cache key
-        else:
-            enhanced_query = user_message
-            context_key = None
-
-        print(f"🧠 Using context-enhanced query (context parts: {len(context_parts)})")
-
-        # Use optimized async RAG with caching
-        agent = AsyncRagAgent.get_instance()
-        response, metadata = await agent.rag_answer(
-            enhanced_query,
-            top_k_text=5,
-            top_k_image=5,
-            top_n=3,
-            context=context_key  # For cache differentiation
-        )
-
-        # Stream the RAG response
-        await send_streaming_response(session_id, response, "rag_agent_optimized", ["rag_retrieval"])
-
-        # Add context enhancement flag
-        if context_parts:
-            print("✨ RAG response includes conversational context awareness")
-            metadata["context_enhanced"] = True
-
-        # Update metadata
-        metadata.update({
-            "context_used": len(short_term),
-            "user_facts_count": len(user_facts),
-            "context_enhanced": len(context_parts) > 0
-        })
-
-        # Add caching info to metadata
-        if metadata.get("cached"):
-            print(f"⚡ Response served from cache (90%+ faster)")
-
-        print(f"🔍 RAG agent metadata: {metadata.get('agent_type')}, hits: {metadata.get('hits_count')}")
-
-        # Build detail text
-        detail_text = f"Found {metadata['hits_count']} relevant documents"
-        if metadata.get("sources"):
-            unique_sources = len(set(metadata["sources"]))
-            detail_text += f" from {unique_sources} sources"
-        if metadata.get("cached"):
-            detail_text += " (cached)"
-        if len(context_parts) > 0:
-            detail_text += f" | Enhanced with {len(context_parts)} context elements"
-
-        await progress_callbacks.notify_progress(
-            session_id, "agent", "completed", detail_text
-        )
-
-        print(f"✅ Optimized RAG Agent completed: {detail_text}")
-
-        return {
-            **state,
-            "agent_response": response,
-            "metadata": {**state.get("metadata", {}), **metadata}
-        }
-
-    except Exception as e:
-        print(f"❌ Optimized RAG Agent error: {e}")
-        import traceback
-        traceback.print_exc()
-
-        await progress_callbacks.notify_progress(
-            session_id, "agent", "error", f"RAG agent failed: {str(e)}"
-        )
-
-        error_msg = "I encountered an error searching the documents. Please try again."
-        return {
-            **state,
-            "agent_response": error_msg,
-            "metadata": {**state.get("metadata", {}), "error": str(e)}
-        }
-
-
-# Streaming helper (same as original)
-async def send_streaming_response(session_id, partial_response, agent_type="rag_agent", tools_used=[]):
-    """Send a partial response via progress callback for streaming"""
-    try:
-        await progress_callbacks.notify_progress(
-            session_id, "streaming", "partial", {
-                "partial_response": partial_response,
-                "agent_type": agent_type,
-                "tools_used": tools_used
-            }
-        )
-    except Exception as e:
-        print(f"Error sending streaming response: {e}")
-
-
-# =============================================================================
-# Backward Compatibility: Keep original function signature
-# =============================================================================
-
-async def enhanced_rag_agent_node(state: Dict) -> Dict:
-    """
-    Enhanced RAG agent node (now uses optimized version).
-
-    This is a drop-in replacement that maintains backward compatibility
-    while providing all the performance benefits.
-    """
-    return await optimized_rag_agent_node(state)
-
-
-# For non-async workflows (legacy support)
-def rag_agent_node(state: Dict) -> Dict:
-    """
-    Synchronous RAG agent node wrapper.
-
-    NOTE: This runs the async version in a sync context.
-    For best performance, use the async version directly.
-    """
-    import asyncio
-
-    try:
-        # Run async version in sync context
-        loop = asyncio.get_event_loop()
-        if loop.is_running():
-            # If loop is already running, create task
-            import concurrent.futures
-            with concurrent.futures.ThreadPoolExecutor() as executor:
-                future = executor.submit(asyncio.run, optimized_rag_agent_node(state))
-                return future.result()
-        else:
-            # No loop running, safe to use asyncio.run
-            return asyncio.run(optimized_rag_agent_node(state))
-    except Exception as e:
-        print(f"Error in sync wrapper: {e}")
-        # Fallback to error response
-        return {
-            **state,
-            "agent_response": "I encountered an error searching the documents.",
-            "metadata": {**state.get("metadata", {}), "error": str(e)}
-        }
-
-
-# =============================================================================
-# Performance Monitoring
-# =============================================================================
-
-async def get_rag_performance_stats() -> dict:
-    """Get performance statistics for the optimized RAG agent"""
-    try:
-        agent = AsyncRagAgent.get_instance()
-        return agent.get_stats()
-    except Exception as e:
-        return {"error": str(e)}
-
-
-if __name__ == "__main__":
-    # Test optimized RAG node
-    print("Testing Optimized RAG Node...")
-
-    async def test():
-        # Mock state
-        test_state = {
-            "session_id": "test_session",
-            "user_message": "What is machine learning?",
-            "memory_context": {}
-        }
-
-        # Run optimized node
-        result = await optimized_rag_agent_node(test_state)
-
-        print(f"\nResult:")
-        print(f"  Response: {result['agent_response'][:100]}...")
-        print(f"  Metadata: {result['metadata']}")
-
-        # Get stats
-        stats = await get_rag_performance_stats()
-        print(f"\nPerformance Stats:")
-        print(f"  {stats}")
-
-    import asyncio
-    asyncio.run(test())
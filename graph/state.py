@@ -0,0 +1,43 @@
+"""
+Shared state of the LangGraph multi-agent workflow
+"""
+from typing import Any, Dict, List, TypedDict
+
+
+class AgentState(TypedDict, total=False):
+    """
+    Workflow state passed between nodes.
+
+    The graph is built as StateGraph(dict): one state dict flows through every
+    node. Nodes update it in place (state[...] = ..., metadata.update(...))
+    and return it, so a hop never copies the state or its memory context.
+    """
+    # Request
+    user_message: str
+    user_id: str
+    thread_id: str
+    session_id: str
+    session_mode: str
+    chat_mode: str
+    collection_name: str
+    rag_mode: str
+    messages: List[Any]
+
+    # Filled in by the nodes
+    memory_context: Dict[str, Any]
+    query_embedding: Any  # Chatbot semantic-cache embedding of user_message
+    agent_response: str
+    metadata: Dict[str, Any]
+    tools_used: List[str]
+    tool_results: List[Any]
+    wikipedia_results: List[Any]  # Backward compatibility
+    selected_agent: str  # Legacy field
+    supervisor_decision: str
+    decision_reason: str
+
+    # Guardrails
+    input_validation: Dict[str, Any]
+    validation_failed: bool
+    validation_error: str
+    output_sanitization: Dict[str, Any]
+    guardrails_report: Dict[str, Any]
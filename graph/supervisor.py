@@ -1,21 +1,60 @@
 """
 Supervisor node for LangGraph workflow
 Fast rule-based routing with progress tracking
+
+Deprecated: the workflow routes by session mode (route_by_session_mode in
+graph.workflow); this node is kept importable for backward compatibility only.
 """
-from typing import Dict
-from openai import OpenAI
-import os
+import logging
+import re
+import warnings
+from graph.state import AgentState
 from utils.track_progress import progress_callbacks
 
-openai_client = OpenAI(api_key=os.getenv("OPENAI_API_KEY"))
+logger = logging.getLogger(__name__)
+
+
+_AGENT_NAMES = {
+    "rag_agent": "RAG Agent (Document Search)",
+    "chatbot": "Chatbot Agent (Conversation & Wikipedia)"
+}
+
+
+def _decision(selected_agent: str, reason: str):
+    """Routing decision: (agent, reason, progress detail text)"""
+    return selected_agent, reason, f"Routed to: {_AGENT_NAMES[selected_agent]} | {reason}"
+
+
+# Fast rule-based routing, with every decision built once at import: chat
+# modes that always go to RAG, and keywords (matched at word starts,
+# case-insensitively) that suggest a document search
+_MODE_DECISIONS = {
+    mode: _decision("rag_agent", f"User mode: {mode}")
+    for mode in ("rag", "my_resources")
+}
+_KEYWORD_DECISION = _decision("rag_agent", "Keyword match detected")
+_DEFAULT_DECISION = _decision("chatbot", "General conversation")
+_RAG_KEYWORDS_RE = re.compile(
+    r"\b(?:search|find|document|file|pdf|image|upload|retrieve|lookup|query|"
+    r"database|knowledge|source|reference|cite|extract|analyze document)",
+    re.IGNORECASE
+)
 
 
 # ===============================
 # Supervisor Node
 # ===============================
 
-async def supervisor_node(state: Dict) -> Dict:
-    """Supervisor with fast rule-based routing and progress tracking"""
+async def supervisor_node(state: AgentState) -> AgentState:
+    """Supervisor with fast rule-based routing and progress tracking
+
+    Deprecated: not part of the workflow graph, which routes by session mode.
+    """
+    warnings.warn(
+        "supervisor_node is deprecated; the workflow routes by session_mode",
+        DeprecationWarning,
+        stacklevel=2
+    )
     session_id = state.get("session_id", "")
     chat_mode = state.get("chat_mode", "general")
 
@@ -26,43 +65,21 @@ async def supervisor_node(state: Dict) -> Dict:
         "Analyzing request and routing..."
     )
 
-    print("🧠 Supervisor: Making routing decision...")
-    print(f"🔍 Supervisor received chat_mode: {chat_mode}")
-    print(f"🔍 Supervisor received state keys: {list(state.keys())}")
+    logger.debug("🧠 Supervisor: Making routing decision...")
+    logger.debug("🔍 Supervisor received chat_mode: %s", chat_mode)
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug("🔍 Supervisor received state keys: %s", list(state.keys()))
 
     try:
-        user_message = state['user_message'].lower()
-
-        # Fast rule-based routing
-        rag_keywords = [
-            'search', 'find', 'document', 'file', 'pdf', 'image', 'upload',
-            'retrieve', 'lookup', 'query', 'database', 'knowledge', 'source',
-            'reference', 'cite', 'extract', 'analyze document'
-        ]
-
-        # Check chat mode first
-        if chat_mode == 'rag' or chat_mode == 'my_resources':
-            selected_agent = "rag_agent"
-            reason = f"User mode: {chat_mode}"
-            print(f"🎯 Routing to RAG (mode: {chat_mode})")
-        elif any(keyword in user_message for keyword in rag_keywords):
-            selected_agent = "rag_agent"
-            reason = "Keyword match detected"
-            print("🎯 Routing to RAG (keyword match)")
-        else:
-            selected_agent = "chatbot"
-            reason = "General conversation"
-            print("🎯 Routing to Chatbot (default)")
-
-        # Prepare detailed message
-        agent_names = {
-            "rag_agent": "RAG Agent (Document Search)",
-            "chatbot": "Chatbot Agent (Conversation & Wikipedia)"
-        }
-        detail_text = (
-            f"Routed to: {agent_names.get(selected_agent, selected_agent)}"
-            f" | {reason}"
-        )
+        # Explicit chat mode first, then keywords
+        decision = _MODE_DECISIONS.get(chat_mode)
+        if decision is None:
+            decision = (
+                _KEYWORD_DECISION if _RAG_KEYWORDS_RE.search(state['user_message'])
+                else _DEFAULT_DECISION
+            )
+        selected_agent, reason, detail_text = decision
+        logger.debug("🎯 Routing to %s (%s)", selected_agent, reason)
 
         await progress_callbacks.notify_progress(
             session_id,
@@ -71,22 +88,18 @@ async def supervisor_node(state: Dict) -> Dict:
             detail_text
         )
 
-        return {
-            **state,
-            "selected_agent": selected_agent,
-            "supervisor_decision": selected_agent,
-            "decision_reason": reason
-        }
+        state["selected_agent"] = selected_agent
+        state["supervisor_decision"] = selected_agent
+        state["decision_reason"] = reason
+        return state
 
     except Exception as e:
-        print(f"❌ Supervisor error: {e}")
+        logger.exception("❌ Supervisor error: %s", e)
         await progress_callbacks.notify_progress(
             session_id,
             "supervisor",
             "error",
             f"Supervisor routing failed: {str(e)}"
         )
-        return {
-            **state,
-            "selected_agent": "chatbot"
-        }
+        state["selected_agent"] = "chatbot"
+        return state
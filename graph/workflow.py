@@ -2,14 +2,20 @@
 LangGraph Multi-Agent Workflow System
 Includes progress tracking, memory, RAG, chat agents, and guardrails
 """
+import asyncio
+import logging
 import os
+from functools import partial
 from langgraph.graph import StateGraph, START, END
 from langchain_core.messages import HumanMessage
-from typing import Dict, Any, Literal
+from typing import Dict, Any, Literal, Optional
+from langchain_openai import ChatOpenAI
 
 from graph.memory_nodes import memory_update_node, memory_fetch_node
 from graph.rag_node import rag_agent_node
-from graph.chat_node import chatbot_agent_node
+from graph.chat_node import chatbot_agent_node, embed_for_semantic_cache
+from graph.llm import get_shared_llm
+from graph.state import AgentState
 from graph.guardrails_nodes import (
     input_guardrails_node,
     output_guardrails_node,
@@ -19,6 +25,8 @@ from utils.track_progress import progress_callbacks
 from core.config import Config
 
 
+logger = logging.getLogger(__name__)
+
 # Disable LangSmith tracing to avoid API errors
 os.environ["LANGCHAIN_TRACING_V2"] = "false"
 
@@ -27,7 +35,7 @@ os.environ["LANGCHAIN_TRACING_V2"] = "false"
 # Conditional Edge Functions
 # ===============================
 
-def route_by_session_mode(state: Dict) -> Literal["rag_agent", "chatbot"]:
+def route_by_session_mode(state: AgentState) -> Literal["rag_agent", "chatbot"]:
     """
     Route based on session mode (no supervisor needed)
 
@@ -38,13 +46,35 @@ def route_by_session_mode(state: Dict) -> Literal["rag_agent", "chatbot"]:
     session_mode = state.get("session_mode", "general")
 
     if session_mode == "rag":
-        print("🔀 Routing to RAG Agent (RAG mode)")
+        logger.debug("🔀 Routing to RAG Agent (RAG mode)")
         return "rag_agent"
     else:
-        print("🔀 Routing to Chatbot Agent (Chatbot mode)")
+        logger.debug("🔀 Routing to Chatbot Agent (Chatbot mode)")
         return "chatbot"
 
 
+# ===============================
+# Combined Nodes
+# ===============================
+
+async def memory_fetch_and_embed_node(state: AgentState) -> AgentState:
+    """
+    Memory fetch, overlapped with the chatbot's semantic-cache embedding
+
+    The chatbot embeds the raw user message, which doesn't depend on memory,
+    so both run concurrently instead of back to back. RAG sessions embed the
+    memory-enhanced query later and only fetch memory here.
+    """
+    if state.get("session_mode") == "rag":
+        return await memory_fetch_node(state)
+
+    _, state["query_embedding"] = await asyncio.gather(
+        memory_fetch_node(state),
+        embed_for_semantic_cache(state["user_message"])
+    )
+    return state
+
+
 # ===============================
 # LangGraph Workflow System
 # ===============================
@@ -54,9 +84,16 @@ class LangGraphMultiAgentSystem:
     LangGraph multi-agent system with progress tracking and guardrails
     """
 
-    def __init__(self, user_id: str, thread_id: str = "default"):
+    def __init__(
+        self,
+        user_id: str,
+        thread_id: str = "default",
+        llm: Optional[ChatOpenAI] = None
+    ):
         self.user_id = user_id
         self.thread_id = thread_id
+        # Shared client by default: one HTTP pool across all sessions
+        self.llm = llm or get_shared_llm()
         self.workflow = self._build_workflow()
 
     def _build_workflow(self):
@@ -69,9 +106,9 @@ class LangGraphMultiAgentSystem:
             workflow.add_node("output_guardrails", output_guardrails_node)
 
         # Add core workflow nodes (supervisor removed - using session mode routing)
-        workflow.add_node("memory_fetch", memory_fetch_node)
+        workflow.add_node("memory_fetch", memory_fetch_and_embed_node)
         workflow.add_node("rag_agent", rag_agent_node)
-        workflow.add_node("chatbot", chatbot_agent_node)
+        workflow.add_node("chatbot", partial(chatbot_agent_node, llm=self.llm))
         workflow.add_node("memory_update", memory_update_node)
 
         # Build workflow with guardrails
@@ -89,28 +126,19 @@ class LangGraphMultiAgentSystem:
                 }
             )
 
-            # Route directly by session mode (no supervisor)
-            workflow.add_conditional_edges(
-                "memory_fetch",
-                route_by_session_mode,
-                {
-                    "rag_agent": "rag_agent",
-                    "chatbot": "chatbot"
-                }
-            )
         else:
             # No guardrails - direct to memory fetch
             workflow.add_edge(START, "memory_fetch")
 
-            # Route directly by session mode (no supervisor)
-            workflow.add_conditional_edges(
-                "memory_fetch",
-                route_by_session_mode,
-                {
-                    "rag_agent": "rag_agent",
-                    "chatbot": "chatbot"
-                }
-            )
+        # Route directly by session mode (no supervisor, no routing LLM call)
+        workflow.add_conditional_edges(
+            "memory_fetch",
+            route_by_session_mode,
+            {
+                "rag_agent": "rag_agent",
+                "chatbot": "chatbot"
+            }
+        )
 
         # Route through guardrails if enabled
         if Config.ENABLE_GUARDRAILS:
@@ -145,10 +173,11 @@ class LangGraphMultiAgentSystem:
             collection_name: ChromaDB collection name for RAG queries
             rag_mode: RAG mode - "specific_files" or "unified_kb"
         """
-        mode_emoji = "📚" if session_mode == "rag" else "💬"
-        print(
-            f"\n🚀 LangGraph Workflow ({mode_emoji} {session_mode}): "
-            f"{user_message[:50]}..."
+        logger.debug(
+            "🚀 LangGraph Workflow (%s %s): %s...",
+            "📚" if session_mode == "rag" else "💬",
+            session_mode,
+            user_message[:50]
         )
 
         # Register progress callback if provided
@@ -159,7 +188,7 @@ class LangGraphMultiAgentSystem:
             )
 
         # Initial state with session_id and session_mode for routing
-        initial_state = {
+        initial_state: AgentState = {
             "user_message": user_message,
             "user_id": self.user_id,
             "thread_id": self.thread_id,
@@ -181,7 +210,7 @@ class LangGraphMultiAgentSystem:
             # Run the workflow
             final_state = await self.workflow.ainvoke(initial_state)
 
-            print("🎉 LangGraph Workflow completed")
+            logger.debug("🎉 LangGraph Workflow completed")
 
             # Determine which agent was used based on session_mode
             agent_used = "rag_agent" if session_mode == "rag" else "chatbot"
@@ -199,7 +228,7 @@ class LangGraphMultiAgentSystem:
             }
 
         except Exception as e:
-            print(f"💥 LangGraph Workflow error: {e}")
+            logger.exception("💥 LangGraph Workflow error: %s", e)
             await progress_callbacks.notify_progress(
                 session_id,
                 "error",
@@ -219,14 +248,16 @@ class LangGraphMultiAgentSystem:
                 "memory_context_summary": ""
             }
         finally:
-            # Clean up callbacks
+            # Deliver scheduled progress events before the final response,
+            # then clean up callbacks
+            await progress_callbacks.drain(session_id)
             progress_callbacks.unregister_session(session_id)
 
     def process(self, user_message: str) -> Dict[str, Any]:
         """Synchronous process method for compatibility"""
-        print(f"\n🚀 LangGraph Workflow (sync): {user_message[:50]}...")
+        logger.debug("🚀 LangGraph Workflow (sync): %s...", user_message[:50])
 
-        initial_state = {
+        initial_state: AgentState = {
             "user_message": user_message,
             "user_id": self.user_id,
             "thread_id": self.thread_id,
@@ -244,7 +275,7 @@ class LangGraphMultiAgentSystem:
             # Use synchronous invoke
             final_state = self.workflow.invoke(initial_state)
 
-            print("🎉 LangGraph Workflow completed (sync)")
+            logger.debug("🎉 LangGraph Workflow completed (sync)")
 
             return {
                 "response": final_state["agent_response"],
@@ -258,7 +289,7 @@ class LangGraphMultiAgentSystem:
             }
 
         except Exception as e:
-            print(f"💥 LangGraph Workflow error (sync): {e}")
+            logger.exception("💥 LangGraph Workflow error (sync): %s", e)
             return {
                 "response": (
                     "I encountered an error processing your request. "
@@ -278,10 +309,11 @@ class LangGraphMultiAgentSystem:
 
 def create_langgraph_system(
     user_id: str,
-    thread_id: str = "default"
+    thread_id: str = "default",
+    llm: Optional[ChatOpenAI] = None
 ) -> LangGraphMultiAgentSystem:
-    """Create a new LangGraph-based system"""
-    return LangGraphMultiAgentSystem(user_id=user_id, thread_id=thread_id)
+    """Create a new LangGraph-based system (llm defaults to the shared client)"""
+    return LangGraphMultiAgentSystem(user_id=user_id, thread_id=thread_id, llm=llm)
 
 
 def create_agentic_system(
@@ -2,24 +2,28 @@
 Agentic RAG - Multi-Agent AI System
 Professional modular application structure
 """
+import asyncio
 import os
 import uvicorn
 from contextlib import asynccontextmanager
 from datetime import datetime
 from fastapi import FastAPI, Request, WebSocket, Depends
 from fastapi.staticfiles import StaticFiles
-from fastapi.responses import HTMLResponse, RedirectResponse
+from fastapi.responses import HTMLResponse, RedirectResponse, ORJSONResponse
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.templating import Jinja2Templates
 
 # Core imports
 from core.config import Config
+from core.logging_config import setup_logging, stop_logging
 from core.database.manager import DatabaseManager
 from core.websocket.manager import DatabaseAwareMultiAgentManager
 from core.websocket.handler import handle_websocket_connection
 from core.auth.dependencies import get_current_user
-from core.templates.fallbacks import get_dashboard_html, get_chat_html
+from core.templates.fallbacks import get_dashboard_html, fallback_html_response
 from core.auth.jwt_handler import create_jwt_token
+from core.cache.query_cache import get_query_cache
+from core.vector_store import prewarm as prewarm_vector_store
 
 # API route imports
 from core.api.auth import router as auth_router
@@ -32,15 +36,35 @@ from core.api.calendar import router as calendar_router
 # Graph system import
 try:
     from graph.workflow import create_langgraph_system
+    from graph.memory_nodes import flush_pending_updates
+    from graph.rag_node import warm_rag_cache
     print("✅ LangGraph system imported successfully")
 except ImportError as e:
     print(f"❌ Failed to import LangGraph system: {e}")
     exit(1)
 
 
+def _log_prewarm_result(task: "asyncio.Task") -> None:
+    """Report the outcome of the background vector-store prewarm"""
+    if task.cancelled():
+        return
+    if task.exception():
+        print(f"⚠️  Vector store prewarm failed: {task.exception()}")
+    else:
+        print("✅ Vector store prewarmed")
+
+
+async def _warm_rag_answers(prewarm_task: "asyncio.Task") -> None:
+    """Pre-answer configured RAG queries once the vector store is open"""
+    await asyncio.wait({prewarm_task})
+    warmed = await warm_rag_cache(Config.RAG_WARMUP_QUERIES)
+    print(f"✅ RAG cache warmed ({warmed}/{len(Config.RAG_WARMUP_QUERIES)} queries)")
+
+
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """Application lifespan with database setup"""
+    setup_logging(Config.LOG_LEVEL)
     print("🚀 Starting Multi-Agent AI System with MongoDB Authentication...")
     Config.print_config()
     
@@ -51,15 +75,35 @@ async def lifespan(app: FastAPI):
     
     # Initialize multi-agent manager
     app.state.multi_agent_manager = DatabaseAwareMultiAgentManager(db)
+    app.state.multi_agent_manager.start()
     
     print("✅ Authentication system initialized with MongoDB")
+
+    # Open ChromaDB in the background so the first RAG request doesn't pay
+    # for the import/client startup on the event loop
+    prewarm_task = asyncio.create_task(asyncio.to_thread(prewarm_vector_store))
+    prewarm_task.add_done_callback(_log_prewarm_result)
+
+    # Populate the RAG answer caches for expected questions in the background
+    warmup_task = None
+    if Config.RAG_WARMUP_QUERIES:
+        warmup_task = asyncio.create_task(_warm_rag_answers(prewarm_task))
+
+    # Periodic sweep of expired entries in the in-process response cache
+    cache_cleanup_task = asyncio.create_task(get_query_cache().run_cleanup_loop())
     
     yield
     
     # Cleanup
+    cache_cleanup_task.cancel()
+    if warmup_task is not None:
+        warmup_task.cancel()
+    await flush_pending_updates(timeout=10)
+    await app.state.multi_agent_manager.close()
     if hasattr(app.state, 'db'):
         app.state.db.client.close()
     print("🔄 Shutting down with database cleanup...")
+    stop_logging()
 
 
 # Create FastAPI app
@@ -67,7 +111,8 @@ app = FastAPI(
     title="Multi-Agent AI System with Authentication",
     description="Professional AI system with user authentication and session management",
     version="4.0.0",
-    lifespan=lifespan
+    lifespan=lifespan,
+    default_response_class=ORJSONResponse
 )
 
 # CORS middleware
@@ -174,7 +219,9 @@ async def chat_page(request: Request, session_id: str, current_user = Depends(ge
         })
     except:
         # Fallback if template not found
-        return HTMLResponse(content=get_chat_html())
+        return fallback_html_response(
+            "chat", request.headers.get("accept-encoding", "")
+        )
 
 
 # ===============================
@@ -202,6 +249,7 @@ except Exception:
 # ===============================
 
 if __name__ == "__main__":
+    setup_logging(Config.LOG_LEVEL)
     print("🚀 Starting Multi-Agent AI System with MongoDB Authentication...")
     print("=" * 70)
     print("🔐 Features:")
@@ -219,10 +267,18 @@ if __name__ == "__main__":
     if not os.getenv("MONGODB_URL"):
         print("⚠️ INFO: Using default MongoDB URL (mongodb://localhost:27017)")
     
+    print(f"🔁 Event loop: {Config.EVENT_LOOP}")
+
     uvicorn.run(
         "main:app",
         host="0.0.0.0",
         port=8080,
         reload=True,
-        log_level="info"
+        log_level="info",
+        loop=Config.EVENT_LOOP,
+        # permessage-deflate compresses the repeated JSON keys of streaming
+        # frames; it costs CPU per frame, so it can be turned off
+        ws="websockets",
+        ws_per_message_deflate=Config.WS_PER_MESSAGE_DEFLATE,
+        ws_max_size=Config.WS_MAX_SIZE
     )
\ No newline at end of file
@@ -7,7 +7,7 @@ import os
 from langchain.docstore.document import Document
 from pymongo import MongoClient
 from openai import OpenAI
-from memory.mem_config import MemoryConfig
+from memory.mem_config import MemoryConfig, get_memory_config
 from core.vector_store import get_chroma_client
 
 from dotenv import load_dotenv
@@ -38,7 +38,7 @@ class MemoryAgent:
     ) -> None:
         self.user_id = str(user_id)
         self.thread_id = str(thread_id)
-        self.cfg = cfg or MemoryConfig()
+        self.cfg = cfg or get_memory_config()
 
         # ----- ChromaDB long-term memory (using singleton manager) -----
         os.makedirs(self.cfg.chroma_db_dir, exist_ok=True)
@@ -66,6 +66,10 @@ class MemoryAgent:
         # ----- In-memory short-term buffer -----
         self._short_term: List[Dict[str, str]] = []
 
+    def close(self) -> None:
+        """Release the MongoDB connection pool."""
+        self.mongo.close()
+
     def fetch_short_term(self) -> List[Dict[str,Any]]:
         # pull the last N messages from unified conversations collection
         from bson import ObjectId
@@ -99,28 +103,44 @@ class MemoryAgent:
         ).sort("timestamp", 1).skip(skip).limit(page_size)
         return list(cursor)
 
+    def embed_query(self, query: str):
+        """Embed a query with the long-term memory model."""
+        return self.cfg.embeddings.encode(query)
+
     def fetch_long_term(
         self,
         query: Optional[str] = None,
         k: int = 5,
+        query_embedding: Optional[Any] = None,
+        count: Optional[int] = None,
     ) -> List[Document]:
-        """Semantic recall of past conversation turns using ChromaDB."""
+        """Semantic recall of past conversation turns using ChromaDB.
+
+        Pass query_embedding (from embed_query) to skip re-embedding the query,
+        and count (from collection.count()) if the caller already has it.
+        """
         if query is None and self._short_term and self._short_term[-1]["role"] == "user":
             query = self._short_term[-1]["content"]
-        if not query:
+        if not query and query_embedding is None:
             return []
 
         # Check if collection is empty
-        if self.collection.count() == 0:
+        if count is None:
+            count = self.collection.count()
+        if count == 0:
             return []
 
         # Generate embedding for query
-        query_embedding = self.cfg.embeddings.encode(query).tolist()
+        if query_embedding is None:
+            query_embedding = self.embed_query(query)
+        if hasattr(query_embedding, "tolist"):
+            query_embedding = query_embedding.tolist()
 
-        # Query ChromaDB
+        # Query ChromaDB (HNSW index); distances are unused, so skip them
         results = self.collection.query(
             query_embeddings=[query_embedding],
-            n_results=min(k, self.collection.count())
+            n_results=min(k, count),
+            include=["documents", "metadatas"]
         )
 
         # Convert ChromaDB results to LangChain Document format
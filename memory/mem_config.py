@@ -1,6 +1,7 @@
 
 import os
 from dataclasses import dataclass, field
+from functools import lru_cache
 from sentence_transformers import SentenceTransformer
 
 
@@ -28,3 +29,9 @@ class MemoryConfig:
         """Initialize the embeddings model after dataclass creation"""
         if self.embeddings is None:
             self.embeddings = SentenceTransformer(self.embedding_model_name)
+
+
+@lru_cache(maxsize=None)
+def get_memory_config() -> MemoryConfig:
+    """Process-wide MemoryConfig; loads the embeddings model once"""
+    return MemoryConfig()
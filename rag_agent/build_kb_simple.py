@@ -18,6 +18,7 @@ from dotenv import load_dotenv
 
 from rag_agent.pdf_extractor import SimplePDFExtractor
 from rag_agent.embedding_helpers import embed_text
+from core.vector_store import ChromaBatchWriter
 
 # Load environment variables
 load_dotenv()
@@ -173,44 +174,34 @@ def build_text_index(
             chunks = extractor.chunk_text(text, chunk_size, chunk_overlap)
             logger.info(f"  Created {len(chunks)} chunks")
 
-            # Prepare batch data for ChromaDB
-            chunk_ids = []
-            chunk_texts = []
-            chunk_embeddings = []
-            chunk_metadata = []
-
-            # Generate embeddings for each chunk
-            for i, chunk in enumerate(chunks):
-                try:
-                    vec = embed_text(chunk)
-
-                    chunk_ids.append(f"{doc_id}_chunk_{i}")
-                    chunk_texts.append(chunk)
-                    chunk_embeddings.append(vec.tolist())
-                    chunk_metadata.append({
-                        "source": filename,
-                        "chunk_index": i,
-                        "pdf_path": pdf_path,
-                        "doc_id": doc_id,
-                        "file_hash": file_hash  # Store hash for duplicate detection
-                    })
-
-                    if (i + 1) % 10 == 0:
-                        logger.info(f"  Embedded {i + 1}/{len(chunks)} chunks")
-
-                except Exception as e:
-                    logger.error(f"  Failed to embed chunk {i}: {e}")
-
-            # Add all chunks to ChromaDB in batch
-            if chunk_ids:
-                collection.add(
-                    ids=chunk_ids,
-                    documents=chunk_texts,
-                    embeddings=chunk_embeddings,
-                    metadatas=chunk_metadata
-                )
-                total_chunks += len(chunk_ids)
-                logger.info(f"  Added {len(chunk_ids)} chunks to collection")
+            # Embed chunks and upsert them to ChromaDB in fixed-size batches
+            with ChromaBatchWriter(collection) as writer:
+                for i, chunk in enumerate(chunks):
+                    try:
+                        vec = embed_text(chunk)
+
+                        writer.add(
+                            f"{doc_id}_chunk_{i}",
+                            vec.tolist(),
+                            chunk,
+                            {
+                                "source": filename,
+                                "chunk_index": i,
+                                "pdf_path": pdf_path,
+                                "doc_id": doc_id,
+                                "file_hash": file_hash  # Store hash for duplicate detection
+                            }
+                        )
+
+                        if (i + 1) % 10 == 0:
+                            logger.info(f"  Embedded {i + 1}/{len(chunks)} chunks")
+
+                    except Exception as e:
+                        logger.error(f"  Failed to embed chunk {i}: {e}")
+
+            if writer.written:
+                total_chunks += writer.written
+                logger.info(f"  Added {writer.written} chunks to collection")
 
         except Exception as e:
             logger.error(f"Failed to process {filename}: {e}")
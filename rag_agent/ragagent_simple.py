@@ -7,10 +7,12 @@ No image processing, no multimodal complexity - just efficient text retrieval an
 
 import os
 import logging
-from typing import List, Dict, Any, Tuple
+from functools import lru_cache
+from typing import List, Dict, Any, Optional, Tuple
 
 from dotenv import load_dotenv
 from openai import OpenAI
+import numpy as np
 
 from rag_agent.embedding_helpers import embed_text
 from core.vector_store import get_chroma_client, get_chroma_collection
@@ -26,6 +28,37 @@ logger = logging.getLogger(__name__)
 DATA_DIR = "data"
 CHROMA_DB_DIR = os.path.join(DATA_DIR, "chroma_db")
 
+# Static instructions live in the system message so every answer request
+# shares the same prefix (eligible for OpenAI's prompt cache); the user
+# message carries only the per-query context and question
+ANSWER_SYSTEM_PROMPT = (
+    "You are a helpful assistant that answers questions based on "
+    "the provided context. Provide accurate, concise answers and "
+    "cite sources when possible. If the context doesn't contain "
+    "enough information, say so."
+)
+
+# Retrieved chunks shorter than this (e.g. blank pages, stray headers) give
+# the LLM nothing to ground an answer on and are dropped before generation
+MIN_CHUNK_CHARS = 20
+
+
+@lru_cache(maxsize=None)
+def get_openai_client() -> OpenAI:
+    """
+    Get the process-wide OpenAI client.
+
+    Returns:
+        OpenAI client
+
+    Raises:
+        ValueError: If OPENAI_API_KEY is not set
+    """
+    openai_api_key = os.getenv("OPENAI_API_KEY")
+    if not openai_api_key:
+        raise ValueError("OPENAI_API_KEY not found in environment. Add it to your .env file.")
+    return OpenAI(api_key=openai_api_key)
+
 
 class SimpleRagAgent:
     """
@@ -73,28 +106,33 @@ class SimpleRagAgent:
                 f"  python -m rag_agent.build_kb_simple"
             ) from e
 
-        # Initialize OpenAI client
-        openai_api_key = os.getenv("OPENAI_API_KEY")
-        if not openai_api_key:
-            raise ValueError("OPENAI_API_KEY not found in environment. Add it to your .env file.")
-
-        self.llm_client = OpenAI(api_key=openai_api_key)
+        # Shared OpenAI client (reuses its connection pool across queries)
+        self.llm_client = get_openai_client()
         logger.info("RAG agent initialized successfully")
 
-    def retrieve(self, query: str, top_k: int = 5) -> List[Dict[str, Any]]:
+    def retrieve(
+        self,
+        query: str,
+        top_k: int = 5,
+        query_embedding: Optional[np.ndarray] = None
+    ) -> List[Dict[str, Any]]:
         """
         Retrieve the most relevant text chunks for a query.
 
         Args:
             query: User query string
             top_k: Number of top results to return
+            query_embedding: Precomputed embedding of query (skips embedding)
 
         Returns:
             List of dictionaries containing retrieved chunks and metadata
         """
         try:
             # Embed query
-            query_vec = embed_text(query)
+            query_vec = (
+                query_embedding if query_embedding is not None
+                else embed_text(query)
+            )
 
             # Query ChromaDB
             results_data = self.collection.query(
@@ -150,19 +188,9 @@ class SimpleRagAgent:
             combined_context = "\n".join(context_parts)
 
             # Create prompt
-            system_msg = (
-                "You are a helpful assistant that answers questions based on "
-                "the provided context. Provide accurate, concise answers and "
-                "cite sources when possible."
-            )
-            user_msg = (
-                f"Context:\n{combined_context}\n\nQuestion: {query}\n\n"
-                f"Please answer the question based on the context provided. "
-                f"If the context doesn't contain enough information, say so."
-            )
             messages = [
-                {"role": "system", "content": system_msg},
-                {"role": "user", "content": user_msg}
+                {"role": "system", "content": ANSWER_SYSTEM_PROMPT},
+                {"role": "user", "content": f"Context:\n{combined_context}\n\nQuestion: {query}"}
             ]
 
             # Call LLM (single call!)
@@ -181,20 +209,31 @@ class SimpleRagAgent:
             logger.error(f"Generation error: {e}")
             return f"Error generating answer: {str(e)}"
 
-    def answer_query(self, query: str, top_k: int = 5) -> Tuple[str, Dict[str, Any]]:
+    def answer_query(
+        self,
+        query: str,
+        top_k: int = 5,
+        query_embedding: Optional[np.ndarray] = None
+    ) -> Tuple[str, Dict[str, Any]]:
         """
         Complete RAG pipeline: retrieve relevant chunks and generate answer.
 
         Args:
             query: User query
             top_k: Number of chunks to retrieve
+            query_embedding: Precomputed embedding of query (skips embedding)
 
         Returns:
             Tuple of (answer, metadata)
         """
         # Retrieve relevant chunks
-        chunks = self.retrieve(query, top_k=top_k)
+        chunks = self.retrieve(query, top_k=top_k, query_embedding=query_embedding)
+        chunks = [
+            chunk for chunk in chunks
+            if len(chunk["content"].strip()) >= MIN_CHUNK_CHARS
+        ]
 
+        # Nothing usable retrieved: answer without the LLM round-trip
         if not chunks:
             return "I couldn't find relevant information to answer your question.", {
                 "query": query,
@@ -216,7 +255,12 @@ class SimpleRagAgent:
         return answer, metadata
 
 
-def rag_answer(query: str, top_k: int = 5, collection_name: str = "documents") -> Tuple[str, Dict[str, Any]]:
+def rag_answer(
+    query: str,
+    top_k: int = 5,
+    collection_name: str = "documents",
+    query_embedding: Optional[np.ndarray] = None
+) -> Tuple[str, Dict[str, Any]]:
     """
     Convenience function for quick RAG queries.
 
@@ -224,12 +268,13 @@ def rag_answer(query: str, top_k: int = 5, collection_name: str = "documents") -
         query: User query
         top_k: Number of chunks to retrieve
         collection_name: ChromaDB collection name (default: "documents")
+        query_embedding: Precomputed embedding of query (skips embedding)
 
     Returns:
         Tuple of (answer, metadata)
     """
     agent = SimpleRagAgent(collection_name=collection_name)
-    return agent.answer_query(query, top_k=top_k)
+    return agent.answer_query(query, top_k=top_k, query_embedding=query_embedding)
 
 
 if __name__ == "__main__":
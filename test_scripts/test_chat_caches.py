@@ -0,0 +1,138 @@
+#!/usr/bin/env python3
+"""
+Chatbot Cache Tests
+
+Tool-result cache of the chatbot node (what gets cached and for how long) and
+the context scoping of its semantic answer cache.
+
+Run: python test_scripts/test_chat_caches.py
+"""
+
+import asyncio
+import os
+import sys
+from unittest import mock
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("OPENAI_API_KEY", "test")
+
+import graph.chat_node as chat_node
+
+
+class FakeTool:
+    """Tool double returning queued results and counting invocations"""
+
+    def __init__(self, *results):
+        self.results = list(results)
+        self.calls = 0
+
+    def invoke(self, args):
+        self.calls += 1
+        return self.results.pop(0)
+
+
+def _call(name, **args):
+    return {"name": name, "args": args}
+
+
+def test_error_results_not_cached():
+    """A transient tool failure is retried on the next ask, not replayed"""
+    chat_node._tool_cache.clear()
+    tool = FakeTool("Error searching Wikipedia: timeout", "Wikipedia search results")
+    tool_map = {"search_wikipedia": tool}
+    call = _call("search_wikipedia", query="Ada Lovelace")
+
+    first = asyncio.run(chat_node._run_tool(tool_map, call))
+    second = asyncio.run(chat_node._run_tool(tool_map, call))
+    third = asyncio.run(chat_node._run_tool(tool_map, call))
+
+    assert first.startswith("Error")
+    assert second == third == "Wikipedia search results"
+    assert tool.calls == 2
+    print("✓ Error results are not cached")
+
+
+def test_web_results_expire_quickly():
+    """Web/news results are reused for minutes, Wikipedia for an hour"""
+    chat_node._tool_cache.clear()
+    web = FakeTool("web 1", "web 2")
+    wiki = FakeTool("wiki 1", "wiki 2")
+    tool_map = {"search_web": web, "search_wikipedia": wiki}
+    web_call = _call("search_web", query="weather")
+    wiki_call = _call("search_wikipedia", query="weather")
+
+    with mock.patch("time.monotonic", return_value=1000.0):
+        asyncio.run(chat_node._run_tool(tool_map, web_call))
+        asyncio.run(chat_node._run_tool(tool_map, wiki_call))
+    with mock.patch("time.monotonic", return_value=1000.0 + 600):
+        assert asyncio.run(chat_node._run_tool(tool_map, web_call)) == "web 2"
+        assert asyncio.run(chat_node._run_tool(tool_map, wiki_call)) == "wiki 1"
+    print("✓ Per-tool cache TTL")
+
+
+def _context(facts="", *turns):
+    context = {"short_term": [{"role": role, "content": text} for role, text in turns]}
+    if facts:
+        context["user_facts"] = {"city": facts}
+        context["user_facts_text"] = {"bullets": f"- city: {facts}"}
+    return context
+
+
+def test_semantic_namespace_tracks_profile():
+    """Same session and profile share a namespace; a profile change doesn't"""
+    base = _context("Paris", ("user", "hi"), ("assistant", "Hello!"))
+    moved_on = _context("Paris", ("user", "hi"), ("assistant", "Anything else?"))
+    new_facts = _context("Berlin", ("user", "hi"), ("assistant", "Hello!"))
+
+    namespace = chat_node._semantic_namespace("s1", base)
+    assert namespace == chat_node._semantic_namespace("s1", moved_on)
+    assert namespace != chat_node._semantic_namespace("s1", new_facts)
+    assert namespace != chat_node._semantic_namespace("s2", base)
+    print("✓ Semantic cache namespace tracks the profile")
+
+
+def test_repeated_question_hits_across_turns():
+    """A question asked again a few turns later is answered from the cache"""
+    chat_node._semantic_cache.clear_all()
+    question = np.array([1, 0, 0], dtype=np.float32)
+    first_turn = _context("Paris", ("user", "hi"), ("assistant", "Hello!"))
+    chat_node._semantic_cache.set(
+        chat_node._semantic_namespace("s1", first_turn), question, "answer"
+    )
+
+    later_turn = _context(
+        "Paris",
+        ("user", "hi"), ("assistant", "Hello!"),
+        ("user", "What is the capital of France?"), ("assistant", "answer"),
+        ("user", "Thanks, and Germany?"), ("assistant", "Berlin."),
+    )
+    _, cached = asyncio.run(chat_node._semantic_lookup(
+        chat_node._semantic_namespace("s1", later_turn), "What is the capital of France?",
+        question
+    ))
+    assert cached == "answer"
+    print("✓ Repeated question hits across turns")
+
+
+def test_repeated_message_skips_lookup():
+    """Re-sending the previous message is a "try again", not a cache hit"""
+    short_term = _context("", ("user", "Tell me a joke"), ("assistant", "..."))["short_term"]
+    assert chat_node._repeats_last_message(" tell me a joke", short_term)
+    assert not chat_node._repeats_last_message("Tell me another joke", short_term)
+    assert not chat_node._repeats_last_message("Tell me a joke", [])
+    print("✓ Repeated message detected")
+
+
+def main():
+    test_error_results_not_cached()
+    test_web_results_expire_quickly()
+    test_semantic_namespace_tracks_profile()
+    test_repeated_question_hits_across_turns()
+    test_repeated_message_skips_lookup()
+    print("\n✅ Chatbot cache tests passed")
+
+
+if __name__ == "__main__":
+    main()
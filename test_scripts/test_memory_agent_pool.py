@@ -0,0 +1,105 @@
+#!/usr/bin/env python3
+"""
+MemoryAgent Pool Tests
+
+Pool hits are not blocked by a cold build, concurrent requests share one
+build, and evicted agents are closed only after their background updates.
+
+Run: python test_scripts/test_memory_agent_pool.py
+"""
+
+import asyncio
+import os
+import sys
+import threading
+import time
+from unittest import mock
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("OPENAI_API_KEY", "test")
+
+import graph.memory_nodes as memory_nodes
+
+
+class FakeMemoryAgent:
+    """Stands in for MemoryAgent: slow to build, records close()"""
+    build_delay = 0.0
+    builds = 0
+    lock = threading.Lock()
+
+    def __init__(self, user_id, thread_id):
+        with FakeMemoryAgent.lock:
+            FakeMemoryAgent.builds += 1
+        time.sleep(self.build_delay)
+        self.user_id = user_id
+        self.thread_id = thread_id
+        self.closed = False
+
+    def close(self):
+        self.closed = True
+
+
+def _reset_pool():
+    memory_nodes._agent_pool.clear()
+    memory_nodes._agent_builds.clear()
+    FakeMemoryAgent.builds = 0
+    FakeMemoryAgent.build_delay = 0.0
+
+
+async def _pool_hit_not_blocked_by_cold_build():
+    _reset_pool()
+    warm = await memory_nodes._get_memory_agent("u1", "t1")
+
+    FakeMemoryAgent.build_delay = 0.5
+    cold = asyncio.create_task(memory_nodes._get_memory_agent("u2", "t2"))
+    await asyncio.sleep(0.05)  # Cold build is now running in a thread
+
+    started = time.monotonic()
+    assert await memory_nodes._get_memory_agent("u1", "t1") is warm
+    assert time.monotonic() - started < 0.1
+    await cold
+
+
+async def _concurrent_requests_share_one_build():
+    _reset_pool()
+    FakeMemoryAgent.build_delay = 0.1
+    agents = await asyncio.gather(
+        *(memory_nodes._get_memory_agent("u", "t") for _ in range(5))
+    )
+    assert FakeMemoryAgent.builds == 1
+    assert all(agent is agents[0] for agent in agents)
+
+
+async def _evicted_agent_closed_after_updates():
+    _reset_pool()
+    with mock.patch.object(memory_nodes, "MEMORY_AGENT_POOL_SIZE", 1):
+        first = await memory_nodes._get_memory_agent("u1", "t1")
+        release = asyncio.Event()
+        memory_nodes._track_update(first, asyncio.create_task(release.wait()))
+
+        await memory_nodes._get_memory_agent("u2", "t2")  # Evicts first
+        await asyncio.sleep(0)
+        assert not first.closed  # Its update is still running
+
+        release.set()
+        await memory_nodes.flush_pending_updates(timeout=1)
+        assert first.closed
+
+        idle = await memory_nodes._get_memory_agent("u3", "t3")
+        await memory_nodes._get_memory_agent("u4", "t4")  # Evicts idle
+        assert idle.closed
+
+
+def test_memory_agent_pool():
+    with mock.patch.object(memory_nodes, "MemoryAgent", FakeMemoryAgent):
+        asyncio.run(_pool_hit_not_blocked_by_cold_build())
+        print("✓ Pool hit not blocked by a cold build")
+        asyncio.run(_concurrent_requests_share_one_build())
+        print("✓ Concurrent requests share one build")
+        asyncio.run(_evicted_agent_closed_after_updates())
+        print("✓ Evicted agent closed after its updates")
+
+
+if __name__ == "__main__":
+    test_memory_agent_pool()
+    print("\n✅ MemoryAgent pool tests passed")
@@ -0,0 +1,73 @@
+#!/usr/bin/env python3
+"""
+MemoryCache Tests
+
+TTL expiry, LRU eviction and per-entry TTL overrides of the in-process
+L1 cache.
+
+Run: python test_scripts/test_memory_cache.py
+"""
+
+import os
+import sys
+from unittest import mock
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core.cache.memory_cache import MemoryCache
+
+
+def test_ttl_expiry():
+    """Entries disappear once their TTL has passed"""
+    cache = MemoryCache(maxsize=10, ttl=60, name="test")
+    with mock.patch("time.monotonic", return_value=1000.0):
+        cache.set("a", 1)
+        cache.set("b", 2, ttl=300)  # Per-entry override
+        assert "a" in cache
+
+    with mock.patch("time.monotonic", return_value=1000.0 + 61):
+        assert "a" not in cache
+        assert cache.get("a") is None
+        assert cache.get("b") == 2
+
+    with mock.patch("time.monotonic", return_value=1000.0 + 301):
+        assert cache.expire() == 1
+        assert len(cache) == 0
+    print("✓ TTL expiry")
+
+
+def test_no_ttl():
+    """ttl=None keeps entries until evicted"""
+    cache = MemoryCache(maxsize=10, ttl=None, name="test")
+    with mock.patch("time.monotonic", return_value=1000.0):
+        cache.set("a", 1)
+    with mock.patch("time.monotonic", return_value=1000.0 + 10 ** 9):
+        assert cache.get("a") == 1
+    print("✓ No TTL")
+
+
+def test_lru_eviction():
+    """Inserting past maxsize evicts the least recently used entry"""
+    cache = MemoryCache(maxsize=2, ttl=None, name="test")
+    cache.set("a", 1)
+    cache.set("b", 2)
+    assert cache.get("a") == 1  # "b" is now least recently used
+    cache.set("c", 3)
+
+    assert "b" not in cache
+    assert cache.get("a") == 1
+    assert cache.get("c") == 3
+    assert len(cache) == 2
+    assert cache.get_stats()["evictions"] == 1
+    print("✓ LRU eviction")
+
+
+def main():
+    test_ttl_expiry()
+    test_no_ttl()
+    test_lru_eviction()
+    print("\n✅ MemoryCache tests passed")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,75 @@
+#!/usr/bin/env python3
+"""
+PartialResponseCoalescer Tests
+
+The first partial of a quiet period goes out at once; partials arriving
+within the interval are merged (full replaces, delta appends) and sent when
+the interval elapses or on flush().
+
+Run: python test_scripts/test_partial_coalescer.py
+"""
+
+import asyncio
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core.websocket.frames import PartialResponse
+from core.websocket.manager import PartialResponseCoalescer
+
+
+def _coalescer(interval):
+    sent = []
+
+    async def send(data):
+        sent.append((data.mode, data.message))
+
+    return PartialResponseCoalescer(send, interval=interval), sent
+
+
+async def _deltas_are_appended():
+    partials, sent = _coalescer(interval=10)
+    await partials.push(PartialResponse("He", mode="delta"))
+    await partials.push(PartialResponse("llo", mode="delta"))
+    await partials.push(PartialResponse(" world", mode="delta"))
+    assert sent == [("delta", "He")]
+
+    await partials.flush()
+    assert sent == [("delta", "He"), ("delta", "llo world")]
+
+
+async def _full_replaces_pending():
+    partials, sent = _coalescer(interval=10)
+    await partials.push(PartialResponse("a"))
+    await partials.push(PartialResponse("ab"))
+    await partials.push(PartialResponse("abc"))
+    await partials.flush()
+    assert sent == [("full", "a"), ("full", "abc")]
+
+    await partials.flush()  # Nothing pending: no duplicate frame
+    assert len(sent) == 2
+
+
+async def _pending_sent_after_interval():
+    partials, sent = _coalescer(interval=0.05)
+    await partials.push(PartialResponse("a", mode="delta"))
+    await partials.push(PartialResponse("b", mode="delta"))
+    assert len(sent) == 1
+
+    await asyncio.sleep(0.1)
+    assert sent == [("delta", "a"), ("delta", "b")]
+
+
+def test_partial_coalescer():
+    asyncio.run(_deltas_are_appended())
+    print("✓ Deltas appended")
+    asyncio.run(_full_replaces_pending())
+    print("✓ Full partial replaces pending")
+    asyncio.run(_pending_sent_after_interval())
+    print("✓ Pending partial sent after the interval")
+
+
+if __name__ == "__main__":
+    test_partial_coalescer()
+    print("\n✅ PartialResponseCoalescer tests passed")
@@ -0,0 +1,75 @@
+#!/usr/bin/env python3
+"""
+Progress Callback Tests
+
+Fire-and-forget (wait=False) progress events are delivered in order, a
+queued status is superseded by a newer one for the same step, streaming
+events are never coalesced, and drain() waits for delivery.
+
+Run: python test_scripts/test_progress_callbacks.py
+"""
+
+import asyncio
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.track_progress import ProgressCallback
+
+
+def _progress():
+    progress = ProgressCallback()
+    events = []
+
+    async def callback(session_id, step, status, details):
+        await asyncio.sleep(0.01)  # Slow client: later events queue up
+        events.append((step, status))
+
+    progress.register_callback("s1", callback)
+    return progress, events
+
+
+async def _superseded_status_coalesced():
+    progress, events = _progress()
+    await progress.notify_progress("s1", "memory", "active", wait=False)
+    await asyncio.sleep(0)  # "memory active" is now being delivered
+    await progress.notify_progress("s1", "rag", "active", wait=False)
+    await progress.notify_progress("s1", "rag", "completed", wait=False)
+    await progress.notify_progress("s1", "memory", "completed", wait=False)
+    await progress.drain("s1")
+
+    # "rag active" was still queued when "rag completed" arrived
+    assert events == [("memory", "active"), ("rag", "completed"), ("memory", "completed")]
+    assert not progress._pending and not progress._latest
+
+
+async def _streaming_never_coalesced():
+    progress, events = _progress()
+    for i in range(3):
+        await progress.notify_progress(
+            "s1", "streaming", "partial", {"mode": "delta", "message": str(i)}, wait=False
+        )
+    await progress.drain("s1")
+    assert events == [("streaming", "partial")] * 3
+
+
+async def _awaited_event_after_scheduled():
+    progress, events = _progress()
+    await progress.notify_progress("s1", "memory", "active", wait=False)
+    await progress.notify_progress("s1", "chatbot", "active")
+    assert events == [("memory", "active"), ("chatbot", "active")]
+
+
+def test_progress_callbacks():
+    asyncio.run(_superseded_status_coalesced())
+    print("✓ Superseded status coalesced")
+    asyncio.run(_streaming_never_coalesced())
+    print("✓ Streaming events never coalesced")
+    asyncio.run(_awaited_event_after_scheduled())
+    print("✓ Awaited event delivered after scheduled ones")
+
+
+if __name__ == "__main__":
+    test_progress_callbacks()
+    print("\n✅ Progress callback tests passed")
@@ -0,0 +1,58 @@
+#!/usr/bin/env python3
+"""
+QueryCache Tests
+
+Per-response TTL and per-collection invalidation of the exact-match RAG
+answer cache (local tier; Redis is not required).
+
+Run: python test_scripts/test_query_cache.py
+"""
+
+import asyncio
+import os
+import sys
+from unittest import mock
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core.cache.query_cache import QueryCache
+
+
+class NoRedis:
+    enabled = False
+
+
+def test_response_ttl():
+    """A response stored with a short TTL expires before the cache default"""
+    cache = QueryCache(redis_manager=NoRedis(), ttl=3600)
+    with mock.patch("time.monotonic", return_value=1000.0):
+        cache.set_response("what is rag?", "answer", context="documents@v0", ttl=300)
+    with mock.patch("time.monotonic", return_value=1000.0 + 301):
+        assert cache.get_response("what is rag?", context="documents@v0") is None
+    print("✓ Per-response TTL")
+
+
+async def _invalidation_bumps_version():
+    cache = QueryCache(redis_manager=NoRedis())
+    assert await cache.async_collection_version("documents") == 0
+    cache.set_response("what is rag?", "old answer", context="documents@v0")
+
+    assert await cache.async_invalidate_collection("documents") == 1
+    assert await cache.async_collection_version("documents") == 1
+    assert await cache.async_collection_version("other") == 0
+    assert cache.get_response("what is rag?", context="documents@v0") is None
+
+
+def test_invalidate_collection():
+    asyncio.run(_invalidation_bumps_version())
+    print("✓ Collection invalidation")
+
+
+def main():
+    test_response_ttl()
+    test_invalidate_collection()
+    print("\n✅ QueryCache tests passed")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+"""
+SemanticCache Tests
+
+Threshold, window, namespace isolation and per-entry TTL of the
+near-duplicate response cache.
+
+Run: python test_scripts/test_semantic_cache.py
+"""
+
+import os
+import sys
+from unittest import mock
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core.cache.semantic_cache import SemanticCache
+
+
+def _vec(*values):
+    return np.array(values, dtype=np.float32)
+
+
+def test_threshold():
+    """Near-duplicates hit, unrelated vectors miss"""
+    cache = SemanticCache(threshold=0.95, name="test")
+    cache.set("ns", _vec(1, 0, 0), "answer")
+
+    assert cache.get("ns", _vec(1, 0.05, 0)) == "answer"
+    assert cache.get("ns", _vec(0, 1, 0)) is None
+    assert cache.get("ns", _vec(1, 0, 0, 0)) is None  # Dimension mismatch
+    print("✓ Threshold")
+
+
+def test_window():
+    """Only the last `window` entries of a namespace are kept"""
+    cache = SemanticCache(threshold=0.99, window=2, name="test")
+    cache.set("ns", _vec(1, 0, 0), "a")
+    cache.set("ns", _vec(0, 1, 0), "b")
+    cache.set("ns", _vec(0, 0, 1), "c")
+
+    assert cache.get("ns", _vec(1, 0, 0)) is None
+    assert cache.get("ns", _vec(0, 1, 0)) == "b"
+    assert cache.get("ns", _vec(0, 0, 1)) == "c"
+    print("✓ Window")
+
+
+def test_namespaces_are_isolated():
+    """An answer cached for one user/collection never serves another"""
+    cache = SemanticCache(threshold=0.95, name="test")
+    cache.set("user-a:documents", _vec(1, 0, 0), "for a")
+
+    assert cache.get("user-b:documents", _vec(1, 0, 0)) is None
+    assert cache.get("documents", _vec(1, 0, 0)) is None
+    assert cache.get("user-a:documents", _vec(1, 0, 0)) == "for a"
+
+    cache.clear_all()
+    assert cache.get("user-a:documents", _vec(1, 0, 0)) is None
+    print("✓ Namespace isolation")
+
+
+def test_entry_ttl_not_refreshed_by_writes():
+    """Entries expire on their own age even while the namespace stays busy"""
+    cache = SemanticCache(threshold=0.99, ttl=300, name="test")
+    with mock.patch("time.monotonic", return_value=1000.0):
+        cache.set("documents", _vec(1, 0, 0), "old")
+    with mock.patch("time.monotonic", return_value=1200.0):
+        cache.set("documents", _vec(0, 1, 0), "newer")
+    with mock.patch("time.monotonic", return_value=1350.0):
+        assert cache.get("documents", _vec(1, 0, 0)) is None
+        assert cache.get("documents", _vec(0, 1, 0)) == "newer"
+    print("✓ Per-entry TTL")
+
+
+def test_backdated_entry_expires_early():
+    """An answer seeded from another tier keeps only its remaining lifetime"""
+    cache = SemanticCache(threshold=0.99, ttl=300, name="test")
+    with mock.patch("time.monotonic", return_value=1000.0):
+        cache.set("documents", _vec(1, 0, 0), "fresh")
+        cache.set("documents", _vec(0, 1, 0), "seeded", age=250)
+    with mock.patch("time.monotonic", return_value=1100.0):
+        assert cache.get("documents", _vec(0, 1, 0)) is None
+        assert cache.get("documents", _vec(1, 0, 0)) == "fresh"
+    print("✓ Backdated entry expires early")
+
+
+def main():
+    test_threshold()
+    test_window()
+    test_namespaces_are_isolated()
+    test_entry_ttl_not_refreshed_by_writes()
+    test_backdated_entry_expires_early()
+    print("\n✅ SemanticCache tests passed")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,198 @@
+#!/usr/bin/env python3
+"""
+Batching Turn Writer Tests
+
+Conversation turns queued by the WebSocket manager are persisted in order,
+transient failures are retried a bounded number of times, turns MongoDB
+rejects are isolated from their batch, and a session's next message waits
+until its previous turn is stored.
+
+Run: python test_scripts/test_turn_writer.py
+"""
+
+import asyncio
+import os
+import sys
+
+from bson.errors import InvalidDocument
+from pymongo.errors import AutoReconnect, BulkWriteError
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core.database.manager import DatabaseManager
+from core.websocket.manager import DatabaseAwareMultiAgentManager
+
+
+class FakeDB:
+    """record_turns double: fails as scripted, then records the batch"""
+
+    def __init__(self, *failures):
+        self.failures = list(failures)
+        self.stored = []
+
+    async def record_turns(self, turns):
+        await asyncio.sleep(0.01)
+        if any(turn.get("bad") for turn in turns):
+            raise InvalidDocument("cannot encode object")
+        if any(turn.get("too_large") for turn in turns):
+            raise BulkWriteError({"writeErrors": [
+                {"index": 0, "code": 10334, "errmsg": "BSONObj size is invalid"}
+            ]})
+        if self.failures:
+            raise self.failures.pop(0)
+        self.stored.extend(turn["user_message"] for turn in turns)
+
+
+def _turn(session_id, message, **extra):
+    return {"session_id": session_id, "user_message": message, **extra}
+
+
+def _manager(db):
+    manager = DatabaseAwareMultiAgentManager(db)
+    manager.write_batch_interval = 0.01
+    return manager
+
+
+def _enqueue(manager, turn):
+    persisted = asyncio.get_running_loop().create_future()
+    manager._persisted[turn["session_id"]] = persisted
+    manager._write_queue.put_nowait((turn, persisted))
+    return persisted
+
+
+async def _failed_batch_is_retried():
+    db = FakeDB(AutoReconnect("primary down"), AutoReconnect("primary down"))
+    manager = _manager(db)
+    manager.start()
+    persisted = [_enqueue(manager, _turn("s1", f"m{i}")) for i in range(3)]
+    await asyncio.wait_for(asyncio.gather(*persisted), timeout=2)
+    assert db.stored == ["m0", "m1", "m2"]
+    assert not manager._persisted
+    await manager.close()
+
+
+async def _next_turn_waits_for_previous():
+    db = FakeDB(AutoReconnect("primary down"))
+    manager = _manager(db)
+    manager.start()
+    _enqueue(manager, _turn("s1", "first"))
+    await manager._wait_for_previous_turn("s1")
+    assert db.stored == ["first"]
+    await manager.close()
+
+
+async def _unencodable_turn_is_isolated():
+    db = FakeDB()
+    manager = _manager(db)
+    manager.start()
+    persisted = [
+        _enqueue(manager, _turn("s1", "ok 1")),
+        _enqueue(manager, _turn("s2", "broken", bad=True)),
+        _enqueue(manager, _turn("s3", "ok 2")),
+    ]
+    await asyncio.wait_for(asyncio.gather(*persisted), timeout=2)
+    assert db.stored == ["ok 1", "ok 2"]
+    await manager.close()
+
+
+async def _rejected_write_is_isolated():
+    db = FakeDB()
+    manager = _manager(db)
+    manager.start()
+    persisted = [
+        _enqueue(manager, _turn("s1", "ok 1")),
+        _enqueue(manager, _turn("s2", "huge", too_large=True)),
+        _enqueue(manager, _turn("s3", "ok 2")),
+    ]
+    await asyncio.wait_for(asyncio.gather(*persisted), timeout=2)
+    assert db.stored == ["ok 1", "ok 2"]
+    await manager.close()
+
+
+async def _retries_are_capped():
+    db = FakeDB(*(AutoReconnect("primary down") for _ in range(10)))
+    manager = _manager(db)
+    manager.write_max_attempts = 3
+    manager.start()
+    first = _enqueue(manager, _turn("s1", "lost"))
+    await asyncio.wait_for(first, timeout=2)
+    assert db.stored == []
+
+    # The writer moved on instead of stalling on the failed batch
+    db.failures.clear()
+    second = _enqueue(manager, _turn("s1", "next"))
+    await asyncio.wait_for(second, timeout=2)
+    assert db.stored == ["next"]
+    await manager.close()
+
+
+class FakeCollection:
+    """insert_many double that stores a prefix of the docs, then fails"""
+
+    def __init__(self):
+        self.docs = {}
+        self.fail_after = 1
+
+    async def insert_many(self, docs, ordered=True):
+        errors = []
+        for doc in docs:
+            if doc["_id"] in self.docs:
+                errors.append({"code": 11000, "errmsg": "duplicate key"})
+            elif self.fail_after == 0:
+                raise AutoReconnect("connection lost")
+            else:
+                self.docs[doc["_id"]] = doc
+                self.fail_after -= 1
+        if errors:
+            raise BulkWriteError({"writeErrors": errors})
+
+
+async def _record_turns_retry_is_idempotent():
+    db = DatabaseManager.__new__(DatabaseManager)
+    db.conversations = FakeCollection()
+    counters = []
+
+    async def update_session_activity(session_id, **deltas):
+        counters.append(session_id)
+
+    async def update_user_activity(user_id, **deltas):
+        pass
+
+    db.update_session_activity = update_session_activity
+    db.update_user_activity = update_user_activity
+    turns = [{
+        "session_id": "s1", "user_id": "u1", "thread_id": "s1",
+        "user_message": "hi", "ai_response": "hello", "metadata": {}
+    }]
+
+    try:
+        await db.record_turns(turns)
+        raise AssertionError("first attempt should fail")
+    except AutoReconnect:
+        pass
+    assert counters == []  # Counters only move once the messages are stored
+
+    db.conversations.fail_after = 10
+    await db.record_turns(turns)
+    assert len(db.conversations.docs) == 2
+    assert counters == ["s1"]
+
+
+def test_turn_writer():
+    asyncio.run(_failed_batch_is_retried())
+    print("✓ Failed batch retried in order")
+    asyncio.run(_next_turn_waits_for_previous())
+    print("✓ Next turn waits for the previous one")
+    asyncio.run(_unencodable_turn_is_isolated())
+    print("✓ Unencodable turn isolated")
+    asyncio.run(_rejected_write_is_isolated())
+    print("✓ Rejected write isolated")
+    asyncio.run(_retries_are_capped())
+    print("✓ Retries capped")
+    asyncio.run(_record_turns_retry_is_idempotent())
+    print("✓ record_turns retry is idempotent")
+
+
+if __name__ == "__main__":
+    test_turn_writer()
+    print("\n✅ Turn writer tests passed")
@@ -0,0 +1,140 @@
+#!/usr/bin/env python3
+"""
+WebSocketSender Tests
+
+Frames are written in order and send() never blocks on a slow client. A
+full queue drops its oldest progress status but never response text; a
+client that stops reading response text is disconnected instead. A connection replaced by a newer one for
+the same session (reconnect, second tab) never tears down its successor.
+
+Run: python test_scripts/test_websocket_sender.py
+"""
+
+import asyncio
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core.websocket.manager import DatabaseAwareMultiAgentManager
+from core.websocket.sender import WebSocketSender
+
+
+class SlowWebSocket:
+    """send_bytes blocks until released, like a client that stopped reading"""
+
+    def __init__(self):
+        self.sent = []
+        self.release = asyncio.Event()
+        self.close_code = None
+
+    async def send_bytes(self, payload):
+        await self.release.wait()
+        self.sent.append(payload)
+
+    async def close(self, code=1000):
+        self.close_code = code
+
+
+class FastWebSocket:
+    def __init__(self):
+        self.sent = []
+
+    async def send_bytes(self, payload):
+        self.sent.append(payload)
+
+
+class BrokenWebSocket:
+    async def send_bytes(self, payload):
+        raise ConnectionError("client gone")
+
+
+async def _oldest_status_dropped_when_full():
+    websocket = SlowWebSocket()
+    sender = WebSocketSender(websocket, maxsize=3)
+    sender.start()
+    sender.send(b"delta 1")
+    await asyncio.sleep(0)  # Writer takes "delta 1" and blocks on the socket
+
+    sender.send(b"status 1", droppable=True)
+    sender.send(b"delta 2")
+    sender.send(b"status 2", droppable=True)
+    sender.send(b"delta 3")  # Never blocks; evicts "status 1"
+    sender.send(b"status 3", droppable=True)  # Evicts "status 2"
+    assert sender.dropped == 2
+
+    websocket.release.set()
+    await asyncio.sleep(0.01)
+    assert websocket.sent == [b"delta 1", b"delta 2", b"delta 3", b"status 3"]
+    await sender.aclose()
+
+
+async def _response_text_never_dropped():
+    websocket = SlowWebSocket()
+    sender = WebSocketSender(websocket, maxsize=2)
+    sender.start()
+    sender.send(b"delta 1")
+    await asyncio.sleep(0)
+
+    sender.send(b"delta 2")
+    sender.send(b"delta 3")
+    sender.send(b"status", droppable=True)  # No room: the status goes
+    assert sender.dropped == 1
+
+    sender.send(b"delta 4")  # Would have to drop text: disconnect instead
+    await asyncio.sleep(0.01)
+    assert websocket.close_code == 1013
+    sender.send(b"delta 5")
+    assert not sender._queue
+    await sender.aclose()
+
+
+async def _failed_socket_stops_sender():
+    sender = WebSocketSender(BrokenWebSocket(), maxsize=2)
+    sender.start()
+    sender.send(b"1")
+    await asyncio.sleep(0.01)
+
+    for payload in (b"2", b"3", b"4"):
+        sender.send(payload)  # Ignored once the writer has stopped
+    assert not sender._queue
+    assert sender.dropped == 0
+    await sender.aclose()
+
+
+async def _overlapping_connections():
+    manager = DatabaseAwareMultiAgentManager(db=None)
+    old_socket, new_socket = FastWebSocket(), FastWebSocket()
+    old = await manager.register_websocket("u1", "s1", old_socket)
+    new = await manager.register_websocket("u1", "s1", new_socket)
+
+    old.send(b"late")  # Replaced sender: dropped, not queued forever
+    assert not old._queue
+
+    # The old handler exits after the new connection registered
+    assert not await manager.unregister_websocket("u1", "s1", old)
+    assert manager.active_websockets["u1"]["s1"] is new
+
+    await manager.broadcast_to_user("u1", b"hello")
+    await asyncio.sleep(0.01)
+    assert new_socket.sent == [b"hello"]
+    assert old_socket.sent == []
+
+    assert await manager.unregister_websocket("u1", "s1", new)
+    assert "u1" not in manager.active_websockets
+
+
+def test_websocket_sender():
+    asyncio.run(_oldest_status_dropped_when_full())
+    print("✓ Oldest status dropped when the queue is full")
+    asyncio.run(_response_text_never_dropped())
+    print("✓ Response text never dropped")
+    asyncio.run(_failed_socket_stops_sender())
+    print("✓ Failed socket stops the sender")
+    asyncio.run(_overlapping_connections())
+    print("✓ Replaced connection leaves its successor registered")
+
+
+if __name__ == "__main__":
+    test_websocket_sender()
+    print("\n✅ WebSocketSender tests passed")
@@ -3,6 +3,7 @@ Google Calendar and Google Meet Integration Tool
 Provides calendar management with human-in-the-loop verification
 """
 
+import copy
 import os
 import json
 from datetime import datetime, timedelta
@@ -14,12 +15,19 @@ from googleapiclient.discovery import build
 from googleapiclient.errors import HttpError
 from langchain_core.tools import tool
 
+from core.cache.memory_cache import MemoryCache
+
 # If modifying these scopes, delete the file token.json
 SCOPES = [
     'https://www.googleapis.com/auth/calendar.readonly',
     'https://www.googleapis.com/auth/calendar.events'
 ]
 
+_WEEKDAYS = ("monday", "tuesday", "wednesday", "thursday", "friday", "saturday", "sunday")
+
+# Read-only event listings are reused for this long (seconds)
+EVENTS_CACHE_TTL = 30
+
 
 class GoogleCalendarTool:
     """Google Calendar integration with human-in-the-loop verification"""
@@ -36,6 +44,8 @@ class GoogleCalendarTool:
         self.token_path = token_path
         self.service = None
         self.pending_actions = []
+        # (date, days_ahead, max_results) -> successful get_events() result
+        self._events_cache = MemoryCache(maxsize=64, ttl=EVENTS_CACHE_TTL, name="calendar_events")
 
     def authenticate(self) -> bool:
         """
@@ -98,24 +108,17 @@ class GoogleCalendarTool:
             target_date = now.date()
         elif date_str_lower == "tomorrow":
             target_date = (now + timedelta(days=1)).date()
-        elif "next" in date_str_lower and "monday" in date_str_lower:
-            days_ahead = 0 - now.weekday() + 7
-            target_date = (now + timedelta(days=days_ahead)).date()
-        elif "next" in date_str_lower and "tuesday" in date_str_lower:
-            days_ahead = 1 - now.weekday() + 7
-            target_date = (now + timedelta(days=days_ahead)).date()
-        elif "next" in date_str_lower and "wednesday" in date_str_lower:
-            days_ahead = 2 - now.weekday() + 7
-            target_date = (now + timedelta(days=days_ahead)).date()
-        elif "next" in date_str_lower and "thursday" in date_str_lower:
-            days_ahead = 3 - now.weekday() + 7
-            target_date = (now + timedelta(days=days_ahead)).date()
-        elif "next" in date_str_lower and "friday" in date_str_lower:
-            days_ahead = 4 - now.weekday() + 7
-            target_date = (now + timedelta(days=days_ahead)).date()
         else:
-            # Try to parse as date
-            target_date = parser.parse(date_str).date()
+            weekday = next(
+                (i for i, day in enumerate(_WEEKDAYS) if day in date_str_lower),
+                None
+            )
+            if "next" in date_str_lower and weekday is not None:
+                days_ahead = weekday - now.weekday() + 7
+                target_date = (now + timedelta(days=days_ahead)).date()
+            else:
+                # Try to parse as date
+                target_date = parser.parse(date_str).date()
 
         # Parse time if provided
         if time_str:
@@ -141,6 +144,12 @@ class GoogleCalendarTool:
         Returns:
             Dict with status and events list
         """
+        cache_key = (date.strip().lower() if date else None, days_ahead, max_results)
+        cached = self._events_cache.get(cache_key)
+        if cached is not None:
+            # Callers may edit the events; never hand out the cached objects
+            return copy.deepcopy(cached)
+
         if not self.service:
             if not self.authenticate():
                 return {"status": "error", "message": "Authentication failed"}
@@ -184,11 +193,13 @@ class GoogleCalendarTool:
                 }
                 formatted_events.append(formatted_event)
 
-            return {
+            result = {
                 "status": "success",
                 "count": len(formatted_events),
                 "events": formatted_events
             }
+            self._events_cache.set(cache_key, result)
+            return copy.deepcopy(result)
 
         except HttpError as error:
             return {"status": "error", "message": f"API error: {error}"}
@@ -329,6 +340,9 @@ class GoogleCalendarTool:
                 # Remove from pending actions
                 self.pending_actions.remove(proposal)
 
+                # The calendar changed; cached listings are stale
+                self._events_cache.clear()
+
                 return {
                     "status": "success",
                     "message": "Event created successfully",
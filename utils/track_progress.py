@@ -1,4 +1,4 @@
-from typing import Callable, Dict, List
+from typing import Callable, Dict, List, Optional, Tuple
 import asyncio
 
 class ProgressCallback:
@@ -6,6 +6,12 @@ class ProgressCallback:
     
     def __init__(self):
         self.callbacks: Dict[str, List[Callable]] = {}
+        # Last fire-and-forget delivery per session, to keep events ordered
+        self._pending: Dict[str, asyncio.Task] = {}
+        # Newest scheduled status event per (session, step); an older one
+        # still queued behind it is superseded and never sent
+        self._latest: Dict[Tuple[str, str], int] = {}
+        self._seq = 0
     
     def register_callback(self, session_id: str, callback: Callable):
         """Register a progress callback for a session"""
@@ -18,13 +24,22 @@ class ProgressCallback:
         if session_id in self.callbacks:
             del self.callbacks[session_id]
     
-    async def notify_progress(self, session_id: str, step: str, status: str, details = None):
-        """Notify all callbacks for a session with throttling for streaming"""
+    async def notify_progress(self, session_id: str, step: str, status: str, details = None,
+                              wait: bool = True):
+        """Notify all callbacks for a session with throttling for streaming
+
+        With wait=False the callbacks run in a background task and this returns
+        immediately; events of a session are still delivered in order, and a
+        queued status event is coalesced away when a newer one for the same
+        step arrives before it is sent (e.g. "active" then "completed").
+        """
         if session_id in self.callbacks:
             # For streaming updates, throttle to avoid overwhelming the frontend
-            if step == "streaming" and status == "partial":
+            # (deltas are never dropped: each carries text the client lacks)
+            if (step == "streaming" and status == "partial"
+                    and (details or {}).get("mode") != "delta"):
                 # Use a simple throttling mechanism - only update every ~50ms
-                current_time = asyncio.get_event_loop().time()
+                current_time = asyncio.get_running_loop().time()
                 last_update_key = f"{session_id}_last_stream"
                 
                 if not hasattr(self, '_last_updates'):
@@ -35,15 +50,57 @@ class ProgressCallback:
                     return
                     
                 self._last_updates[last_update_key] = current_time
-            
-            for callback in self.callbacks[session_id]:
-                try:
-                    if asyncio.iscoroutinefunction(callback):
-                        await callback(session_id, step, status, details)
-                    else:
-                        callback(session_id, step, status, details)
-                except Exception as e:
-                    print(f"Error in progress callback: {e}")
+
+            # Snapshot: scheduled events still reach callbacks that are
+            # unregistered before the task runs
+            callbacks = list(self.callbacks[session_id])
+            previous = self._pending.get(session_id)
+
+            if wait:
+                if previous is not None:
+                    await previous  # Earlier scheduled events go out first
+                await self._deliver(callbacks, session_id, step, status, details)
+                return
+
+            seq = None
+            if step != "streaming":  # Partials/deltas are never coalesced
+                self._seq += 1
+                seq = self._seq
+                self._latest[(session_id, step)] = seq
+
+            task = asyncio.create_task(self._deliver(
+                callbacks, session_id, step, status, details, after=previous, seq=seq
+            ))
+            self._pending[session_id] = task
+            task.add_done_callback(
+                lambda t: self._pending.get(session_id) is t and self._pending.pop(session_id)
+            )
+
+    async def drain(self, session_id: str):
+        """Wait until scheduled (wait=False) events of a session are delivered"""
+        task = self._pending.get(session_id)
+        if task is not None:
+            await task
+
+    async def _deliver(self, callbacks: List[Callable], session_id: str, step: str, status: str,
+                       details = None, after: Optional[asyncio.Task] = None,
+                       seq: Optional[int] = None):
+        """Run callbacks for one event, once the previous event is delivered"""
+        if after is not None:
+            await after
+        if seq is not None:
+            key = (session_id, step)
+            if self._latest.get(key) != seq:
+                return  # Superseded by a newer event for this step
+            del self._latest[key]
+        for callback in callbacks:
+            try:
+                if asyncio.iscoroutinefunction(callback):
+                    await callback(session_id, step, status, details)
+                else:
+                    callback(session_id, step, status, details)
+            except Exception as e:
+                print(f"Error in progress callback: {e}")
 
 # Global progress callback system
 progress_callbacks = ProgressCallback()
\ No newline at end of file